@@ -46,6 +46,7 @@ export const storesAPI = {
 // Cart API (query parameters)
 export const cartAPI = {
   addItem: (userId, storeId, menuId) => api.post(`/cart/add?user_id=${userId}&store_id=${storeId}&menu_id=${menuId}`),
+  addItems: (userId, storeId, menuIds) => api.post('/cart/add-bulk', { user_id: userId, store_id: storeId, menu_ids: menuIds }),
   getCart: (userId) => api.get(`/cart/${userId}`),
   removeItem: (userId, menuId) => api.delete(`/cart/remove?user_id=${userId}&menu_id=${menuId}`),
 };
@@ -0,0 +1,35 @@
+import os
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from .database import DATABASE_URL
+
+
+def to_async_url(url: str):
+    """동기 드라이버 URL을 비동기 드라이버 URL로 변환합니다. (psycopg2 → asyncpg, sqlite → aiosqlite)"""
+    if url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url[len("postgresql+psycopg2://"):]
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+ASYNC_DATABASE_URL = os.environ.get("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+# async def 라우터 전용 엔진 (이벤트 루프를 막지 않음)
+# 스크립트(create_dummy_data 등)와 동기 라우터는 기존 database.engine / SessionLocal을 그대로 사용
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,  # commit 후 속성 접근 시 lazy load(동기 IO)가 일어나지 않도록
+    bind=async_engine,
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
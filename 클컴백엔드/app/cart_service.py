@@ -0,0 +1,89 @@
+from fastapi import HTTPException
+from sqlalchemy import and_, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from . import models
+
+
+def _validate(db: Session, user_id: int, store_id: int, menu_ids: list[int]):
+    """
+    사용자/가게/요청 메뉴/기존 장바구니 상태를 한 번의 조회로 확인합니다.
+
+    Returns:
+        {menu_id: price} — 가게에 속하고 아직 장바구니에 없는 요청 메뉴들
+    """
+    # 기존 장바구니가 어느 가게 것인지 (비어 있으면 NULL)
+    cart_item = aliased(models.MenuList)
+    cart_menu = aliased(models.Menu)
+    cart_store_id = (
+        select(cart_menu.store_id)
+        .join(cart_item, cart_item.menu_id == cart_menu.id)
+        .where(cart_item.user_id == models.User.id)
+        .limit(1)
+        .correlate(models.User)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(
+            models.Store.id,
+            models.Menu.id,
+            models.Menu.price,
+            models.MenuList.menu_id,   # 이미 장바구니에 있으면 NOT NULL
+            cart_store_id,
+        )
+        .select_from(models.User)
+        .outerjoin(models.Store, models.Store.id == store_id)
+        .outerjoin(models.Menu, and_(models.Menu.store_id == models.Store.id, models.Menu.id.in_(menu_ids)))
+        .outerjoin(models.MenuList, and_(models.MenuList.user_id == models.User.id,
+                                         models.MenuList.menu_id == models.Menu.id))
+        .where(models.User.id == user_id)
+    ).all()
+
+    if not rows:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    found_store_id, _, _, _, existing_store_id = rows[0]
+    if found_store_id is None:
+        raise HTTPException(status_code=404, detail="Store not found")
+
+    menus = {menu_id: price for _, menu_id, price, _, _ in rows if menu_id is not None}
+    if len(menus) != len(menu_ids):
+        raise HTTPException(status_code=404, detail="Menu not found in the specified store")
+
+    # 장바구니에는 한 가게의 메뉴만 담을 수 있음
+    if existing_store_id is not None and existing_store_id != store_id:
+        raise HTTPException(status_code=400, detail="All items in cart must be from the same store")
+
+    if any(in_cart is not None for _, _, _, in_cart, _ in rows):
+        raise HTTPException(status_code=400, detail="Menu already in cart")
+
+    return menus
+
+
+def add_items(db: Session, user_id: int, store_id: int, menu_ids: list[int]):
+    """
+    한 가게의 메뉴 여러 개를 장바구니에 담습니다. 조회 1번 + INSERT 1번으로 처리하며,
+    하나라도 규칙(같은 가게, 중복 금지)에 어긋나면 아무것도 담지 않습니다.
+
+    Returns:
+        담은 메뉴 수
+    """
+    if not menu_ids:
+        raise HTTPException(status_code=400, detail="No menus to add")
+    if len(set(menu_ids)) != len(menu_ids):
+        raise HTTPException(status_code=400, detail="Duplicate menu in request")
+
+    menus = _validate(db, user_id, store_id, menu_ids)
+
+    try:
+        db.execute(
+            insert(models.MenuList),
+            [{"user_id": user_id, "menu_id": menu_id, "price": menus[menu_id]} for menu_id in menu_ids],
+        )
+        db.commit()
+    except IntegrityError:
+        # 동시에 같은 메뉴를 담은 요청이 먼저 커밋된 경우 (PK: user_id + menu_id)
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Menu already in cart")
+
+    return len(menu_ids)
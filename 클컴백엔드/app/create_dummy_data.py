@@ -1,7 +1,7 @@
 from .database import SessionLocal
 from app import models
 from sqlalchemy.orm import Session
-from app.utils.geocode import geocode_address  # 위에서 만든 함수 import
+from app.utils.geocode import geocode_addresses  # 위에서 만든 함수 import
 from . import database
 
 engine = database.engine
@@ -115,8 +115,10 @@ def create_dummy_data():
 
         # ① 상점 생성 + geocode
         print("=== 상점 데이터 생성 시작 ===")
+        # 주소 일괄 geocode (디스크 캐시 + 동시 요청)
+        coords = geocode_addresses([location for _, _, location, _, _ in STORE_DATA])
         for name, category, location, minimum_price, delivery_tip in STORE_DATA:
-            lat, lng = geocode_address(location)
+            lat, lng = coords[location]
 
             store = models.Store(
                 name=name,
@@ -0,0 +1,81 @@
+from sqlalchemy import DateTime, Integer, String, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from . import models
+from .utils.timeutil import now_naive
+
+
+def _update_balance(user_id: int, amount: int):
+    """
+    UPDATE users SET credit = credit + :amount WHERE id = :user_id [AND credit >= -:amount] RETURNING id, credit
+    차감(amount < 0)일 때만 잔액 조건을 붙입니다.
+    """
+    stmt = update(models.User).where(models.User.id == user_id)
+    if amount < 0:
+        stmt = stmt.where(models.User.credit >= -amount)
+    return stmt.values(credit=models.User.credit + amount).returning(models.User.id, models.User.credit)
+
+
+def _ledger_row(user_id: int, amount: int, balance_after: int, reason: str, order_id: int | None):
+    return {
+        "user_id": user_id,
+        "amount": amount,
+        "balance_after": balance_after,
+        "reason": reason,
+        "order_id": order_id,
+        "created_at": now_naive(),
+    }
+
+
+def _update_with_ledger(user_id: int, amount: int, reason: str, order_id: int | None):
+    """
+    PostgreSQL용 한 문장:
+    WITH balance AS (UPDATE users ... RETURNING id, credit)
+    INSERT INTO credit_ledger (...) SELECT ... FROM balance RETURNING balance_after
+    """
+    balance = _update_balance(user_id, amount).cte("balance")
+    return (
+        insert(models.CreditLedger)
+        .from_select(
+            ["user_id", "amount", "balance_after", "reason", "order_id", "created_at"],
+            select(
+                balance.c.id,
+                literal(amount, Integer),
+                balance.c.credit,
+                literal(reason, String),
+                literal(order_id, Integer),
+                literal(now_naive(), DateTime),
+            ),
+        )
+        .returning(models.CreditLedger.balance_after)
+    )
+
+
+def apply_credit(db: Session, user_id: int, amount: int, reason: str, order_id: int | None = None):
+    """
+    크레딧 잔액 변경 + 원장(credit_ledger) 기록. commit은 호출한 쪽에서 합니다.
+    PostgreSQL에서는 잔액 UPDATE와 원장 INSERT가 한 문장이고, 그 외 DB(SQLite)는 같은 트랜잭션의 두 문장입니다.
+
+    Returns:
+        변경 후 잔액. 사용자가 없거나 차감할 잔액이 부족하면 None (아무것도 바뀌지 않음)
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return db.scalar(_update_with_ledger(user_id, amount, reason, order_id))
+
+    row = db.execute(_update_balance(user_id, amount)).first()
+    if row is None:
+        return None
+    db.execute(insert(models.CreditLedger).values(_ledger_row(user_id, amount, row.credit, reason, order_id)))
+    return row.credit
+
+
+async def apply_credit_async(db: AsyncSession, user_id: int, amount: int, reason: str, order_id: int | None = None):
+    """apply_credit의 AsyncSession 버전"""
+    if db.get_bind().dialect.name == "postgresql":
+        return await db.scalar(_update_with_ledger(user_id, amount, reason, order_id))
+
+    row = (await db.execute(_update_balance(user_id, amount))).first()
+    if row is None:
+        return None
+    await db.execute(insert(models.CreditLedger).values(_ledger_row(user_id, amount, row.credit, reason, order_id)))
+    return row.credit
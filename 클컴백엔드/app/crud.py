@@ -1,62 +1,84 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from . import models
 from zoneinfo import ZoneInfo
 from fastapi import APIRouter, HTTPException
-from .database import SessionLocal
+import numpy as np
+from .utils.distance import distances
+from .utils.geo_index import pending_orders_index
+from .utils.notification_writer import notification_writer
+from .credit_service import apply_credit_async
 
 seoul_tz = ZoneInfo("Asia/Seoul")
 
 router = APIRouter(prefix="/match", tags=["match"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 def get_user(db: Session, user_id: str):
     return db.query(models.User).filter(models.User.id == user_id).first()
 
 def get_order(db: Session, order_id: int):
     return db.query(models.Order).filter(models.Order.id == order_id).first()
 
-def match_order(db: Session, order_id: int, matched_user_id: int):
-    # 1. Order 조회
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
+def owner_total_query(order_id: int, owner_id: int):
+    """주문 생성자가 담은 메뉴 금액 합계 (owner_total이 없는 예전 주문용)"""
+    return select(func.coalesce(func.sum(models.OrderItem.price), 0)).where(
+        models.OrderItem.order_id == order_id,
+        models.OrderItem.user_id == owner_id
+    )
+
+def match_amount(order: models.Order, matched_total: int, delivery_tip: int):
+    """매칭 참여자가 내야 할 금액 (나눠먹기: 생성자와 같은 금액 / 따로먹기: 자기 메뉴 + 배달팁 절반)"""
+    if order.split_type:
+        return int(order.owner_paid_amount)
+    return int(matched_total + delivery_tip / 2)
+
+async def match_order(db: AsyncSession, order_id: int, matched_user_id: int):
+    order, success, reason = await _match_order(db, order_id, matched_user_id)
+    if not success:
+        await db.rollback()  # 주문 행 잠금 해제
+    return order, success, reason
+
+async def _match_order(db: AsyncSession, order_id: int, matched_user_id: int):
+    # 1. Order 조회 + 행 잠금 (다른 사용자가 매칭 중이면 기다리지 않고 바로 실패)
+    order = await db.scalar(
+        select(models.Order)
+        .where(models.Order.id == order_id)
+        .with_for_update(skip_locked=True)
+    )
     if not order:
-        return None, False, "Order not found"
+        status = await db.scalar(select(models.Order.status).where(models.Order.id == order_id))
+        if status is None:
+            return None, False, "Order not found"
+        return None, False, "Order is being matched by another user"
 
     if order.status != "pending":
         return None, False, f"Order status is '{order.status}', cannot match"
 
-    # 2. Owner 조회
-    owner = db.query(models.User).filter(models.User.id == order.owner_id).first()
-
-    # 3. matched_user 조회
-    matched_user = db.query(models.User).filter(models.User.id == matched_user_id).first()
+    # 2. matched_user 조회
+    matched_user = await db.get(models.User, matched_user_id)
     if not matched_user:
         return None, False, "Matched user not found"
 
-    if matched_user.id == owner.id:
+    if matched_user.id == order.owner_id:
         return None, False, "Cannot match your own order"
 
-    # 4. store 조회
-    store = db.query(models.Store).filter(models.Store.id == order.store_id).first()
+    # 3. store 조회
+    store = await db.get(models.Store, order.store_id)
     if not store:
         return None, False, "Store not found"
 
-    # --- Owner의 주문 금액 계산 ---
-    owner_items = db.query(models.OrderItem).filter(
-        models.OrderItem.order_id == order.id,
-        models.OrderItem.user_id == owner.id
-    ).all()
-    owner_total = sum(item.price for item in owner_items)
+    # --- Owner의 주문 금액 (주문 생성 시 저장한 값, 없으면 OrderItem 합산) ---
+    owner_total = order.owner_total
+    if owner_total is None:
+        owner_total = await db.scalar(owner_total_query(order.id, order.owner_id))
 
     # --- matched_user 장바구니 조회 ---
-    cart_items = db.query(models.MenuList).filter(
-        models.MenuList.user_id == matched_user.id
-    ).all()
+    cart_items = (await db.scalars(
+        select(models.MenuList)
+        .where(models.MenuList.user_id == matched_user.id)
+        .options(selectinload(models.MenuList.menu))  # item.menu lazy load 방지
+    )).all()
     matched_total = sum(item.price for item in cart_items) if cart_items else 0
 
     # --- 전체 주문 금액 ---
@@ -67,20 +89,29 @@ def match_order(db: Session, order_id: int, matched_user_id: int):
         return None, False, "Total order price is below store minimum order price"
 
     # --- 금액 처리 ---
-    if order.split_type:
-        split_amount = int(order.owner_paid_amount)
-        if matched_user.credit < split_amount:
-            return None, False, "Matched user has insufficient credit"
-        matched_user.credit -= split_amount
-    else:
+    if not order.split_type:
         for item in cart_items:
             if item.menu.store_id != order.store_id:
                 return None, False, "Cart contains menu from a different store"
         if matched_total <= 0:
             return None, False, "Matched user cart is empty"
-        if matched_user.credit < matched_total:
-            return None, False, "Matched user has insufficient credit"
-        matched_user.credit -= int(matched_total + store.delivery_tip / 2)
+    amount = match_amount(order, matched_total, store.delivery_tip)
+
+    # 잔액 확인과 차감을 한 문장으로 처리 (원장 기록 포함)
+    if await apply_credit_async(db, matched_user.id, -amount, "match", order.id) is None:
+        return None, False, "Matched user has insufficient credit"
+
+    # --- Order 상태 변경 (삭제하지 않음) ---
+    # 행 잠금을 지원하지 않는 DB(SQLite 등)에서도 한 번만 성공하도록 status 조건부 UPDATE
+    # 매칭 완료 시 expires_at을 None으로 설정하여 타임아웃 방지
+    matched = await db.scalar(
+        update(models.Order)
+        .where(models.Order.id == order.id, models.Order.status == "pending")
+        .values(status="matched", expires_at=None)
+        .returning(models.Order.id)
+    )
+    if matched is None:
+        return None, False, "Order was matched by another user"
 
     # --- OrderItem 생성 + 장바구니 비우기 ---
     for item in cart_items:
@@ -90,15 +121,113 @@ def match_order(db: Session, order_id: int, matched_user_id: int):
             menu_id=item.menu_id,
             price=item.price
         ))
-        db.delete(item)
+        await db.delete(item)
+
+    # --- 매칭 성공 알림 (같은 트랜잭션에서 저장, commit 후 실시간 전송) ---
+    # 주문 생성자(owner)에게 알림
+    notification_writer.enlist(
+        db,
+        user_id=order.owner_id,
+        title="매칭 성공",
+        message=f"주문 #{order.id}이 성공적으로 매칭되었습니다."
+    )
+    # 매칭 참여자에게 알림
+    notification_writer.enlist(
+        db,
+        user_id=matched_user.id,
+        title="매칭 성공",
+        message=f"주문 #{order.id} 매칭에 참여하였습니다."
+    )
+
+    await db.commit()
+    pending_orders_index.remove(order.id)
+    await db.refresh(order)
 
-    # --- Order 상태 변경 (삭제하지 않음) ---
-    order.status = "matched"
-    # 매칭 완료 시 expires_at을 None으로 설정하여 타임아웃 방지
-    order.expires_at = None
+    return order, True, None
 
-    db.commit()
-    db.refresh(matched_user)
-    db.refresh(order)
+def suggest_matches(db: Session, user_id: int, lat: float | None = None, lon: float | None = None,
+                    radius: float = 1000, limit: int = 20, distance_weight: float = 0.5):
+    """
+    사용자의 장바구니로 매칭에 성공할 pending 주문을 찾아 추천 순으로 반환합니다.
+    match_order와 같은 조건(같은 가게, 합계 >= 최소 주문 금액, 크레딧 충분, 내 주문 아님)을 만족하는 주문만 포함하며,
+    거리와 내가 낼 금액을 각각 0~1로 정규화해 distance_weight 비율로 섞은 점수가 낮은 순으로 정렬합니다.
+
+    Returns:
+        (suggestions, reason) — 추천을 만들 수 없으면 suggestions는 None
+    """
+    user = db.query(models.User).filter(models.User.id == user_id).first()
+    if not user:
+        return None, "User not found"
+
+    cart = db.execute(
+        select(models.MenuList.price, models.Menu.store_id)
+        .join(models.Menu, models.Menu.id == models.MenuList.menu_id)
+        .where(models.MenuList.user_id == user_id)
+    ).all()
+    if not cart:
+        return None, "User cart is empty"
+    store_id = cart[0].store_id
+    cart_total = sum(row.price for row in cart)
+
+    # 위치를 주지 않으면 저장된 사용자 주소 좌표 사용
+    if lat is None or lon is None:
+        lat, lon = user.latitude, user.longitude
+
+    rows = db.execute(
+        select(models.Order, models.Store)
+        .join(models.Store, models.Store.id == models.Order.store_id)
+        .where(
+            models.Order.store_id == store_id,
+            models.Order.status == "pending",
+            models.Order.owner_id != user_id,
+            models.Order.owner_total.is_not(None),
+            models.Order.owner_total + cart_total >= models.Store.minimum_price,
+        )
+    ).all()
 
-    return order, True, None
+    candidates = []
+    for order, store in rows:
+        amount = match_amount(order, cart_total, store.delivery_tip)
+        if amount <= user.credit:
+            candidates.append((order, store, amount))
+    if not candidates:
+        return [], None
+
+    d = distances(lat, lon, [o.delivery_lat for o, _, _ in candidates], [o.delivery_lng for o, _, _ in candidates])
+    located = lat is not None and lon is not None
+    if located:
+        keep = d <= radius
+        candidates = [c for c, k in zip(candidates, keep) if k]
+        d = d[keep]
+        if not candidates:
+            return [], None
+
+    amounts = np.array([amount for _, _, amount in candidates], dtype=float)
+    score = _normalize(amounts) * (1 - distance_weight)
+    if located:
+        score += _normalize(d) * distance_weight
+
+    order_ids = np.array([order.id for order, _, _ in candidates])
+    ranked = np.lexsort((order_ids, score))[:limit]
+
+    suggestions = []
+    for i in ranked:
+        order, store, amount = candidates[i]
+        suggestions.append({
+            "order_id": order.id,
+            "store_id": store.id,
+            "store_name": store.name,
+            "delivery_location": order.delivery_location,
+            "split_type": order.split_type,
+            "distance_m": round(float(d[i]), 1) if located else None,
+            "owner_total": order.owner_total,
+            "cart_total": cart_total,
+            "total_price": order.owner_total + cart_total,
+            "my_amount": amount,
+            "expires_at": order.expires_at,
+        })
+    return suggestions, None
+
+def _normalize(values):
+    span = values.max() - values.min()
+    return (values - values.min()) / span if span > 0 else np.zeros_like(values)
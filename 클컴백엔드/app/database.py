@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -10,6 +10,9 @@ DATABASE_URL = os.environ.get(
     "delivery"
 )
 
+# RDS 읽기 전용 복제본 주소 (없으면 읽기 전용 조회도 primary 사용)
+READ_REPLICA_URL = os.environ.get("READ_REPLICA_URL")
+
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
@@ -21,4 +24,45 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
-Base = declarative_base()
\ No newline at end of file
+replica_engine = create_engine(
+    READ_REPLICA_URL,
+    pool_pre_ping=True,
+) if READ_REPLICA_URL else engine
+
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=replica_engine,
+)
+
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _reject_writes(session, flush_context, instances):
+    # 복제본 세션으로 쓰기를 시도하면 (복제본이 없어 primary에 붙어 있더라도) 바로 실패시킴
+    raise RuntimeError("읽기 전용 세션에서는 쓰기를 할 수 없습니다. get_db를 사용하세요.")
+
+
+Base = declarative_base()
+
+
+# DB 세션 의존성 주입
+def get_db():
+    """primary 세션. 쓰기, 그리고 방금 쓴 내용을 바로 다시 읽는 조회(read-your-writes)용."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db():
+    """
+    읽기 전용 세션 (READ_REPLICA_URL이 있으면 복제본).
+    복제 지연으로 방금 쓴 내용이 안 보일 수 있으므로 가게/메뉴 목록, 주문 피드, 알림 조회처럼
+    약간 늦게 보여도 되는 GET 엔드포인트에만 사용합니다.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
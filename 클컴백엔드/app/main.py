@@ -1,6 +1,16 @@
 from fastapi import FastAPI
-from .database import Base, engine
+from fastapi.responses import PlainTextResponse
+from .database import Base, engine, replica_engine
+from .async_database import async_engine
 from .routers import orders, users, match, google_auth, stores, cart, notifier
+from .utils.scheduler import expiry_scheduler
+from .utils.realtime import realtime
+from .utils.notification_writer import notification_writer
+from .utils.auto_matcher import auto_matcher, AUTO_MATCH_ENABLED
+from .utils import metrics, google_oauth
+from .utils.auth import JWTAuthMiddleware
+from .utils.jwt_utils import require_jwt_secret
+from .utils.idempotency import IdempotencyMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
@@ -11,9 +21,26 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 app = FastAPI(title="Joint Order Service")
 
-# DB 테이블 생성
-Base.metadata.create_all(bind=engine)
+# DB 스키마는 배포 단계에서 마이그레이션으로 관리 (alembic upgrade head)
+# 로컬 개발(SQLite 등)에서만 AUTO_CREATE_TABLES=1로 테이블 자동 생성
+if os.getenv("AUTO_CREATE_TABLES") == "1":
+    Base.metadata.create_all(bind=engine)
 
+# 라우트별 지연/SQL 수/DB 시간 + 커넥션 풀 지표 (/metrics)
+metrics.instrument_engine(engine, "sync")
+metrics.instrument_engine(async_engine.sync_engine, "async")
+if replica_engine is not engine:
+    metrics.instrument_engine(replica_engine, "replica")
+
+# Idempotency-Key 헤더가 있는 POST /orders/, /match/ 재시도는 저장된 첫 응답으로 처리 (JWTAuth 안쪽이라 토큰 사용자별 키)
+app.add_middleware(IdempotencyMiddleware)
+
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Authorization: Bearer 토큰 검증 → request.state.user (검증 결과는 토큰 만료 전까지 캐시)
+app.add_middleware(JWTAuthMiddleware)
+
+# CORS는 마지막에 등록해 가장 바깥에 둠 → Idempotency의 재전송/409/422 응답에도 CORS 헤더가 붙음
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],   # 모든 도메인 허용(개발 환경이면 이걸로 OK)
@@ -30,13 +57,37 @@ app.include_router(orders.router)
 app.include_router(match.router)
 app.include_router(google_auth.router)
 app.include_router(notifier.router)
+app.include_router(notifier.ws_router)
 
 
 @app.on_event("startup")
 async def startup_event():
+    # 서명 키 없이 뜨지 않도록 가장 먼저 확인
+    require_jwt_secret()
     print("Joint Order Service 서버 시작")
-    print("WebSocket: /ws/user/{user_id}")
+    print("WebSocket: /ws/user/{user_id}?token=<JWT>")
+    # 알림 실시간 전송 브로커 시작
+    await realtime.start()
+    await notification_writer.start()
+    # 주문 만료 스케줄러 시작 (DB의 pending 주문으로 상태 복구)
+    await expiry_scheduler.start()
+    # 주변 pending 주문 자동 매칭 (AUTO_MATCH_ENABLED=1 일 때만)
+    if AUTO_MATCH_ENABLED:
+        await auto_matcher.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await auto_matcher.stop()
+    await expiry_scheduler.stop()
+    await notification_writer.stop()
+    await realtime.stop()
+    await google_oauth.aclose()
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    # Prometheus 텍스트 형식 (인스턴스 로컬 스크레이퍼용)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,10 +1,9 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, Float, Index, Text, text
+from sqlalchemy.orm import relationship, validates
 from .database import Base
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
-
-seoul_tz = ZoneInfo("Asia/Seoul")
+from .utils.region import parse_region
+from .utils.timeutil import now_naive
+from datetime import timedelta
 
 class User(Base):
     __tablename__ = "users"
@@ -41,11 +40,12 @@ class Order(Base):
 
     split_type = Column(Boolean, nullable=False)
     owner_paid_amount = Column(Integer, nullable=False)
+    owner_total = Column(Integer, nullable=True)  # 생성자 메뉴 금액 합계 (매칭 검사/추천에서 OrderItem 합산 대신 사용)
 
-    created_at = Column(DateTime, default=datetime.now(seoul_tz))
-    expires_at = Column(DateTime, default=lambda: datetime.now(seoul_tz) + timedelta(minutes=30))
+    created_at = Column(DateTime, default=now_naive)
+    expires_at = Column(DateTime, default=lambda: now_naive() + timedelta(minutes=30))
 
-    status = Column(String, default="pending") # 주문 상태: pending, matched, completed, cancelled 등
+    status = Column(String, default="pending") # 주문 상태: pending, matched, merged(자동 매칭으로 다른 주문에 합류), completed, cancelled, expired 등
 
     store = relationship("Store", back_populates="orders")
     owner = relationship("User", back_populates="orders", foreign_keys=[owner_id])
@@ -53,6 +53,16 @@ class Order(Base):
 
     items = relationship("OrderItem", back_populates="order", cascade="all, delete")
 
+    __table_args__ = (
+        Index("ix_orders_status_store_id", "status", "store_id"),
+        Index("ix_orders_owner_id", "owner_id"),
+        Index("ix_orders_creator_id", "creator_id"),
+        Index("ix_orders_created_at_id", "created_at", "id"),  # keyset 페이지네이션
+        # 만료 스케줄러 / 주문 피드용 부분 인덱스 (pending 주문만)
+        Index("ix_orders_pending_expires_at", "expires_at",
+              postgresql_where=text("status = 'pending'"), sqlite_where=text("status = 'pending'")),
+    )
+
 class Store(Base):
     __tablename__ = "stores"
 
@@ -64,6 +74,11 @@ class Store(Base):
     latitude = Column(Float, nullable=True)   # 추가
     longitude = Column(Float, nullable=True)  # 추가
 
+    # location에서 추출한 행정구역 (location을 쓸 때 자동으로 채워짐)
+    region_city = Column(String, nullable=True)      # 시
+    region_district = Column(String, nullable=True)  # 구/군
+    region_dong = Column(String, nullable=True)      # 동/읍/면
+
     minimum_price = Column(Integer, nullable=False)
     delivery_tip = Column(Integer, nullable=False)
     delivery_delay = Column(Integer, nullable=False)  # 예상 배달 시간(분)
@@ -71,6 +86,16 @@ class Store(Base):
     menus = relationship("Menu", back_populates="store")
     orders = relationship("Order", back_populates="store")
 
+    __table_args__ = (
+        Index("ix_stores_category", "category"),
+        Index("ix_stores_region", "region_city", "region_district", "region_dong"),
+    )
+
+    @validates("location")
+    def _set_region(self, key, location):
+        self.region_city, self.region_district, self.region_dong = parse_region(location)
+        return location
+
 class Menu(Base):
     __tablename__ = "menu"
 
@@ -105,6 +130,10 @@ class OrderItem(Base):
     user = relationship("User", back_populates="order_items")
     menu = relationship("Menu", back_populates="order_items")
 
+    __table_args__ = (
+        Index("ix_order_items_user_id", "user_id"),
+    )
+
 class Notification(Base):
     __tablename__ = "notifications"
 
@@ -113,4 +142,40 @@ class Notification(Base):
     title = Column(String)
     message = Column(String)
     is_read = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.now(seoul_tz))
+    created_at = Column(DateTime, default=now_naive)
+
+    __table_args__ = (
+        Index("ix_notifications_user_id_is_read_created_at_id", "user_id", "is_read", "created_at", "id"),
+    )
+
+class CreditLedger(Base):
+    """크레딧 변동 기록 (추가만 함). 사용자별 amount 합계 = users.credit"""
+    __tablename__ = "credit_ledger"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    amount = Column(Integer, nullable=False)          # 충전/환불 +, 차감 -
+    balance_after = Column(Integer, nullable=False)   # 변동 직후 users.credit
+    reason = Column(String, nullable=False)           # opening / charge / order / order_cancel / match
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=True)
+    created_at = Column(DateTime, default=now_naive)
+
+    __table_args__ = (
+        Index("ix_credit_ledger_user_id_id", "user_id", "id"),
+    )
+
+class IdempotencyKey(Base):
+    """Idempotency-Key 헤더로 들어온 요청의 첫 응답 (재시도 시 그대로 반환)"""
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)             # "{method} {path} {user_id} {헤더 값}"
+    request_hash = Column(String, nullable=False)       # 요청 본문 sha256 (같은 키로 다른 요청을 보내면 거부)
+    status_code = Column(Integer, nullable=True)        # NULL이면 처리 중
+    content_type = Column(String, nullable=True)
+    body = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
@@ -0,0 +1,90 @@
+"""
+크레딧 원장 대사(reconciliation).
+
+credit_ledger를 (user_id, id) 순으로 스트리밍하면서
+  1) 각 행의 balance_after가 그 사용자의 누적 amount와 같은지 (원장 자체의 연속성)
+  2) 사용자별 amount 합계가 users.credit과 같은지
+를 확인합니다. 원장 전체를 메모리에 올리지 않고 batch_size 행씩 읽습니다.
+운영 DB에서도 쓸 수 있도록 두 조회는 한 REPEATABLE READ 트랜잭션(같은 스냅샷)에서 실행합니다 (PostgreSQL).
+
+실행 예:
+    python -m app.reconcile_credits --batch-size 10000
+불일치가 있으면 종료 코드 1
+"""
+import argparse
+import sys
+from sqlalchemy import select
+from .database import SessionLocal
+from . import models
+
+
+def reconcile(db, batch_size: int = 10000, max_report: int = 20):
+    """
+    db는 아직 트랜잭션을 시작하지 않은 Session이어야 합니다 (격리 수준을 정하기 위해).
+
+    Returns:
+        (ledger_rows, users_checked, problems) — problems는 [(user_id, 설명)]
+    """
+    problems = []
+    totals = {}   # user_id -> 원장 합계
+
+    # 원장과 users를 같은 스냅샷에서 읽음 — 두 조회 사이에 commit된 크레딧 변경이 불일치로 보이지 않도록
+    # (트랜잭션의 첫 문장 전에 정해야 함. SQLite는 로컬 개발용이라 그대로 둠)
+    if db.get_bind().dialect.name == "postgresql":
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    rows = db.execute(
+        select(models.CreditLedger.id, models.CreditLedger.user_id,
+               models.CreditLedger.amount, models.CreditLedger.balance_after)
+        .order_by(models.CreditLedger.user_id, models.CreditLedger.id)
+        .execution_options(yield_per=batch_size)
+    )
+    ledger_rows = 0
+    balance = {}  # user_id -> 직전 행의 balance_after (끊긴 곳을 한 번만 보고하도록 기록된 값으로 이어감)
+    for entry_id, user_id, amount, balance_after in rows:
+        ledger_rows += 1
+        totals[user_id] = totals.get(user_id, 0) + amount
+        expected = balance.get(user_id, 0) + amount
+        if balance_after != expected:
+            problems.append((user_id, f"원장 #{entry_id}: balance_after {balance_after} != 직전 잔액 + amount {expected}"))
+        balance[user_id] = balance_after
+
+    users = db.execute(
+        select(models.User.id, models.User.credit)
+        .order_by(models.User.id)
+        .execution_options(yield_per=batch_size)
+    )
+    users_checked = 0
+    for user_id, credit in users:
+        users_checked += 1
+        expected = totals.pop(user_id, 0)
+        if (credit or 0) != expected:
+            problems.append((user_id, f"users.credit {credit} != 원장 합계 {expected}"))
+
+    for user_id, total in totals.items():
+        problems.append((user_id, f"없는 사용자의 원장 합계 {total}"))
+
+    for user_id, message in problems[:max_report]:
+        print(f"[Reconcile] user {user_id}: {message}")
+    if len(problems) > max_report:
+        print(f"[Reconcile] ... 외 {len(problems) - max_report}건")
+    return ledger_rows, users_checked, problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        ledger_rows, users_checked, problems = reconcile(db, args.batch_size)
+    finally:
+        db.close()
+
+    print(f"원장 {ledger_rows}행, 사용자 {users_checked}명 확인 → 불일치 {len(problems)}건")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
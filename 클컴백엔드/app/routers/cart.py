@@ -1,63 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..database import SessionLocal
-from .. import models
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session, joinedload
+from ..database import get_db
+from .. import models, cart_service
+from ..schemas import CartItemOut, CartBulkAdd
+from ..utils.auth import require_user
 
 router = APIRouter(prefix="/cart", tags=["cart"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/add")
-def add_to_cart(user_id: int, store_id: int, menu_id: int, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    store = db.query(models.Store).filter(models.Store.id == store_id).first()
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-    
-    menu = db.query(models.Menu).filter(models.Menu.id == menu_id, models.Menu.store_id == store_id).first()
-    if not menu:
-        raise HTTPException(status_code=404, detail="Menu not found in the specified store")
-
-    # 장바구니 내 기존 아이템 확인
-    cart_items = db.query(models.MenuList).filter(models.MenuList.user_id == user.id).all()
-    if cart_items:
-        existing_store_id = db.query(models.Menu).filter(models.Menu.id == cart_items[0].menu_id).first().store_id
-        if menu.store_id != existing_store_id:
-            raise HTTPException(status_code=400, detail="All items in cart must be from the same store")
-
-    # 메뉴가 이미 장바구니에 있으면 수량 합산
-    existing_item = db.query(models.MenuList).filter(
-        models.MenuList.user_id == user.id,
-        models.MenuList.menu_id == menu_id
-    ).first()
-    
-    if existing_item:
-        raise HTTPException(status_code=400, detail="Menu already in cart")
-    else:
-        cart_item = models.MenuList(
-            user_id=user.id,
-            menu_id=menu.id,
-            price=menu.price
-        )
-        db.add(cart_item)
-    
-    db.commit()
-    
+def add_to_cart(user_id: int, store_id: int, menu_id: int, request: Request, db: Session = Depends(get_db)):
+    require_user(request, user_id)
+    cart_service.add_items(db, user_id, store_id, [menu_id])
     return {"message": "Menu added to cart"}
 
-@router.get("/{user_id}")
-def get_cart(user_id: int, db: Session = Depends(get_db)):
-    cart_items = db.query(models.MenuList).filter(models.MenuList.user_id == user_id).all()
-    
+@router.post("/add-bulk")
+def add_many_to_cart(body: CartBulkAdd, request: Request, db: Session = Depends(get_db)):
+    require_user(request, body.user_id)
+    # 같은 가게 메뉴 여러 개를 한 번에 담기 (전부 담기거나 하나도 안 담김)
+    added = cart_service.add_items(db, body.user_id, body.store_id, body.menu_ids)
+    return {"message": "Menus added to cart", "added": added}
+
+@router.get("/{user_id}", response_model=list[CartItemOut])
+def get_cart(user_id: int, request: Request, db: Session = Depends(get_db)):
+    require_user(request, user_id)
+    cart_items = (
+        db.query(models.MenuList)
+        .options(joinedload(models.MenuList.menu))  # 메뉴 이름을 한 번의 JOIN으로 함께 로드
+        .filter(models.MenuList.user_id == user_id)
+        .all()
+    )
+
     return [
         {
             "menu_id": item.menu_id,
@@ -67,7 +39,8 @@ def get_cart(user_id: int, db: Session = Depends(get_db)):
     ]
 
 @router.delete("/remove")
-def remove_from_cart(user_id: int, menu_id: int, db: Session = Depends(get_db)):
+def remove_from_cart(user_id: int, menu_id: int, request: Request, db: Session = Depends(get_db)):
+    require_user(request, user_id)
     cart_item = db.query(models.MenuList).filter(
         models.MenuList.user_id == user_id,
         models.MenuList.menu_id == menu_id
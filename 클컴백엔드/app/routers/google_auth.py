@@ -1,26 +1,21 @@
 # auth/google_auth.py
 
 import os
-import requests    # 구글 api 호출
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import RedirectResponse
 from dotenv import load_dotenv
-from .users import find_user_by_email, create_user_record
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import models
 from ..utils.jwt_utils import create_jwt
-from sqlalchemy.orm import Session
-from ..database import SessionLocal
+from ..utils.google_oauth import GoogleOAuthError, get_client
+from ..async_database import get_async_db
 
 load_dotenv()
 
 router = APIRouter(prefix="/auth/google")
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # 환경변수에서 민감 정보 로드
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
@@ -42,7 +37,7 @@ def google_login():
 
 
 @router.get("/callback")
-def google_callback(code: str = None, error: str = None, db: Session = Depends(get_db)):
+async def google_callback(code: str = None, error: str = None, db: AsyncSession = Depends(get_async_db)):
     # 사용자가 로그인을 취소한 경우
     if error:
         return RedirectResponse(f"{FRONT_LOGIN}?error={error}")
@@ -51,41 +46,39 @@ def google_callback(code: str = None, error: str = None, db: Session = Depends(g
         return RedirectResponse(f"{FRONT_LOGIN}?error=no_code")
 
     # 구글에서 code 를 보냄 로그인 성공 시에
-    # access token 요청
-    token_url = "https://oauth2.googleapis.com/token" # 토큰 요청 주소
-    token_data = {            # 받을 토큰 데이터들
-        "code": code,
-        "client_id": GOOGLE_CLIENT_ID,
-        "client_secret": GOOGLE_CLIENT_SECRET,
-        "redirect_uri": REDIRECT_URI,
-        "grant_type": "authorization_code",
-    }
-
-    token_res = requests.post(token_url, data=token_data)   # 구글에 POST 요청 후 토큰을 받음 / 파라미터로 토큰 url , 토큰 데이터
-
-    if token_res.status_code != 200:   # 실패시 에러반환  요청 성공 200 / 실패 400~500
+    # code → 토큰 교환 (공유 async 클라이언트: 연결 재사용 + 타임아웃)
+    oauth = get_client()
+    try:
+        token_json = await oauth.exchange_code(code)
+    except GoogleOAuthError as e:
+        print(f"[GoogleOAuth Error] {e}")
         raise HTTPException(status_code=400, detail="Failed to fetch token")
 
-    token_json = token_res.json()   # 토큰 정보를 json으로 변환
-    id_token = token_json.get("id_token")
-
-    # 구글 id_token으로 사용자 정보 요청  -> json으로 받음
-    user_info_res = requests.get(f"https://oauth2.googleapis.com/tokeninfo?id_token={id_token}")
-    user_info = user_info_res.json()
+    # id_token은 구글 서명 키로 직접 검증 (tokeninfo 호출 없음, 키는 캐시)
+    try:
+        user_info = await oauth.verify_id_token(token_json.get("id_token") or "")
+    except GoogleOAuthError as e:
+        print(f"[GoogleOAuth Error] {e}")
+        raise HTTPException(status_code=400, detail="Invalid id_token")
 
     email = user_info["email"]
     name = user_info.get("name", "")
 
-
-
-    # DB 저장 또는 기존 유저 불러오기  -> 실직적으로 DB 따로 구현
-    user = find_user_by_email(db, email)
+    # DB 저장 또는 기존 유저 불러오기
+    user = await db.scalar(select(models.User).where(models.User.email == email))
     if not user:
-        user = create_user_record(db, email, name)
+        user = models.User(email=email, name=name)
+        db.add(user)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # 같은 계정의 첫 로그인이 동시에 들어와 먼저 저장된 경우
+            await db.rollback()
+            user = await db.scalar(select(models.User).where(models.User.email == email))
 
     # JWT 만들기
     jwt_token = create_jwt(user)
 
     # 프론트로 리다이렉션
     redirect_url = f"{FRONT_REDIRECT}?token={jwt_token}"
-    return RedirectResponse(redirect_url)
\ No newline at end of file
+    return RedirectResponse(redirect_url)
@@ -1,57 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request
 from sqlalchemy.orm import Session
-from ..database import SessionLocal
-from ..routers.notifier import create_notification
-from app.schemas import MatchRequest
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db
+from ..async_database import get_async_db
+from ..utils.notification_writer import notification_writer
+from ..utils.auth import require_user
+from app.schemas import MatchRequest, MatchSuggestionOut
 from .. import crud
 
 router = APIRouter(prefix="/match", tags=["match"])
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/")
-async def match_order(match_request: MatchRequest = Body(...), db: Session = Depends(get_db)):
+async def match_order(request: Request, match_request: MatchRequest = Body(...), db: AsyncSession = Depends(get_async_db)):
+    require_user(request, match_request.matched_user_id)
+
     # 1. 주문 매칭 처리
-    order, success, reason = crud.match_order(
+    order, success, reason = await crud.match_order(
         db=db,
         order_id=match_request.order_id,
         matched_user_id=match_request.matched_user_id
     )
 
     if not success:
-        # 매칭 실패 알림
-        create_notification(
-            db=db,
+        # 매칭 실패 알림 (버퍼에 넣고 writer가 모아서 저장)
+        notification_writer.enqueue(
             user_id=match_request.matched_user_id,
             title="매칭 실패",
             message=f"주문 #{match_request.order_id} 매칭에 실패했습니다: {reason}"
         )
         raise HTTPException(status_code=400, detail=reason)
 
-    # 2. 매칭 성공 알림
-    # 주문 생성자(owner)에게 알림
-    create_notification(
-        db=db,
-        user_id=order.owner_id,
-        title="매칭 성공",
-        message=f"주문 #{order.id}이 성공적으로 매칭되었습니다."
-    )
-
-    # 매칭 참여자에게 알림
-    create_notification(
-        db=db,
-        user_id=match_request.matched_user_id,
-        title="매칭 성공",
-        message=f"주문 #{order.id} 매칭에 참여하였습니다."
-    )
+    # 2. 매칭 성공 알림은 crud.match_order의 매칭 트랜잭션에 함께 저장됨
 
     return {
         "message": "Order matched successfully",
         "order_id": order.id
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/suggest", response_model=list[MatchSuggestionOut])
+def suggest_matches(
+    user_id: int,
+    request: Request,
+    lat: float | None = None,
+    lon: float | None = None,
+    radius: float = Query(1000, gt=0, le=5000),              # 검색 반경(m)
+    limit: int = Query(20, ge=1, le=100),
+    distance_weight: float = Query(0.5, ge=0, le=1),         # 1이면 거리만, 0이면 금액만 반영
+    db: Session = Depends(get_db)                            # 방금 담은 장바구니를 읽으므로 primary
+):
+    require_user(request, user_id)
+
+    # 내 장바구니로 매칭에 성공할 주문만 거리 + 내가 낼 금액 기준으로 추천
+    suggestions, reason = crud.suggest_matches(
+        db, user_id, lat=lat, lon=lon, radius=radius, limit=limit, distance_weight=distance_weight
+    )
+    if suggestions is None:
+        raise HTTPException(status_code=404 if reason == "User not found" else 400, detail=reason)
+    return suggestions
@@ -1,4 +1,3 @@
-from datetime import datetime
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -9,47 +8,49 @@ if os.name == 'nt':  # 윈도우일 경우만
     ctypes.windll.kernel32.SetConsoleOutputCP(65001)
 from sqlalchemy.orm import Session
 from .. import models
-from fastapi import APIRouter, Depends, HTTPException
-from ..database import SessionLocal
-from zoneinfo import ZoneInfo
-
-seoul_tz = ZoneInfo("Asia/Seoul")
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from ..database import get_db, get_read_db
+from ..utils.realtime import realtime
+from ..utils.notification_writer import notification_writer
+from ..utils.pagination import is_paginated, paginate, page
+from ..schemas import NotificationOut, Page
+from ..utils.auth import require_user, websocket_user
 
 router = APIRouter(prefix="/notifier", tags=["notifier"])
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+ws_router = APIRouter(tags=["notifier"])
 
 def create_notification(db: Session, user_id: int, title: str, message: str):
     """
-    Polling 방식 알림을 위해 DB에 알림을 저장하는 함수.
+    DB에 알림을 저장하고 바로 commit 하는 함수.
+    commit 후 사용자가 WebSocket으로 연결되어 있으면 바로 전송되며, DB 행은 polling fallback입니다.
+    여러 알림을 보내거나 이미 트랜잭션이 있다면 notification_writer.enlist / enqueue를 사용하세요.
     """
-    notification = models.Notification(
-        user_id=user_id,
-        title=title,
-        message=message,
-        is_read=False,
-        created_at=datetime.now(seoul_tz)
-    )
-
-    db.add(notification)
+    notification = notification_writer.enlist(db, user_id, title, message)
     db.commit()
     db.refresh(notification)
 
     return notification
 
-@router.get("/notifications/{user_id}")
-def get_notifications(user_id: int, db: Session = Depends(get_db)):
-    notices = db.query(models.Notification).filter(
+@router.get("/notifications/{user_id}", response_model=list[NotificationOut] | Page[NotificationOut])
+def get_notifications(
+    user_id: int,
+    request: Request,
+    limit: int | None = Query(None, ge=1, le=100),
+    cursor: str | None = None,
+    db: Session = Depends(get_read_db)
+):
+    require_user(request, user_id)
+
+    query = db.query(models.Notification).filter(
         models.Notification.user_id == user_id,
         models.Notification.is_read == False
-    ).order_by(models.Notification.created_at.desc()).all()
+    )
+
+    if not is_paginated(limit, cursor):
+        return query.order_by(models.Notification.created_at.desc()).all()
 
-    return notices
+    notices, next_cursor = paginate(query, models.Notification.created_at, models.Notification.id, limit, cursor)
+    return page(notices, next_cursor)
 
 @router.post("/notifications/{notification_id}/read")
 def read_notification(notification_id: int, db: Session = Depends(get_db)):
@@ -62,4 +63,23 @@ def read_notification(notification_id: int, db: Session = Depends(get_db)):
 
     notice.is_read = True
     db.commit()
-    return {"message": "ok"}
\ No newline at end of file
+    return {"message": "ok"}
+
+@ws_router.websocket("/ws/user/{user_id}")
+async def user_notifications_socket(websocket: WebSocket, user_id: int):
+    """
+    알림 실시간 수신용 WebSocket. 연결되어 있는 동안 새 알림이 즉시 전송됩니다.
+    토큰(?token=<JWT> 또는 Sec-WebSocket-Protocol: bearer, <JWT>)이 필요하며, 없거나 다른 사용자면 1008로 닫습니다.
+    """
+    user, subprotocol = websocket_user(websocket)
+    if user is None or user["user_id"] != user_id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await realtime.manager.connect(user_id, websocket, subprotocol)
+    try:
+        while True:
+            await websocket.receive_text()  # 클라이언트 메시지(ping 등)는 무시
+    except WebSocketDisconnect:
+        pass
+    finally:
+        realtime.manager.disconnect(user_id, websocket)
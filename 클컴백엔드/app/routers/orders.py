@@ -1,58 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import Integer, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db, get_read_db
+from ..async_database import get_async_db
 from .. import models
-from ..schemas import OrderCreate
-from datetime import datetime
-from zoneinfo import ZoneInfo
+from ..schemas import OrderCreate, OrderOut, OrderDetailOut, MyOrderOut, Page
 from datetime import timedelta
-import asyncio
-from ..utils.scheduler import start_timeout_task
-from ..utils.distance import distance
-
-seoul_tz = ZoneInfo("Asia/Seoul")
+from ..utils.scheduler import expiry_scheduler
+from ..utils.timeutil import now_naive
+from ..utils.geo_index import pending_orders_index
+from ..utils.pagination import is_paginated, paginate, page
+from ..utils.auth import require_user
+from ..credit_service import apply_credit, apply_credit_async
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
-# DB 세션 의존성 주입
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/")
-async def create_order(order: OrderCreate, db: Session = Depends(get_db)):
+async def create_order(order: OrderCreate, request: Request, db: AsyncSession = Depends(get_async_db)):
+    require_user(request, order.creator_id)
+
+    # 주문 생성은 한 트랜잭션, 장바구니 크기와 무관하게 일정한 수의 SQL로 처리
+    # (사용자 조회, 장바구니 합계, 주문 INSERT, 크레딧 차감+원장, 주문 아이템 INSERT ... SELECT, 장바구니 DELETE)
+
     # 1. 주문 생성자(User) 조회
-    user = db.query(models.User).filter(models.User.id == order.creator_id).first()
+    user = await db.get(models.User, order.creator_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    # 2. User 장바구니(MenuList) 조회
-    cart_items = db.query(models.MenuList).filter(models.MenuList.user_id == user.id).all()
-    if not cart_items:
+    # 2. 장바구니 가게 + 총 금액 (한 번의 집계 조회)
+    carts = (await db.execute(
+        select(models.Store, func.sum(models.MenuList.price))
+        .join(models.Menu, models.Menu.store_id == models.Store.id)
+        .join(models.MenuList, models.MenuList.menu_id == models.Menu.id)
+        .where(models.MenuList.user_id == user.id)
+        .group_by(models.Store.id)
+    )).all()
+    if not carts:
         raise HTTPException(status_code=400, detail="User cart is empty")
+    if len(carts) > 1:
+        raise HTTPException(status_code=400, detail="All items in cart must be from the same store")
+    store, total_price = carts[0]
 
-    # 2-1. 장바구니 첫 메뉴 → store_id 가져오기
-    first_menu = db.query(models.Menu).filter(
-        models.Menu.id == cart_items[0].menu_id
-    ).first()
-
-    if not first_menu:
-        raise HTTPException(status_code=404, detail="Cart item contains invalid menu")
-
-    store = db.query(models.Store).filter(
-        models.Store.id == first_menu.store_id
-    ).first()
-
-    if not store:
-        raise HTTPException(status_code=404, detail="Store not found")
-
-    # 3. 총 금액 계산
-    total_price = sum(item.price for item in cart_items)
-
-    # 4. Split type / minimum_price 체크
+    # 3. Split type / minimum_price 체크
     if order.split_type:
         if total_price < store.minimum_price:
             raise HTTPException(status_code=400, detail="Total menu price is below store minimum")
@@ -60,21 +50,17 @@ async def create_order(order: OrderCreate, db: Session = Depends(get_db)):
     else:
         owner_pay = total_price + store.delivery_tip / 2
 
-    # 크레딧 부족 체크
+    # 크레딧 부족 체크 (빠른 실패용, 실제 차감은 아래 조건부 UPDATE가 판단)
     if user.credit < owner_pay:
         raise HTTPException(status_code=400, detail="Insufficient credit")
 
-    # 5. 크레딧 차감
-    user.credit -= int(owner_pay)
-    db.commit()
-    db.refresh(user)
-
-    # 5-1. 프론트에서 위도/경도 전달받아 저장
+    # 4. 프론트에서 위도/경도 전달받아 저장
     detailed_location = order.detailed_location
     lat = order.delivery_lat
     lng = order.delivery_lng
 
-    # 6. Order 생성
+    # 5. Order 생성 (DateTime 컬럼은 naive 서울 시각 — asyncpg는 aware 값을 naive 컬럼에 넣지 못함)
+    now = now_naive()
     new_order = models.Order(
         creator_id=user.id,
         owner_id=user.id,
@@ -85,32 +71,46 @@ async def create_order(order: OrderCreate, db: Session = Depends(get_db)):
         delivery_lng=lng,
         split_type=order.split_type,
         owner_paid_amount=int(owner_pay),
-        created_at=datetime.now(seoul_tz),
-        expires_at=datetime.now(seoul_tz) + timedelta(minutes=30)
+        owner_total=total_price,
+        created_at=now,
+        expires_at=now + timedelta(minutes=30)
     )
     db.add(new_order)
-    db.commit()
-    db.refresh(new_order)
-
-    asyncio.create_task(start_timeout_task(new_order.id, user.id))
-
-    # 7. OrderItem 생성 (장바구니 → OrderItem)
-    order_items = []
-    for item in cart_items:
-        order_item = models.OrderItem(
-            order_id=new_order.id,
-            user_id=user.id,
-            menu_id=item.menu_id,
-            price=item.price
+    await db.flush()
+
+    # 6. 크레딧 차감 + 원장 기록
+    if await apply_credit_async(db, user.id, -int(owner_pay), "order", new_order.id) is None:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Insufficient credit")
+
+    # 7. 장바구니 → OrderItem (INSERT ... SELECT 한 번)
+    order_items = (await db.execute(
+        insert(models.OrderItem)
+        .from_select(
+            ["order_id", "user_id", "menu_id", "price"],
+            select(literal(new_order.id, Integer), models.MenuList.user_id,
+                   models.MenuList.menu_id, models.MenuList.price)
+            .where(models.MenuList.user_id == user.id)
         )
-        db.add(order_item)
-        order_items.append(order_item)
+        .returning(models.OrderItem.menu_id, models.OrderItem.price)
+    )).all()
 
-    # 8. 장바구니 비우기
-    for item in cart_items:
-        db.delete(item)
+    # 합계를 계산한 뒤 장바구니가 바뀌었으면 (동시 요청) 청구 금액과 아이템이 어긋나므로 취소
+    if sum(item.price for item in order_items) != total_price:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Cart changed while creating order, please retry")
 
-    db.commit()
+    # 8. 복사한 장바구니 아이템만 삭제 (DELETE 한 번). INSERT ... SELECT 이후 /cart/add로 들어온 아이템은
+    #    주문에 포함되지 않았으므로 장바구니에 남김
+    await db.execute(delete(models.MenuList).where(
+        models.MenuList.user_id == user.id,
+        models.MenuList.menu_id.in_([item.menu_id for item in order_items])
+    ))
+
+    await db.commit()
+
+    expiry_scheduler.schedule(new_order.id, new_order.expires_at)
+    pending_orders_index.add(new_order.id, store.category, lat, lng)
 
     return {
         "message": "Order created successfully",
@@ -126,54 +126,75 @@ async def create_order(order: OrderCreate, db: Session = Depends(get_db)):
         ]
     }
 
-@router.get("/")
+@router.get("/", response_model=list[OrderOut] | Page[OrderOut])
 def get_orders(
     category: str,
     lat: float | None = None,
     lon: float | None = None,
-    db: Session = Depends(get_db)
+    radius: float = Query(300, gt=0, le=5000),       # 검색 반경(m)
+    limit: int | None = Query(None, ge=1, le=200),   # 위치 검색: 가까운 순 상위 k개 / 그 외: 페이지 크기
+    cursor: str | None = None,                       # 이전 응답의 next_cursor
+    db: Session = Depends(get_read_db)   # 피드는 복제본에서 조회 (매칭 시 primary에서 다시 확인)
 ):
-    # 1) 카테고리 맞는 주문 중 pending 상태만 조회
-    orders = (
+    paginated = is_paginated(limit, cursor)
+
+    # 1) 위치 정보가 있으면 격자 인덱스로 주변 후보만 찾은 뒤 DB에서 pending 여부 확인 (배달 위치 기준)
+    if lat is not None and lon is not None:
+        pending_orders_index.sync(db)
+        candidates = pending_orders_index.nearby(category, lat, lon, radius=radius)
+        orders = []
+        if candidates:
+            rank = {order_id: i for i, (order_id, _) in enumerate(candidates)}
+            orders = (
+                db.query(models.Order)
+                .filter(models.Order.id.in_(rank.keys()))
+                .filter(models.Order.status == "pending")
+                .all()
+            )
+            # 가까운 순 정렬 후 상위 limit개
+            orders.sort(key=lambda o: rank[o.id])
+            orders = orders[:limit] if limit else orders
+
+        # 거리순 결과는 상위 k개로 끝나므로 다음 커서 없음
+        return page(orders, None) if paginated else orders
+
+    # 2) 위치 정보 없으면 카테고리 맞는 pending 주문 반환 (최신순)
+    query = (
         db.query(models.Order)
         .join(models.Store)
         .filter(models.Store.category == category)
         .filter(models.Order.status == "pending")
-        .all()
     )
+    if not paginated:
+        return query.all()
 
-    # 2) 위치 정보가 있으면 거리 필터링 적용 (배달 위치 기준)
-    if lat is not None and lon is not None:
-        result = []
-        for order in orders:
-            if order.delivery_lat is not None and order.delivery_lng is not None:
-                d = distance(lat, lon, order.delivery_lat, order.delivery_lng)
-                if d <= 300:  # 300m 이하
-                    result.append(order)
-        return result
-
-    # 위치 정보 없으면 모든 주문 반환
-    return orders
-
-@router.get("/{order_id}")
+    orders, next_cursor = paginate(query, models.Order.created_at, models.Order.id, limit, cursor)
+    return page(orders, next_cursor)
+
+@router.get("/{order_id}", response_model=OrderDetailOut)
 def get_order_detail(order_id: int, db: Session = Depends(get_db)):
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
+    # 가게 + 주문 아이템 + 메뉴를 한 번에 로드 (아이템 수와 무관하게 쿼리 2번)
+    order = (
+        db.query(models.Order)
+        .options(
+            joinedload(models.Order.store),
+            selectinload(models.Order.items).joinedload(models.OrderItem.menu),
+        )
+        .filter(models.Order.id == order_id)
+        .first()
+    )
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    store = db.query(models.Store).filter(models.Store.id == order.store_id).first()
-
-    # 주문 아이템들 가져오기
-    order_items = db.query(models.OrderItem).filter(models.OrderItem.order_id == order_id).all()
-    items_with_menu = []
-    for item in order_items:
-        menu = db.query(models.Menu).filter(models.Menu.id == item.menu_id).first()
-        items_with_menu.append({
-            "menu_id": item.menu_id,
-            "menu_name": menu.name if menu else "Unknown",
-            "price": item.price,
-            "user_id": item.user_id
-        })
+    store = order.store
+
+    # 주문 아이템들
+    items_with_menu = [{
+        "menu_id": item.menu_id,
+        "menu_name": item.menu.name if item.menu else "Unknown",
+        "price": item.price,
+        "user_id": item.user_id
+    } for item in order.items]
 
     return {
         "id": order.id,
@@ -193,7 +214,8 @@ def get_order_detail(order_id: int, db: Session = Depends(get_db)):
     }
 
 @router.delete("/{order_id}")
-def delete_order(order_id: int, user_id: int, db: Session = Depends(get_db)):
+def delete_order(order_id: int, user_id: int, request: Request, db: Session = Depends(get_db)):
+    require_user(request, user_id)
     order = db.query(models.Order).filter(models.Order.id == order_id).first()
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
@@ -201,52 +223,62 @@ def delete_order(order_id: int, user_id: int, db: Session = Depends(get_db)):
     if order.creator_id != user_id and order.owner_id != user_id:
         raise HTTPException(status_code=403, detail="No permission to delete")
 
+    # Order 상태만 변경 (삭제 대신). 대기 중(pending)인 주문만 취소/환불 — 취소/매칭/만료된 주문이나
+    # 자동 매칭으로 아이템이 다른 주문에 합쳐진(merged) 주문은 환불하지 않도록 조건부 UPDATE
+    cancelled = db.execute(
+        update(models.Order)
+        .where(models.Order.id == order.id, models.Order.status == "pending")
+        .values(status="cancelled")
+    ).rowcount
+    if not cancelled:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Only pending orders can be cancelled")
+
     # OrderItem 삭제
-    items = db.query(models.OrderItem).filter(models.OrderItem.order_id == order.id).all()
-    for item in items:
-        db.delete(item)
-
-    # 크레딧 환불
-    owner = db.query(models.User).filter(models.User.id == order.owner_id).first()
-    if owner:
-        owner.credit += int(order.owner_paid_amount)
-        db.commit()
-        db.refresh(owner)
-
-    # Order 상태만 변경 (삭제 대신)
-    order.status = "cancelled"
+    db.execute(delete(models.OrderItem).where(models.OrderItem.order_id == order.id))
+
+    # 크레딧 환불 + 원장 기록 (같은 트랜잭션)
+    apply_credit(db, order.owner_id, int(order.owner_paid_amount), "order_cancel", order.id)
     db.commit()
+    pending_orders_index.remove(order.id)
 
     return {"message": "Order deleted successfully"}
 
-@router.get("/my/{user_id}")
-def get_my_orders(user_id: int, db: Session = Depends(get_db)):
-    # 내가 생성하거나 소유한 주문
-    my_orders = db.query(models.Order).filter(
-        ((models.Order.creator_id == user_id) | (models.Order.owner_id == user_id)) &
-        (models.Order.status.in_(["pending", "matched"]))
-    ).all()
-
-    # 내가 참여한 주문 (OrderItem에 내 user_id가 있는 주문)
-    participated_order_ids = db.query(models.OrderItem.order_id).filter(
-        models.OrderItem.user_id == user_id
-    ).distinct().all()
-    participated_order_ids = [oid[0] for oid in participated_order_ids]
-
-    participated_orders = db.query(models.Order).filter(
-        models.Order.id.in_(participated_order_ids),
-        models.Order.status.in_(["pending", "matched"])
-    ).all()
-
-    # 중복 제거하며 합치기
-    order_dict = {order.id: order for order in my_orders}
-    for order in participated_orders:
-        if order.id not in order_dict:
-            order_dict[order.id] = order
+@router.get("/my/{user_id}", response_model=list[MyOrderOut] | Page[MyOrderOut])
+def get_my_orders(
+    user_id: int,
+    request: Request,
+    limit: int | None = Query(None, ge=1, le=100),
+    cursor: str | None = None,
+    db: Session = Depends(get_db)
+):
+    require_user(request, user_id)
+    # 내가 생성하거나 소유한 주문 + 내가 참여한 주문 (OrderItem에 내 user_id가 있는 주문)을 한 번에 조회
+    participated = (
+        select(models.OrderItem.order_id)
+        .where(models.OrderItem.order_id == models.Order.id)
+        .where(models.OrderItem.user_id == user_id)
+        .exists()
+    )
+    query = (
+        db.query(models.Order)
+        .options(joinedload(models.Order.store))
+        .filter(
+            (models.Order.creator_id == user_id) | (models.Order.owner_id == user_id) | participated,
+            models.Order.status.in_(["pending", "matched"])
+        )
+    )
+
+    paginated = is_paginated(limit, cursor)
+    next_cursor = None
+    if paginated:
+        orders, next_cursor = paginate(query, models.Order.created_at, models.Order.id, limit, cursor)
+    else:
+        orders = query.order_by(models.Order.id).all()
 
     result = []
-    for order in order_dict.values():
-        store = db.query(models.Store).filter(models.Store.id == order.store_id).first()
+    for order in orders:
+        store = order.store
         result.append({
             "id": order.id,
             "creator_id": order.creator_id,
@@ -257,8 +289,8 @@ def get_my_orders(user_id: int, db: Session = Depends(get_db)):
             "delivery_location": order.delivery_location,
             "split_type": order.split_type,
             "owner_paid_amount": order.owner_paid_amount,
-            "created_at": order.created_at.isoformat() if order.created_at else None,
-            "expires_at": order.expires_at.isoformat() if order.expires_at else None,
+            "created_at": order.created_at,
+            "expires_at": order.expires_at,
             "status": order.status
         })
-    return result
+    return page(result, next_cursor) if paginated else result
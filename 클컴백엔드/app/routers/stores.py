@@ -1,89 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from ..database import SessionLocal
-from .. import models
-import re
+from ..database import get_read_db
+from ..utils.catalog_cache import catalog_cache
+from ..utils.region import parse_region
+from ..schemas import StoreOut, MenuOut, CacheStatsOut
 
 router = APIRouter(prefix="/stores", tags=["stores"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-@router.get("/")
-def get_stores(store_id: int | None = None, category: str | None = None, db: Session = Depends(get_db)):
+@router.get("/", response_model=list[StoreOut])
+def get_stores(store_id: int | None = None, category: str | None = None, db: Session = Depends(get_read_db)):
     if store_id:
-        store = db.query(models.Store).filter(models.Store.id == store_id).first()
+        store = catalog_cache.get_store(db, store_id)
         if not store:
             raise HTTPException(status_code=404, detail="Store not found.")
 
-        return [{
-            "id": store.id,
-            "name": store.name,
-            "category": store.category,
-            "location": store.location,
-            "latitude": store.latitude,
-            "longitude": store.longitude,
-            "minimum_price": store.minimum_price,
-            "delivery_tip": store.delivery_tip
-        }]
+        return [store]
 
     elif category:
-        stores = db.query(models.Store).filter(models.Store.category == category).all()
-        if not stores:
-            return []
-
-        return [{
-            "id": store.id,
-            "name": store.name,
-            "category": store.category,
-            "location": store.location,
-            "latitude": store.latitude,
-            "longitude": store.longitude,
-            "minimum_price": store.minimum_price,
-            "delivery_tip": store.delivery_tip
-        } for store in stores]
+        stores = catalog_cache.get_stores_by_category(db, category)
+        return stores
 
     else:
         raise HTTPException(status_code=400, detail="Either store_id or category must be provided.")
 
-@router.get("/{store_id}/menus")
-def get_menu(store_id: int, db: Session = Depends(get_db)):
-    menus = db.query(models.Menu).filter(models.Menu.store_id == store_id).all()
-    return [{
-        "store_id": menu.store_id,
-        "id": menu.id,
-        "name": menu.name,
-        "price": menu.price,
-    } for menu in menus]
-
-def extract_city(address: str):
-    """주소에서 시(市) 이름을 추출합니다."""
-    match = re.search(r'(\S+시)', address)
-    return match.group(1) if match else None
-
-@router.get("/by-city")
-def get_stores_by_city(user_address: str, db: Session = Depends(get_db)):
-    """사용자 주소 기반으로 같은 도시의 가게들을 조회합니다."""
-    city = extract_city(user_address)
+@router.get("/cache-stats", response_model=CacheStatsOut)
+def get_cache_stats():
+    """카탈로그 캐시 적중/미스 카운터 (캐시 크기 조정용)"""
+    return catalog_cache.stats()
+
+@router.get("/{store_id}/menus", response_model=list[MenuOut])
+def get_menu(store_id: int, db: Session = Depends(get_read_db)):
+    return catalog_cache.get_menus(db, store_id)
+
+@router.get("/by-city", response_model=list[StoreOut])
+def get_stores_by_city(user_address: str, same_district: bool = False, db: Session = Depends(get_read_db)):
+    """
+    사용자 주소 기반으로 같은 도시(same_district=true면 같은 구)의 가게들을 조회합니다.
+    가게 주소는 저장 시 시/구/동으로 나눠 인덱스해 두므로 가게 수와 무관하게 인덱스 조회(+캐시)로 처리됩니다.
+    """
+    city, district, _ = parse_region(user_address)
     if not city:
         return []
+    if same_district and not district:
+        return []
 
-    stores = (
-        db.query(models.Store)
-        .filter(models.Store.location.like(f"%{city}%"))
-        .all()
-    )
-    return [{
-        "id": store.id,
-        "name": store.name,
-        "category": store.category,
-        "location": store.location,
-        "latitude": store.latitude,
-        "longitude": store.longitude,
-        "minimum_price": store.minimum_price,
-        "delivery_tip": store.delivery_tip
-    } for store in stores]
\ No newline at end of file
+    return catalog_cache.get_stores_by_region(db, city, district if same_district else None)
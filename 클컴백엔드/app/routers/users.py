@@ -1,18 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Request
 from sqlalchemy.orm import Session
-from ..database import SessionLocal
+from ..database import get_db
 from .. import models
-from ..schemas import UserGoogleLogin
+from ..schemas import UserGoogleLogin, UserOut, CreditOut, AuthUserOut
+from ..utils.auth import require_login, require_user
+from ..credit_service import apply_credit
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 def find_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
 
@@ -23,22 +18,16 @@ def create_user_record(db: Session, email: str, name: str):
     db.refresh(user)
     return user
 
+# 토큰의 사용자 정보 (DB 조회 없음)
+@router.get("/me", response_model=AuthUserOut)
+def get_me(user: dict = Depends(require_login)):
+    return {"id": user["user_id"], "email": user.get("email"), "name": user.get("name")}
+
 # 이메일로 유저 조회 API
-@router.get("/by_email/{email}")
+@router.get("/by_email/{email}", response_model=UserOut | None)
 def get_user_by_email(email: str, db: Session = Depends(get_db)):
     user = find_user_by_email(db, email)
-    if not user:
-        return None
-    return {
-        "id": user.id,
-        "email": user.email,
-        "name": user.name,
-        "credit": user.credit,
-        "address": user.address,
-        "detailed_address": user.detailed_address,
-        "latitude": user.latitude,
-        "longitude": user.longitude
-    }
+    return user  # 없으면 null
 
 # 구글 로그인
 @router.post("/google-login")
@@ -65,20 +54,23 @@ def google_login(user: UserGoogleLogin, db: Session = Depends(get_db)):
     }
 
 @router.post("/credit/add/{user_id}")
-def add_credit(user_id: int, amount: int, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    user.credit += amount
+def add_credit(user_id: int, amount: int, request: Request, db: Session = Depends(get_db)):
+    require_user(request, user_id)
+    # 잔액 변경 + 원장 기록을 한 번에 (read-modify-write 없음)
+    new_credit = apply_credit(db, user_id, amount, "charge")
+    if new_credit is None:
+        db.rollback()
+        if not db.query(models.User.id).filter(models.User.id == user_id).first():
+            raise HTTPException(status_code=404, detail="User not found")
+        raise HTTPException(status_code=400, detail="Insufficient credit")
     db.commit()
-    db.refresh(user)
 
-    return {"id": user.id, "new_credit": user.credit}
+    return {"id": user_id, "new_credit": new_credit}
 
 
-@router.get("/credit/get/{user_id}")
-def get_credit(user_id: int, db: Session = Depends(get_db)):
+@router.get("/credit/get/{user_id}", response_model=CreditOut)
+def get_credit(user_id: int, request: Request, db: Session = Depends(get_db)):
+    require_user(request, user_id)
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -92,10 +84,12 @@ def update_user_address(
     address: str,
     lat: float,
     lng: float,
+    request: Request,
     detailed_address: str | None = None,
     db: Session = Depends(get_db)
 ):
     """사용자 배달 주소를 업데이트합니다."""
+    require_user(request, user_id)
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field, EmailStr
 from datetime import datetime
-from typing import List
+from typing import Generic, List, TypeVar
+
+T = TypeVar("T")
 
 # 주문 생성용 모델
 class OrderItemCreate(BaseModel):
@@ -24,6 +26,7 @@ class OrderItemOut(BaseModel):
     class Config:
         from_attributes = True
 
+# 주문 목록(피드) 한 건 — 컬럼만 읽으므로 직렬화 중 관계 lazy load가 일어나지 않음
 class OrderOut(BaseModel):
     id: int
     owner_id: int
@@ -35,13 +38,56 @@ class OrderOut(BaseModel):
     delivery_lng: float | None = None
     split_type: bool
     owner_paid_amount: int
-    items: List[OrderItemOut]
+    status: str
     created_at: datetime
-    expires_at: datetime
+    expires_at: datetime | None = None
 
     class Config:
         from_attributes = True
 
+# 주문 상세
+class OrderItemDetailOut(BaseModel):
+    menu_id: int
+    menu_name: str
+    price: int
+    user_id: int
+
+class OrderDetailOut(BaseModel):
+    id: int
+    creator_id: int
+    owner_id: int
+    store_id: int
+    store_name: str
+    store_category: str | None = None
+    delivery_location: str
+    split_type: bool
+    owner_paid_amount: int
+    created_at: datetime | None = None
+    expires_at: datetime | None = None
+    status: str
+    delivery_delay: int
+    items: List[OrderItemDetailOut]
+
+# 내 주문 목록 한 건
+class MyOrderOut(BaseModel):
+    id: int
+    creator_id: int
+    owner_id: int
+    store_id: int
+    store_name: str
+    store_category: str | None = None
+    delivery_location: str
+    split_type: bool
+    owner_paid_amount: int
+    created_at: datetime | None = None
+    expires_at: datetime | None = None
+    status: str
+
+# keyset 페이지 (utils/pagination.page)
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: str | None = None
+
 # 사용자 모델
 class UserCreate(BaseModel):
     id: str
@@ -52,17 +98,41 @@ class UserOut(BaseModel):
     name: str
     email: str | None = None
     credit: int
+    address: str | None = None
+    detailed_address: str | None = None
     latitude: float | None = None
     longitude: float | None = None
 
     class Config:
         from_attributes = True
 
+class AuthUserOut(BaseModel):
+    id: int
+    email: str | None = None
+    name: str | None = None
+
+class CreditOut(BaseModel):
+    id: int
+    credit: int
+
 # 주문 매칭 모델
 class MatchRequest(BaseModel):
     order_id: int
     matched_user_id: int
 
+class MatchSuggestionOut(BaseModel):
+    order_id: int
+    store_id: int
+    store_name: str
+    delivery_location: str
+    split_type: bool
+    distance_m: float | None = None   # 위치 정보가 없으면 None
+    owner_total: int                  # 주문 생성자 메뉴 합계
+    cart_total: int                   # 내 장바구니 합계
+    total_price: int
+    my_amount: int                    # 매칭 시 내가 낼 금액
+    expires_at: datetime | None = None
+
 # 구글 로그인 모델
 class UserGoogleLogin(BaseModel):
     email: EmailStr
@@ -73,3 +143,49 @@ class UserGoogleLogin(BaseModel):
 # 장바구니 모델
 class CartItemCreate(BaseModel):
     menu_id: int
+
+class CartBulkAdd(BaseModel):
+    user_id: int
+    store_id: int
+    menu_ids: List[int] = Field(..., min_length=1, max_length=100)
+
+class CartItemOut(BaseModel):
+    menu_id: int
+    menu_name: str
+    price: int
+
+# 가게/메뉴 모델 (catalog_cache의 dict에서 바로 검증)
+class StoreOut(BaseModel):
+    id: int
+    name: str
+    category: str | None = None
+    location: str | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    minimum_price: int
+    delivery_tip: int
+
+class MenuOut(BaseModel):
+    store_id: int
+    id: int
+    name: str
+    price: int
+
+class CacheStatsOut(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+    ttl: float
+
+# 알림 모델
+class NotificationOut(BaseModel):
+    id: int
+    user_id: int
+    title: str | None = None
+    message: str | None = None
+    is_read: bool
+    created_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
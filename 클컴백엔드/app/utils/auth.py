@@ -0,0 +1,94 @@
+import os
+import jwt
+from fastapi import HTTPException, Request, WebSocket
+from .jwt_utils import verify_jwt
+
+# 1이면 토큰 없는 요청도 거부 (기본 0: 토큰이 있을 때만 사용자 일치 여부 확인 — 기존 클라이언트 호환)
+AUTH_REQUIRED = os.getenv("AUTH_REQUIRED", "0") == "1"
+
+
+class JWTAuthMiddleware:
+    """
+    Authorization: Bearer <JWT> 헤더를 검증해 사용자 정보를 request.state에 붙이는 ASGI 미들웨어.
+
+    - request.state.user: 검증된 claims(dict) 또는 None
+    - request.state.auth_error: 토큰이 있었지만 검증에 실패한 이유
+    요청을 거부하는 것은 각 라우트의 의존성(require_user 등)이 결정합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            state = scope.setdefault("state", {})
+            state["user"] = None
+            state["auth_error"] = None
+
+            header = dict(scope["headers"]).get(b"authorization", b"")
+            scheme, _, token = header.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    state["user"] = verify_jwt(token.strip())
+                except jwt.InvalidTokenError as e:
+                    state["auth_error"] = str(e)
+
+        await self.app(scope, receive, send)
+
+
+def get_current_user(request: Request):
+    """검증된 토큰의 claims (없으면 None)"""
+    return getattr(request.state, "user", None)
+
+
+def require_login(request: Request):
+    """로그인이 반드시 필요한 라우트용 의존성. claims를 반환합니다."""
+    user = get_current_user(request)
+    if user is None:
+        detail = request.state.auth_error if getattr(request.state, "auth_error", None) else "Not authenticated"
+        raise HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+    return user
+
+
+def require_user(request: Request, user_id: int):
+    """
+    요청 본문/경로의 user_id가 토큰의 사용자와 같은지 확인합니다.
+    토큰이 없거나 검증에 실패하면 AUTH_REQUIRED일 때만 401, 토큰의 사용자가 다르면 403.
+    """
+    user = get_current_user(request)
+    if user is None:
+        if AUTH_REQUIRED:
+            require_login(request)
+        return
+    if user["user_id"] != user_id:
+        raise HTTPException(status_code=403, detail="Token does not match user")
+
+
+# 브라우저 WebSocket은 Authorization 헤더를 붙일 수 없어 Sec-WebSocket-Protocol: bearer, <JWT> 로도 받음
+WS_TOKEN_PROTOCOL = "bearer"
+
+
+def websocket_user(websocket: WebSocket):
+    """
+    WebSocket 연결의 토큰을 검증합니다.
+    Authorization 헤더(JWTAuthMiddleware) → ?token=<JWT> → Sec-WebSocket-Protocol 순으로 찾습니다.
+
+    Returns:
+        (claims 또는 None, accept 때 돌려줄 subprotocol 또는 None)
+    """
+    user = getattr(websocket.state, "user", None)
+    if user is not None:
+        return user, None
+
+    subprotocol = None
+    token = websocket.query_params.get("token")
+    if not token:
+        protocols = [p.strip() for p in websocket.headers.get("sec-websocket-protocol", "").split(",")]
+        if len(protocols) == 2 and protocols[0].lower() == WS_TOKEN_PROTOCOL:
+            subprotocol, token = protocols
+    if not token:
+        return None, None
+    try:
+        return verify_jwt(token), subprotocol
+    except jwt.InvalidTokenError:
+        return None, None
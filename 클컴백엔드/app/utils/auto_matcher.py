@@ -0,0 +1,204 @@
+import asyncio
+import math
+import os
+from collections import defaultdict
+from datetime import timedelta
+from sqlalchemy import case, select, update
+from ..database import SessionLocal
+from .. import models
+from .distance import distances
+from .geo_index import cell_of, pending_orders_index, METERS_PER_DEG_LAT
+from .notification_writer import notification_writer
+from .timeutil import now_naive
+
+# 기본은 꺼져 있음 (AUTO_MATCH_ENABLED=1 로 켬)
+AUTO_MATCH_ENABLED = os.getenv("AUTO_MATCH_ENABLED", "0") == "1"
+AUTO_MATCH_INTERVAL = float(os.getenv("AUTO_MATCH_INTERVAL", "60"))        # 초
+AUTO_MATCH_RADIUS = float(os.getenv("AUTO_MATCH_RADIUS", "300"))           # 두 배달 위치 사이 최대 거리(m)
+AUTO_MATCH_MIN_AGE = float(os.getenv("AUTO_MATCH_MIN_AGE", "120"))         # 생성 후 이 시간(초)은 수동 매칭에 양보
+
+
+def plan_pairs(orders, minimum_price: dict, radius: float = AUTO_MATCH_RADIUS):
+    """
+    같은 가게의 pending 주문끼리 짝을 짓습니다 (greedy).
+
+    오래된 주문(먼저 만료될 주문)부터, radius 안에 있고 두 생성자 금액 합이 최소 주문 금액 이상인
+    짝 없는 주문 중 가장 가까운 주문과 묶습니다. 후보는 격자 칸으로 찾으므로 주문 수가 많아도
+    주문마다 주변 몇 칸만 확인합니다.
+
+    Args:
+        orders: [(order_id, store_id, owner_id, owner_total, lat, lng)] — 오래된 순으로 정렬되어 있어야 함
+        minimum_price: {store_id: minimum_price}
+
+    Returns:
+        [(keep_id, merge_id)] — merge 주문의 참여자가 keep 주문(먼저 생성된 주문)에 합류
+    """
+    by_store = defaultdict(list)
+    for order in orders:
+        by_store[order[1]].append(order)
+
+    pairs = []
+    for store_id, group in by_store.items():
+        cells = defaultdict(list)  # cell -> [group index]
+        for i, (_, _, _, _, lat, lng) in enumerate(group):
+            cells[cell_of(lat, lng)].append(i)
+
+        matched = [False] * len(group)
+        for i, (order_id, _, owner_id, owner_total, lat, lng) in enumerate(group):
+            if matched[i]:
+                continue
+            need = minimum_price[store_id] - owner_total
+
+            dlat = radius / METERS_PER_DEG_LAT
+            dlng = radius / (METERS_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+            min_cell = cell_of(lat - dlat, lng - dlng)
+            max_cell = cell_of(lat + dlat, lng + dlng)
+            candidates = [
+                j
+                for cy in range(min_cell[0], max_cell[0] + 1)
+                for cx in range(min_cell[1], max_cell[1] + 1)
+                for j in cells.get((cy, cx), ())
+                if j != i and not matched[j] and group[j][2] != owner_id and group[j][3] >= need
+            ]
+            if not candidates:
+                continue
+            candidates.sort()  # 그룹 인덱스 순 = 오래된 순
+
+            d = distances(lat, lng, [group[j][4] for j in candidates], [group[j][5] for j in candidates])
+            best = int(d.argmin())   # 거리가 같으면 먼저 생성된 주문
+            if d[best] > radius:
+                continue
+
+            j = candidates[best]
+            matched[i] = matched[j] = True
+            pairs.append((order_id, group[j][0]))
+    return pairs
+
+
+class AutoMatcher:
+    """
+    주기적으로 pending 주문끼리 자동 매칭하는 백그라운드 작업 (opt-in).
+
+    - 대상: 따로먹기(split_type=False) 주문. 두 생성자 모두 주문 생성 시 "자기 메뉴 + 배달팁 절반"을 이미 냈으므로
+      수동 매칭 참여자와 같은 금액이 되어 크레딧을 다시 움직이지 않습니다.
+      나눠먹기 주문은 상대가 생성자와 같은 금액을 내고 메뉴를 나누는 방식이라 주문끼리 합칠 수 없어 제외합니다.
+    - 짝이 된 두 주문 중 먼저 생성된 주문이 matched가 되고, 나중 주문은 merged가 되며 그 OrderItem이 먼저 주문으로 옮겨집니다.
+    - 한 tick의 모든 짝은 하나의 트랜잭션으로 저장됩니다. status='pending' 조건부 UPDATE의 처리 건수가 계획과 다르면
+      (그 사이 수동 매칭/만료가 일어난 경우) 전체를 롤백하고 다음 tick에서 다시 계산합니다.
+    """
+
+    def __init__(self, interval: float = AUTO_MATCH_INTERVAL, radius: float = AUTO_MATCH_RADIUS,
+                 min_age: float = AUTO_MATCH_MIN_AGE):
+        self.interval = interval
+        self.radius = radius
+        self.min_age = min_age
+        self._task = None
+
+    def load_candidates(self, db, now):
+        rows = db.execute(
+            select(models.Order.id, models.Order.store_id, models.Order.owner_id, models.Order.owner_total,
+                   models.Order.delivery_lat, models.Order.delivery_lng, models.Store.minimum_price)
+            .join(models.Store, models.Store.id == models.Order.store_id)
+            .where(
+                models.Order.status == "pending",
+                models.Order.split_type == False,
+                models.Order.owner_total.is_not(None),
+                models.Order.delivery_lat.is_not(None),
+                models.Order.delivery_lng.is_not(None),
+                models.Order.created_at <= now - timedelta(seconds=self.min_age),
+                models.Order.expires_at > now,
+            )
+            .order_by(models.Order.created_at, models.Order.id)
+        ).all()
+        orders = [tuple(row[:6]) for row in rows]
+        minimum_price = {row.store_id: row.minimum_price for row in rows}
+        return orders, minimum_price
+
+    def match_once(self, now=None):
+        """
+        한 tick 처리. 저장된 [(keep_id, merge_id)] 목록을 반환합니다.
+        """
+        now = now or now_naive()
+
+        db = SessionLocal()
+        try:
+            orders, minimum_price = self.load_candidates(db, now)
+            pairs = plan_pairs(orders, minimum_price, self.radius)
+            if not pairs:
+                return []
+
+            owners = {order[0]: order[2] for order in orders}
+            keep_ids = [keep for keep, _ in pairs]
+            merge_ids = [merge for _, merge in pairs]
+
+            kept = db.execute(
+                update(models.Order)
+                .where(models.Order.id.in_(keep_ids), models.Order.status == "pending")
+                .values(status="matched", expires_at=None)
+            ).rowcount
+            merged = db.execute(
+                update(models.Order)
+                .where(models.Order.id.in_(merge_ids), models.Order.status == "pending")
+                .values(status="merged", expires_at=None)
+            ).rowcount
+            if kept != len(pairs) or merged != len(pairs):
+                db.rollback()
+                print("[AutoMatch] 계획 중 주문 상태가 바뀜 (수동 매칭/만료/다른 인스턴스), 다음 tick에서 재시도")
+                return []
+
+            # 나중 주문의 메뉴를 먼저 주문으로 옮김 (한 번의 UPDATE)
+            db.execute(
+                update(models.OrderItem)
+                .where(models.OrderItem.order_id.in_(merge_ids))
+                .values(order_id=case(dict(zip(merge_ids, keep_ids)), value=models.OrderItem.order_id)),
+                execution_options={"synchronize_session": False},
+            )
+
+            for keep, merge in pairs:
+                notification_writer.enlist(
+                    db, user_id=owners[keep], title="매칭 성공",
+                    message=f"주문 #{keep}이 주변 주문 #{merge}과 자동 매칭되었습니다."
+                )
+                notification_writer.enlist(
+                    db, user_id=owners[merge], title="매칭 성공",
+                    message=f"주문 #{merge}이 주변 주문 #{keep}에 자동 합류되었습니다."
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        for keep, merge in pairs:
+            pending_orders_index.remove(keep)
+            pending_orders_index.remove(merge)
+        print(f"[AutoMatch] 후보 {len(orders)}건 → {len(pairs)}쌍 자동 매칭")
+        return pairs
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.match_once)
+            except Exception as e:
+                print(f"[AutoMatch Error] {e}")
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# 프로세스 전역 자동 매칭 작업
+auto_matcher = AutoMatcher()
@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .. import models
+
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "300"))     # 초
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "1024"))    # 키 개수
+
+
+class TTLCache:
+    """
+    크기 제한(LRU) + TTL 만료를 지원하는 스레드 안전 캐시.
+    """
+
+    def __init__(self, maxsize: int = CATALOG_CACHE_SIZE, ttl: float = CATALOG_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl: float | None = None):
+        """ttl을 주면 이 항목만 기본 TTL 대신 ttl(초) 뒤에 만료"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def store_to_dict(store: models.Store):
+    return {
+        "id": store.id,
+        "name": store.name,
+        "category": store.category,
+        "location": store.location,
+        "latitude": store.latitude,
+        "longitude": store.longitude,
+        "minimum_price": store.minimum_price,
+        "delivery_tip": store.delivery_tip,
+        "delivery_delay": store.delivery_delay,
+    }
+
+
+def menu_to_dict(menu: models.Menu):
+    return {
+        "store_id": menu.store_id,
+        "id": menu.id,
+        "name": menu.name,
+        "price": menu.price,
+    }
+
+
+class CatalogCache:
+    """
+    가게(Store)/메뉴(Menu) 카탈로그 read-through 캐시.
+    캐시에는 ORM 객체 대신 dict를 저장해 세션이 닫힌 뒤에도 안전하게 재사용합니다.
+
+    - store:{id}          → 가게 1건
+    - category:{category} → 카테고리별 가게 목록
+    - menus:{store_id}    → 가게 메뉴 목록
+    - region:{city}:{district} → 시(/구)별 가게 목록
+    """
+
+    def __init__(self, maxsize: int = CATALOG_CACHE_SIZE, ttl: float = CATALOG_CACHE_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _get_or_load(self, key, loader):
+        value = self._cache.get(key)
+        if value is None:
+            value = loader()
+            self._cache.set(key, value)
+        return value
+
+    def get_store(self, db: Session, store_id: int):
+        def load():
+            store = db.query(models.Store).filter(models.Store.id == store_id).first()
+            return store_to_dict(store) if store else {}  # 없는 가게도 캐시 (반복 조회 방지)
+        return self._get_or_load(("store", store_id), load) or None
+
+    def get_stores_by_category(self, db: Session, category: str):
+        def load():
+            stores = db.query(models.Store).filter(models.Store.category == category).all()
+            for store in stores:
+                self._cache.set(("store", store.id), store_to_dict(store))
+            return [store_to_dict(store) for store in stores]
+        return self._get_or_load(("category", category), load)
+
+    def get_menus(self, db: Session, store_id: int):
+        def load():
+            menus = db.query(models.Menu).filter(models.Menu.store_id == store_id).all()
+            return [menu_to_dict(menu) for menu in menus]
+        return self._get_or_load(("menus", store_id), load)
+
+    def get_stores_by_region(self, db: Session, city: str, district: str | None = None):
+        """시(및 구) 단위 가게 목록. 저장된 region 컬럼 인덱스(ix_stores_region)로 조회합니다."""
+        def load():
+            query = db.query(models.Store).filter(models.Store.region_city == city)
+            if district is not None:
+                query = query.filter(models.Store.region_district == district)
+            return [store_to_dict(store) for store in query.all()]
+        return self._get_or_load(("region", city, district), load)
+
+    def invalidate(self):
+        """카탈로그 쓰기 후 호출. 카탈로그는 거의 바뀌지 않으므로 전체를 비웁니다."""
+        self._cache.clear()
+
+    def stats(self):
+        return {
+            "hits": self._cache.hits,
+            "misses": self._cache.misses,
+            "size": len(self._cache),
+            "maxsize": self._cache.maxsize,
+            "ttl": self._cache.ttl,
+        }
+
+
+# 프로세스 전역 카탈로그 캐시
+catalog_cache = CatalogCache()
+
+
+# Store/Menu 쓰기 시 자동 무효화 (같은 프로세스 내 쓰기; 다른 인스턴스의 쓰기는 TTL로 반영)
+def _invalidate_catalog(mapper, connection, target):
+    catalog_cache.invalidate()
+
+
+for _model in (models.Store, models.Menu):
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _invalidate_catalog)
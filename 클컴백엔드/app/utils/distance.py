@@ -1,4 +1,7 @@
 import math
+import numpy as np
+
+R = 6371000  # m
 
 def distance(lat1, lon1, lat2, lon2):
     """
@@ -9,7 +12,6 @@ def distance(lat1, lon1, lat2, lon2):
     if lat1 is None or lon1 is None or lat2 is None or lon2 is None:
         return float('inf')
 
-    R = 6371000  # m
     dLat = math.radians(lat2 - lat1)
     dLon = math.radians(lon2 - lon1)
 
@@ -19,3 +21,41 @@ def distance(lat1, lon1, lat2, lon2):
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
     return R * c
+
+def distances(lat, lon, lats, lons):
+    """
+    한 지점(lat, lon)에서 여러 좌표까지의 거리를 한 번에 계산합니다 (Haversine 공식, NumPy 벡터화).
+
+    Args:
+        lat, lon: 기준 좌표
+        lats, lons: 비교할 좌표 배열 (None 포함 가능)
+
+    Returns:
+        거리(m) 배열. 좌표가 None이면 해당 위치는 무한대
+    """
+    lats = np.asarray(lats, dtype=float)  # None → nan
+    lons = np.asarray(lons, dtype=float)
+    if lat is None or lon is None:
+        return np.full(lats.shape, np.inf)
+
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dLat = lat2 - lat1
+    dLon = np.radians(lons - lon)
+
+    a = np.sin(dLat / 2)**2 + math.cos(lat1) * np.cos(lat2) * np.sin(dLon / 2)**2
+    d = 2 * R * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return np.where(np.isnan(d), np.inf, d)
+
+def rank_by_distance(lat, lon, lats, lons, radius: float = 300, limit: int | None = None):
+    """
+    radius(m) 이내 좌표의 (인덱스 배열, 거리 배열)을 가까운 순으로 반환합니다.
+    limit이 있으면 가장 가까운 limit개만 반환합니다.
+    """
+    d = distances(lat, lon, lats, lons)
+    idx = np.flatnonzero(d <= radius)
+    if limit is not None and limit < len(idx):
+        idx = idx[np.argpartition(d[idx], limit - 1)[:limit]]
+    idx = idx[np.argsort(d[idx], kind="stable")]
+    return idx, d[idx]
@@ -0,0 +1,163 @@
+import math
+import threading
+import time
+from collections import defaultdict
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from .. import models
+from .distance import rank_by_distance
+
+# 격자 한 칸의 크기 (도 단위). 위도 0.0027도 ≈ 300m
+CELL_DEG = 0.0027
+METERS_PER_DEG_LAT = 111320
+
+# 다른 인스턴스(ALB 뒤 ASG)에서 생성/삭제된 주문을 반영하기 위한 동기화 주기(초)
+SYNC_INTERVAL = 5
+FULL_REBUILD_INTERVAL = 300
+# 증분 동기화 때 마지막 id 아래를 다시 훑는 범위. id는 INSERT 시점에 할당되고 commit은 그보다 늦을 수 있어
+# (동시 트랜잭션) 워터마크보다 작은 id가 나중에 보이는 경우를 놓치지 않기 위함
+SYNC_ID_LOOKBACK = 500
+
+
+def cell_of(lat: float, lng: float):
+    return (math.floor(lat / CELL_DEG), math.floor(lng / CELL_DEG))
+
+
+class PendingOrderGeoIndex:
+    """
+    pending 상태 주문의 배달 좌표(delivery_lat/delivery_lng)를 카테고리별 격자(grid cell)로 색인합니다.
+    근처 주문 조회 시 호출자 주변 몇 칸만 읽으므로 전체 주문 수와 무관하게 빠르게 후보를 찾습니다.
+
+    - 이 인덱스는 후보(order_id)만 제공하며, 최종 상태(pending 여부)는 DB에서 다시 확인합니다.
+    - 인스턴스가 여러 대이므로 주기적으로 DB에서 새 주문을 가져오고(증분), 가끔 전체 재구성합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cells = defaultdict(lambda: defaultdict(set))  # category -> cell -> {order_id}
+        self._entries = {}  # order_id -> (category, cell, lat, lng)
+        self._last_order_id = 0  # DB 동기화로 확인한 마지막 주문 id
+        self._last_sync = 0.0
+        self._last_rebuild = 0.0
+        self._loaded = False
+
+    # --- 변경 ---
+    def add(self, order_id: int, category: str | None, lat: float | None, lng: float | None):
+        if lat is None or lng is None:
+            return  # 좌표 없는 주문은 거리 조회 대상이 아님
+        cell = cell_of(lat, lng)
+        with self._lock:
+            self._remove_locked(order_id)
+            self._cells[category][cell].add(order_id)
+            self._entries[order_id] = (category, cell, lat, lng)
+
+    def remove(self, order_id: int):
+        with self._lock:
+            self._remove_locked(order_id)
+
+    def _remove_locked(self, order_id: int):
+        entry = self._entries.pop(order_id, None)
+        if entry is None:
+            return
+        category, cell, _, _ = entry
+        bucket = self._cells[category].get(cell)
+        if bucket is not None:
+            bucket.discard(order_id)
+            if not bucket:
+                del self._cells[category][cell]
+
+    # --- 조회 ---
+    def nearby(self, category: str, lat: float, lng: float, radius: float = 300, limit: int | None = None):
+        """
+        (lat, lng)에서 radius(m) 이내의 후보 주문을 가까운 순으로 [(order_id, 거리)] 형태로 반환합니다.
+        """
+        dlat = radius / METERS_PER_DEG_LAT
+        dlng = radius / (METERS_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        min_cell = cell_of(lat - dlat, lng - dlng)
+        max_cell = cell_of(lat + dlat, lng + dlng)
+
+        order_ids, lats, lngs = [], [], []
+        with self._lock:
+            cells = self._cells.get(category)
+            if not cells:
+                return []
+            for cy in range(min_cell[0], max_cell[0] + 1):
+                for cx in range(min_cell[1], max_cell[1] + 1):
+                    for order_id in cells.get((cy, cx), ()):
+                        _, _, o_lat, o_lng = self._entries[order_id]
+                        order_ids.append(order_id)
+                        lats.append(o_lat)
+                        lngs.append(o_lng)
+
+        idx, dists = rank_by_distance(lat, lng, lats, lngs, radius=radius, limit=limit)
+        return [(order_ids[i], float(d)) for i, d in zip(idx, dists)]
+
+    # --- DB 동기화 ---
+    def sync(self, db: Session, force: bool = False):
+        """
+        마지막 동기화 이후 생성된 pending 주문을 가져옵니다 (id 기준 증분 조회).
+        늦게 commit된 주문을 위해 마지막 id보다 SYNC_ID_LOOKBACK만큼 아래부터 다시 읽고,
+        그 범위에서 pending이 아닌 주문은 인덱스에서 뺍니다.
+        FULL_REBUILD_INTERVAL마다 전체를 다시 읽어 다른 인스턴스에서 빠진 주문도 정리합니다.
+        """
+        now = time.monotonic()
+        if not force and self._loaded and now - self._last_sync < SYNC_INTERVAL:
+            return
+
+        if force or not self._loaded or now - self._last_rebuild >= FULL_REBUILD_INTERVAL:
+            self.rebuild(db)
+            return
+
+        rows = (
+            db.query(models.Order.id, models.Order.status, models.Store.category,
+                     models.Order.delivery_lat, models.Order.delivery_lng)
+            .join(models.Store)
+            .filter(models.Order.id > self._last_order_id - SYNC_ID_LOOKBACK)
+            .all()
+        )
+        for order_id, status, category, lat, lng in rows:
+            if status == "pending":
+                self.add(order_id, category, lat, lng)
+            else:
+                self.remove(order_id)
+            self._last_order_id = max(self._last_order_id, order_id)
+        self._last_sync = now
+
+    def rebuild(self, db: Session):
+        # 마지막 id를 pending 주문과 같은 문장(같은 스냅샷)에서 읽어, 두 조회 사이에 commit된 주문을 건너뛰지 않게 함
+        max_order_id = select(func.max(models.Order.id)).scalar_subquery()
+        rows = (
+            db.query(models.Order.id, models.Store.category, models.Order.delivery_lat, models.Order.delivery_lng,
+                     max_order_id)
+            .join(models.Store)
+            .filter(models.Order.status == "pending")
+            .all()
+        )
+        if rows:
+            last_order_id = rows[0][4] or 0
+        else:
+            # pending 주문이 없으면 기준 id만 따로 읽음 (그 사이 commit된 주문은 다음 sync의 SYNC_ID_LOOKBACK 범위)
+            last_order_id = db.query(func.max(models.Order.id)).scalar() or 0
+
+        cells = defaultdict(lambda: defaultdict(set))
+        entries = {}
+        for order_id, category, lat, lng, _ in rows:
+            if lat is None or lng is None:
+                continue
+            cell = cell_of(lat, lng)
+            cells[category][cell].add(order_id)
+            entries[order_id] = (category, cell, lat, lng)
+
+        with self._lock:
+            self._cells = cells
+            self._entries = entries
+            self._last_order_id = last_order_id
+            self._loaded = True
+            self._last_sync = self._last_rebuild = time.monotonic()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# 프로세스 전역 인덱스
+pending_orders_index = PendingOrderGeoIndex()
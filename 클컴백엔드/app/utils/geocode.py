@@ -1,14 +1,151 @@
 import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 load_dotenv()
 
 KAKAO_REST_API_KEY = os.getenv("KAKAO_API_KEY")
+KAKAO_GEOCODE_URL = os.getenv("KAKAO_GEOCODE_URL", "https://dapi.kakao.com/v2/local/search/address.json")
+
+
+def _default_cache_path():
+    """재부팅해도 남는 사용자 데이터 디렉터리 (작업 트리 밖): %LOCALAPPDATA% / $XDG_DATA_HOME / ~/.local/share"""
+    base = (os.getenv("LOCALAPPDATA") or os.getenv("XDG_DATA_HOME")
+            or os.path.join(os.path.expanduser("~"), ".local", "share"))
+    return os.path.join(base, "joint-order", "geocode_cache.sqlite3")
+
+
+# 주소 → 좌표 캐시 파일
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH") or _default_cache_path()
+GEOCODE_TIMEOUT = float(os.getenv("GEOCODE_TIMEOUT", "3"))   # 초
+GEOCODE_MAX_IN_FLIGHT = 8                                    # 동시 요청 수 상한
+
+
+def normalize_address(address: str):
+    """
+    캐시 키로 쓰기 위해 주소를 정규화합니다. (유니코드 NFC, 공백 정리, 앞뒤 구두점 제거)
+    """
+    address = unicodedata.normalize("NFC", address or "")
+    address = re.sub(r"\s+", " ", address)
+    return address.strip(" ,.")
+
+
+class GeocodeCache:
+    """
+    주소 → 좌표 결과를 디스크(SQLite 파일)에 보관하는 캐시.
+    주소를 찾지 못한 경우도 (None, None)으로 저장해 같은 주소를 다시 조회하지 않습니다.
+    """
+
+    def __init__(self, path: str = GEOCODE_CACHE_PATH):
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode (address TEXT PRIMARY KEY, lat REAL, lng REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, address: str):
+        with self._lock:
+            row = self._conn.execute("SELECT lat, lng FROM geocode WHERE address = ?", (address,)).fetchone()
+        return row  # 없으면 None, 있으면 (lat, lng)
+
+    def set(self, address: str, lat, lng):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO geocode VALUES (?, ?, ?)", (address, lat, lng))
+            self._conn.commit()
+
+
+class KakaoGeocoder:
+    """
+    Kakao REST API 백엔드. 연결 풀을 재사용하는 requests.Session 하나를 공유합니다.
+    KAKAO_GEOCODE_URL로 로컬 가짜 서버를 가리키게 할 수 있습니다.
+    """
+
+    def __init__(self, api_key: str | None = KAKAO_REST_API_KEY, url: str = KAKAO_GEOCODE_URL,
+                 timeout: float = GEOCODE_TIMEOUT, pool_size: int = GEOCODE_MAX_IN_FLIGHT):
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def lookup(self, address: str):
+        """
+        (lat, lng)를 반환하고, 주소를 찾지 못하면 (None, None)을 반환합니다.
+        네트워크/HTTP 오류는 예외로 올려 캐시에 저장되지 않게 합니다.
+        """
+        if not self.api_key:
+            raise RuntimeError("KAKAO_API_KEY가 설정되지 않았습니다.")
+
+        response = self.session.get(
+            self.url,
+            headers={"Authorization": f"KakaoAK {self.api_key}"},
+            params={"query": address},
+            timeout=self.timeout,
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+
+        data = response.json()
+        if "documents" not in data or len(data["documents"]) == 0:
+            print(f"[Geocode Warning] 주소를 찾을 수 없음: {address}")
+            return None, None
+
+        loc = data["documents"][0]
+        return float(loc["y"]), float(loc["x"])
+
+
+class StaticGeocoder:
+    """
+    미리 정한 주소 → 좌표 표로 응답하는 백엔드 (테스트/오프라인용).
+    """
+
+    def __init__(self, table: dict):
+        self.table = {normalize_address(k): v for k, v in table.items()}
+        self.calls = 0
+
+    def lookup(self, address: str):
+        self.calls += 1
+        return self.table.get(normalize_address(address), (None, None))
+
+
+_backend = None
+_cache = None
+_init_lock = threading.Lock()
+
+
+def set_backend(backend, cache: GeocodeCache | None = None):
+    """지오코딩 백엔드(및 캐시)를 교체합니다. 테스트에서 가짜 백엔드를 넣을 때 사용합니다."""
+    global _backend, _cache
+    _backend = backend
+    if cache is not None:
+        _cache = cache
+
+
+def _get_backend():
+    global _backend, _cache
+    with _init_lock:
+        if _backend is None:
+            _backend = KakaoGeocoder()
+        if _cache is None:
+            _cache = GeocodeCache()
+    return _backend, _cache
+
 
 def geocode_address(address: str):
     """
-    Kakao REST API를 사용하여 주소를 위도/경도로 변환합니다.
+    주소를 위도/경도로 변환합니다. (디스크 캐시 → 백엔드 순)
 
     Args:
         address: 검색할 주소 문자열
@@ -16,31 +153,34 @@ def geocode_address(address: str):
     Returns:
         (latitude, longitude) 튜플, 실패 시 (None, None)
     """
-    if not KAKAO_REST_API_KEY:
-        print("[Geocode Error] KAKAO_API_KEY가 설정되지 않았습니다.")
+    backend, cache = _get_backend()
+    key = normalize_address(address)
+    if not key:
         return None, None
 
-    url = "https://dapi.kakao.com/v2/local/search/address.json"
-    headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
-    params = {"query": address}
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
 
     try:
-        response = requests.get(url, headers=headers, params=params)
-        data = response.json()
+        lat, lng = backend.lookup(key)
     except Exception as e:
-        print(f"[Geocode Error] API 호출 실패: {e}")
+        print(f"[Geocode Error] {address} → {e}")
         return None, None
 
-    if response.status_code != 200:
-        print(f"[Geocode Error] {address} → HTTP {response.status_code}")
-        return None, None
+    cache.set(key, lat, lng)
+    return lat, lng
 
-    if "documents" not in data or len(data["documents"]) == 0:
-        print(f"[Geocode Warning] 주소를 찾을 수 없음: {address}")
-        return None, None
 
-    loc = data["documents"][0]
-    lat = float(loc["y"])
-    lng = float(loc["x"])
+def geocode_addresses(addresses, max_in_flight: int = GEOCODE_MAX_IN_FLIGHT):
+    """
+    여러 주소를 동시에 변환합니다. 같은 주소(정규화 기준)는 한 번만 조회하며,
+    동시에 진행되는 요청 수는 max_in_flight를 넘지 않습니다.
 
-    return lat, lng
\ No newline at end of file
+    Returns:
+        {원래 주소: (latitude, longitude)} 딕셔너리
+    """
+    unique = list(dict.fromkeys(normalize_address(a) for a in addresses))
+    with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as pool:
+        resolved = dict(zip(unique, pool.map(geocode_address, unique)))
+    return {address: resolved[normalize_address(address)] for address in addresses}
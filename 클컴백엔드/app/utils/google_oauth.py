@@ -0,0 +1,186 @@
+import asyncio
+import os
+import re
+import time
+import httpx
+import jwt
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
+GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
+REDIRECT_URI = os.getenv("REDIRECT_URI")
+
+# 테스트에서는 아래 주소를 로컬 가짜 OAuth 서버로 바꿔서 사용
+GOOGLE_TOKEN_URL = os.getenv("GOOGLE_TOKEN_URL", "https://oauth2.googleapis.com/token")
+GOOGLE_JWKS_URL = os.getenv("GOOGLE_JWKS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+GOOGLE_ISSUERS = os.getenv("GOOGLE_ISSUERS", "accounts.google.com,https://accounts.google.com").split(",")
+GOOGLE_HTTP_TIMEOUT = float(os.getenv("GOOGLE_HTTP_TIMEOUT", "5"))   # 초
+GOOGLE_HTTP_MAX_CONNECTIONS = 20
+JWKS_DEFAULT_TTL = 300          # Cache-Control에 max-age가 없을 때 키 목록 보관 시간(초)
+JWKS_MIN_REFRESH = 30           # 모르는 kid로 키 목록을 다시 받는 최소 간격(초) — 위조 토큰으로 구글을 두드리지 않도록
+ID_TOKEN_LEEWAY = 30            # exp/iat 검증 시 허용하는 시계 오차(초)
+
+
+class GoogleOAuthError(Exception):
+    """토큰 교환 실패 또는 id_token 검증 실패"""
+
+
+def cache_max_age(headers):
+    """
+    Cache-Control의 max-age(초)에서 Age를 뺀 남은 캐시 시간을 반환합니다. 없으면 None.
+    """
+    match = re.search(r"max-age=(\d+)", headers.get("cache-control", ""))
+    if not match:
+        return None
+    age = headers.get("age", "0")
+    return max(int(match.group(1)) - (int(age) if age.isdigit() else 0), 0)
+
+
+class GoogleOAuthClient:
+    """
+    구글 OAuth 토큰 교환 + id_token 로컬 검증.
+
+    - 모든 요청은 연결 풀과 타임아웃이 있는 httpx.AsyncClient 하나를 공유합니다.
+    - id_token은 tokeninfo 호출 없이 구글 서명 키(JWKS)로 직접 검증합니다.
+      키 목록은 응답의 Cache-Control max-age 동안 메모리에 보관하고, 만료되었거나 모르는 kid가 오면 다시 받습니다.
+    - transport를 넘기면(httpx.MockTransport 등) 네트워크 없이 가짜 서버로 응답할 수 있습니다.
+    """
+
+    def __init__(self, client_id: str | None = GOOGLE_CLIENT_ID, client_secret: str | None = GOOGLE_CLIENT_SECRET,
+                 redirect_uri: str | None = REDIRECT_URI, token_url: str = GOOGLE_TOKEN_URL,
+                 jwks_url: str = GOOGLE_JWKS_URL, issuers=GOOGLE_ISSUERS,
+                 timeout: float = GOOGLE_HTTP_TIMEOUT, transport: httpx.AsyncBaseTransport | None = None):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = redirect_uri
+        self.token_url = token_url
+        self.jwks_url = jwks_url
+        self.issuers = list(issuers)
+        self.timeout = timeout
+        self.transport = transport
+        self._http = None
+        self._keys = {}              # kid -> jwt.PyJWK
+        self._keys_expire_at = 0.0   # time.monotonic() 기준
+        self._keys_fetched_at = 0.0
+        self._keys_lock = asyncio.Lock()
+
+    def http(self):
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(max_connections=GOOGLE_HTTP_MAX_CONNECTIONS,
+                                    max_keepalive_connections=GOOGLE_HTTP_MAX_CONNECTIONS),
+                transport=self.transport,
+            )
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def exchange_code(self, code: str):
+        """
+        authorization code를 토큰으로 교환합니다. 응답 JSON(dict)을 반환합니다.
+        """
+        try:
+            response = await self.http().post(self.token_url, data={
+                "code": code,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "redirect_uri": self.redirect_uri,
+                "grant_type": "authorization_code",
+            })
+        except httpx.HTTPError as e:
+            raise GoogleOAuthError(f"token request failed: {e!r}")
+
+        if response.status_code != 200:
+            raise GoogleOAuthError(f"token request failed: HTTP {response.status_code}")
+        return response.json()
+
+    async def _fetch_keys(self):
+        try:
+            response = await self.http().get(self.jwks_url)
+        except httpx.HTTPError as e:
+            raise GoogleOAuthError(f"JWKS request failed: {e!r}")
+        if response.status_code != 200:
+            raise GoogleOAuthError(f"JWKS request failed: HTTP {response.status_code}")
+
+        keys = {}
+        for jwk in response.json().get("keys", []):
+            try:
+                keys[jwk["kid"]] = jwt.PyJWK(jwk)
+            except (KeyError, jwt.PyJWKError) as e:
+                print(f"[GoogleOAuth Warning] 사용할 수 없는 서명 키 무시: {e}")
+
+        ttl = cache_max_age(response.headers)
+        now = time.monotonic()
+        self._keys = keys
+        self._keys_fetched_at = now
+        self._keys_expire_at = now + (JWKS_DEFAULT_TTL if ttl is None else ttl)
+
+    async def signing_key(self, kid: str | None):
+        """
+        kid에 해당하는 구글 서명 키. 캐시가 유효하면 네트워크 요청 없이 반환합니다.
+        동시에 여러 로그인이 키를 다시 받아야 하면 한 요청만 나가고 나머지는 그 결과를 씁니다.
+        """
+        if kid in self._keys and time.monotonic() < self._keys_expire_at:
+            return self._keys[kid]
+
+        async with self._keys_lock:
+            now = time.monotonic()
+            expired = now >= self._keys_expire_at
+            unknown = kid not in self._keys and now - self._keys_fetched_at >= JWKS_MIN_REFRESH
+            if expired or unknown:
+                await self._fetch_keys()
+
+        if kid not in self._keys:
+            raise GoogleOAuthError(f"unknown signing key: {kid}")
+        return self._keys[kid]
+
+    async def verify_id_token(self, id_token: str):
+        """
+        id_token의 서명(RS256), aud(client_id), iss, exp를 검증하고 claims를 반환합니다.
+        """
+        try:
+            header = jwt.get_unverified_header(id_token)
+        except jwt.InvalidTokenError as e:
+            raise GoogleOAuthError(f"invalid id_token: {e}")
+
+        key = await self.signing_key(header.get("kid"))
+        try:
+            claims = jwt.decode(
+                id_token, key, algorithms=["RS256"],
+                audience=self.client_id, issuer=self.issuers, leeway=ID_TOKEN_LEEWAY,
+                options={"require": ["exp", "iat", "iss", "aud", "sub"]},
+            )
+        except jwt.InvalidTokenError as e:
+            raise GoogleOAuthError(f"invalid id_token: {e}")
+
+        if not claims.get("email") or claims.get("email_verified") is False:
+            raise GoogleOAuthError("id_token has no verified email")
+        return claims
+
+
+_client = None
+
+
+def set_client(client: GoogleOAuthClient):
+    """OAuth 클라이언트를 교체합니다. 테스트에서 가짜 서버를 가리키는 클라이언트를 넣을 때 사용합니다."""
+    global _client
+    _client = client
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = GoogleOAuthClient()
+    return _client
+
+
+async def aclose():
+    """서버 종료 시 공유 HTTP 연결을 닫습니다."""
+    if _client is not None:
+        await _client.aclose()
@@ -0,0 +1,296 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from datetime import timedelta
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from ..async_database import AsyncSessionLocal
+from .. import models
+from .catalog_cache import TTLCache
+from .timeutil import now_naive
+
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "86400"))                # 저장된 응답 보관 시간(초)
+IDEMPOTENCY_WAIT = float(os.getenv("IDEMPOTENCY_WAIT", "10"))                 # 같은 키 요청이 처리 중일 때 기다리는 최대 시간(초)
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))    # 메모리에 둘 응답 수
+# 적용할 라우트 → 요청을 보낸 사용자 id가 담긴 본문 필드 (토큰이 없는 요청의 키 범위에 사용)
+IDEMPOTENT_ROUTES = {("POST", "/orders/"): "creator_id", ("POST", "/match/"): "matched_user_id"}
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.1      # 다른 인스턴스가 처리 중인 키를 DB에서 다시 확인하는 간격(초)
+PURGE_INTERVAL = 600     # 만료된 행 삭제 주기(초)
+RETRYABLE_STATUS = {409}  # 재시도하면 성공할 수 있는 응답(동시 변경 충돌)은 5xx처럼 저장하지 않음
+
+
+class StoredResponse:
+    __slots__ = ("request_hash", "status_code", "content_type", "body")
+
+    def __init__(self, request_hash: str, status_code: int, content_type: str | None, body: bytes):
+        self.request_hash = request_hash
+        self.status_code = status_code
+        self.content_type = content_type
+        self.body = body
+
+    @classmethod
+    def from_row(cls, row: models.IdempotencyKey):
+        return cls(row.request_hash, row.status_code, row.content_type, (row.body or "").encode("utf-8"))
+
+
+async def send_response(send, status_code: int, body: bytes, content_type: str | None = "application/json",
+                        replayed: bool = False):
+    headers = [(b"content-length", str(len(body)).encode())]
+    if content_type:
+        headers.append((b"content-type", content_type.encode("latin-1")))
+    if replayed:
+        headers.append((b"idempotent-replayed", b"true"))
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_error(send, status_code: int, detail: str):
+    await send_response(send, status_code, json.dumps({"detail": detail}).encode("utf-8"))
+
+
+class IdempotencyMiddleware:
+    """
+    Idempotency-Key 헤더가 있는 POST /orders/, POST /match/ 요청의 첫 응답을 저장해 두고,
+    같은 키로 다시 오면 처리 로직을 실행하지 않고 저장된 응답을 그대로 돌려주는 ASGI 미들웨어.
+
+    - 조회 순서: 메모리 캐시(TTL) → idempotency_keys 테이블 (재시도는 조회 1번으로 끝남)
+    - 같은 키가 처리 중이면: 같은 프로세스는 처리 결과를 기다리고, 다른 인스턴스가 처리 중이면 DB 행을 짧게 polling
+      (IDEMPOTENCY_WAIT 안에 끝나지 않으면 409)
+    - 키는 사용자 + 메서드 + 경로 범위이며, 같은 키로 본문이 다른 요청을 보내면 422
+      (사용자는 토큰의 user_id, 토큰이 없으면 본문의 creator_id / matched_user_id)
+    - 5xx/409 응답이나 예외는 저장하지 않고 키를 풀어 다음 재시도가 다시 처리하게 합니다.
+    JWTAuthMiddleware 안쪽, CORSMiddleware 안쪽에 두어야 사용자별로 키가 나뉘고 저장된 응답에도 CORS 헤더가 붙습니다.
+    """
+
+    def __init__(self, app, routes=IDEMPOTENT_ROUTES, ttl: float = IDEMPOTENCY_TTL, wait: float = IDEMPOTENCY_WAIT):
+        self.app = app
+        self.routes = dict(routes)
+        self.ttl = ttl
+        self.wait = wait
+        self._cache = TTLCache(maxsize=IDEMPOTENCY_CACHE_SIZE, ttl=ttl)
+        self._inflight = {}   # key -> asyncio.Future (StoredResponse 또는 None)
+        self._last_purge = 0.0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        header = dict(scope["headers"]).get(b"idempotency-key")
+        if header is None:
+            await self.app(scope, receive, send)
+            return
+
+        value = header.decode("latin-1").strip()
+        if not value or len(value) > MAX_KEY_LENGTH:
+            await send_error(send, 400, "Invalid Idempotency-Key")
+            return
+
+        body = await self._read_body(receive)
+        request_hash = hashlib.sha256(body).hexdigest()
+        owner = self._owner(scope, body)
+        key = f"{scope['method']} {scope['path']} {owner} {value}"
+
+        deadline = time.monotonic() + self.wait
+        while True:
+            stored = self._cache.get(key)
+            if stored is not None:
+                await self._replay(send, stored, request_hash)
+                return
+
+            future = self._inflight.get(key)
+            if future is not None:
+                # 같은 프로세스에서 처리 중 → 결과를 기다림 (None이면 처리 실패: 다시 시도)
+                try:
+                    stored = await asyncio.wait_for(asyncio.shield(future), max(deadline - time.monotonic(), 0))
+                except asyncio.TimeoutError:
+                    await send_error(send, 409, "A request with this Idempotency-Key is in progress")
+                    return
+                if stored is not None:
+                    await self._replay(send, stored, request_hash)
+                    return
+                continue
+
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            try:
+                claimed, stored = await self._claim(key, request_hash)
+                if claimed:
+                    stored = await self._run(scope, body, receive, send, key, request_hash)
+                    future.set_result(stored)
+                    return
+                if stored is None:
+                    # 다른 인스턴스가 처리 중
+                    stored = await self._wait_for_other(key, deadline)
+                if stored is not None:
+                    self._remember(key, stored)
+                    future.set_result(stored)
+                    await self._replay(send, stored, request_hash)
+                    return
+            finally:
+                self._inflight.pop(key, None)
+                if not future.done():
+                    future.set_result(None)
+
+            if time.monotonic() >= deadline:
+                await send_error(send, 409, "A request with this Idempotency-Key is in progress")
+                return
+            # 다른 인스턴스의 처리가 실패해 키가 풀림 → 다시 시도
+
+    @staticmethod
+    async def _read_body(receive):
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    def _owner(self, scope, body: bytes):
+        """키 범위가 될 사용자. 토큰 사용자 → 본문의 사용자 id 필드 → '-' 순"""
+        user = (scope.get("state") or {}).get("user")
+        if user:
+            return f"user:{user['user_id']}"
+        field = self.routes[(scope["method"], scope["path"])]
+        try:
+            user_id = json.loads(body).get(field) if field else None
+        except (ValueError, AttributeError):
+            user_id = None
+        return f"anon:{user_id}" if isinstance(user_id, int) else "-"
+
+    async def _replay(self, send, stored: StoredResponse, request_hash: str):
+        if stored.request_hash != request_hash:
+            await send_error(send, 422, "Idempotency-Key was already used with a different request")
+            return
+        await send_response(send, stored.status_code, stored.body, stored.content_type, replayed=True)
+
+    def _remember(self, key: str, stored: StoredResponse, ttl: float | None = None):
+        self._cache.set(key, stored, ttl=ttl)
+
+    async def _claim(self, key: str, request_hash: str):
+        """
+        키를 처리 중(status_code NULL)으로 등록합니다.
+
+        Returns:
+            (True, None)            — 이 요청이 처리함
+            (False, StoredResponse) — 이미 처리된 응답이 있음
+            (False, None)           — 다른 곳에서 처리 중
+        """
+        async with AsyncSessionLocal() as db:
+            for _ in range(3):
+                now = now_naive()
+                db.add(models.IdempotencyKey(key=key, request_hash=request_hash, created_at=now,
+                                             expires_at=now + timedelta(seconds=self.ttl)))
+                try:
+                    await db.commit()
+                    return True, None
+                except IntegrityError:
+                    await db.rollback()
+
+                row = await db.get(models.IdempotencyKey, key, populate_existing=True)
+                if row is None:
+                    continue   # 그 사이 키가 풀림
+                if row.expires_at <= now:
+                    await db.execute(delete(models.IdempotencyKey).where(
+                        models.IdempotencyKey.key == key, models.IdempotencyKey.expires_at <= now))
+                    await db.commit()
+                    continue
+                if row.status_code is None:
+                    return False, None
+                stored = StoredResponse.from_row(row)
+                self._remember(key, stored, ttl=(row.expires_at - now).total_seconds())
+                return False, stored
+        return False, None
+
+    async def _wait_for_other(self, key: str, deadline: float):
+        """다른 인스턴스가 처리 중인 키의 응답을 기다립니다. 키가 풀리거나 시간이 다 되면 None"""
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            async with AsyncSessionLocal() as db:
+                row = await db.get(models.IdempotencyKey, key)
+                if row is None:
+                    return None
+                if row.status_code is not None:
+                    return StoredResponse.from_row(row)
+        return None
+
+    async def _run(self, scope, body: bytes, receive, send, key: str, request_hash: str):
+        """실제 라우트를 실행하면서 응답을 모아 저장합니다. 저장한 StoredResponse (5xx/409/저장 실패면 None)"""
+        body_sent = False
+        status_code = 500
+        content_type = None
+        chunks = []
+
+        async def receive_wrapper():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def send_wrapper(message):
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"").decode("latin-1") or None
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except BaseException:
+            await self._release(key)
+            raise
+
+        if status_code >= 500 or status_code in RETRYABLE_STATUS:
+            await self._release(key)
+            return None
+
+        stored = StoredResponse(request_hash, status_code, content_type, b"".join(chunks))
+        try:
+            async with AsyncSessionLocal() as db:
+                row = await db.get(models.IdempotencyKey, key)
+                if row is not None:
+                    row.status_code = stored.status_code
+                    row.content_type = stored.content_type
+                    row.body = stored.body.decode("utf-8", errors="replace")
+                    await db.commit()
+        except Exception as e:
+            # 응답은 이미 보냈음. 다른 인스턴스는 키가 만료될 때까지 기다리게 되므로 키를 풀어 두고,
+            # 다른 인스턴스와 같게 다음 재시도는 다시 처리되도록 메모리에도 기억하지 않음
+            print(f"[Idempotency Error] 응답 저장 실패 {key}: {e}")
+            await self._release(key)
+            return None
+        self._remember(key, stored)
+        try:
+            await self._purge_expired()
+        except Exception as e:
+            print(f"[Idempotency Error] 만료 키 삭제 실패: {e}")
+        return stored
+
+    async def _release(self, key: str):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(models.IdempotencyKey).where(
+                    models.IdempotencyKey.key == key, models.IdempotencyKey.status_code.is_(None)))
+                await db.commit()
+        except Exception as e:
+            print(f"[Idempotency Error] 키 해제 실패 {key}: {e}")
+
+    async def _purge_expired(self):
+        if time.monotonic() - self._last_purge < PURGE_INTERVAL:
+            return
+        self._last_purge = time.monotonic()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(models.IdempotencyKey).where(models.IdempotencyKey.expires_at <= now_naive()))
+            await db.commit()
+        if result.rowcount:
+            print(f"[Idempotency] 만료된 키 {result.rowcount}건 삭제")
@@ -1,12 +1,27 @@
+import os
+import time
 import jwt
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
+from dotenv import load_dotenv
+from .catalog_cache import TTLCache
+
+load_dotenv()
 
 seoul_tz = ZoneInfo("Asia/Seoul")
 
 
-JWT_SECRET =  "dkananswkduf"  # 아무 문자열 키값 (토큰 암호화 키) -> 실제로는 환경변수를 사용함 이것도 추가로 생각해볼 필요 있음
+# 토큰 서명 키는 환경변수로만 관리 (기본값 없음 — 저장소에 공개된 키로는 누구나 토큰을 만들 수 있음)
+JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_ALGO = "HS256"            # 암호화 알고리즘 보편적 HS256
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "10000"))   # 검증 결과를 기억할 토큰 수
+
+
+def require_jwt_secret():
+    """JWT_SECRET이 설정되어 있지 않으면 RuntimeError (서버 시작 시 확인)"""
+    if not JWT_SECRET:
+        raise RuntimeError("JWT_SECRET 환경변수를 설정하세요 (JWT 서명 키)")
+    return JWT_SECRET
 
 
 def create_jwt(user):
@@ -16,5 +31,28 @@ def create_jwt(user):
         "name": user.name,
         "exp": datetime.now(seoul_tz) + timedelta(hours=1)  # 토큰 만료시간 넣어서 안전하게 관리 만약 없을 경우 보안 문제
     }
-    token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGO)
-    return token
\ No newline at end of file
+    token = jwt.encode(payload, require_jwt_secret(), algorithm=JWT_ALGO)
+    return token
+
+
+# 최근 검증한 토큰 → claims (토큰의 exp까지만 보관)
+_claims_cache = TTLCache(maxsize=JWT_CACHE_SIZE, ttl=3600)
+
+
+def verify_jwt(token: str):
+    """
+    토큰 서명과 만료를 검증하고 claims를 반환합니다. 실패하면 jwt.InvalidTokenError를 올립니다.
+    같은 토큰은 만료 전까지 캐시된 claims를 재사용하므로 서명 검증을 다시 하지 않습니다.
+    """
+    claims = _claims_cache.get(token)
+    if claims is not None:
+        if claims["exp"] > time.time():
+            return claims
+        raise jwt.ExpiredSignatureError("Signature has expired")
+
+    claims = jwt.decode(token, require_jwt_secret(), algorithms=[JWT_ALGO], options={"require": ["exp"]})
+    if "user_id" not in claims:
+        raise jwt.MissingRequiredClaimError("user_id")
+
+    _claims_cache.set(token, claims, ttl=max(claims["exp"] - time.time(), 0))
+    return claims
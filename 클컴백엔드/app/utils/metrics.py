@@ -0,0 +1,272 @@
+"""
+라우트별 지연/SQL 실행 수/DB 시간, 커넥션 풀 상태를 모아 Prometheus 텍스트 형식으로 내보냅니다.
+
+- 라우트는 실제 경로(/orders/12)가 아니라 라우트 템플릿(/orders/{order_id})으로 묶습니다.
+- 요청 밖에서 실행된 SQL(스케줄러, 알림 writer 등)은 route="background"로 집계됩니다.
+- 값은 프로세스(워커)별입니다. uvicorn 워커를 여러 개 띄우면 스크레이프마다 한 워커의 값만 보입니다.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+BACKGROUND_ROUTE = "background"
+UNMATCHED_ROUTE = "unmatched"   # 404 등 라우트가 없는 요청 (경로별로 늘어나지 않도록 하나로 묶음)
+
+
+def _label_str(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_float(value: float):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_label_str(self.labels, label_values)} {_format_float(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}   # label_values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            if index < len(self.buckets):
+                entry[index] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        names = self.labels + ("le",)
+        for label_values, entry in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, entry):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_label_str(names, label_values + (_format_float(bound),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_label_str(names, label_values + ('+Inf',))} {entry[-1]}")
+            lines.append(f"{self.name}_sum{_label_str(self.labels, label_values)} {_format_float(entry[-2])}")
+            lines.append(f"{self.name}_count{_label_str(self.labels, label_values)} {entry[-1]}")
+        return lines
+
+
+class Gauge:
+    """스크레이프 시점에 collect()로 값을 읽어오는 게이지"""
+
+    def __init__(self, name: str, help_text: str, labels, collect):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.collect = collect  # () -> [(label_values, value)]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for label_values, value in self.collect():
+            lines.append(f"{self.name}{_label_str(self.labels, label_values)} {_format_float(value)}")
+        return lines
+
+
+# --- 지표 정의 ---
+http_requests_total = Counter(
+    "http_requests_total", "HTTP 요청 수", ("method", "route", "status"))
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route"), LATENCY_BUCKETS)
+db_statements_per_request = Histogram(
+    "db_statements_per_request", "요청 1건이 실행한 SQL 문 수", ("method", "route"), STATEMENT_BUCKETS)
+db_statements_total = Counter(
+    "db_statements_total", "실행한 SQL 문 수", ("route",))
+db_time_seconds_total = Counter(
+    "db_time_seconds_total", "SQL 실행에 쓴 시간 합계", ("route",))
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds", "커넥션 풀에서 연결을 얻기까지 기다린 시간", ("engine",), POOL_WAIT_BUCKETS)
+
+_engines = {}   # 이름 -> Engine (풀 게이지용)
+
+
+def _pool_values(attr):
+    def collect():
+        values = []
+        for name, engine in sorted(_engines.items()):
+            getter = getattr(engine.pool, attr, None)
+            if callable(getter):
+                values.append(((name,), getter()))
+        return values
+    return collect
+
+
+db_pool_size = Gauge("db_pool_size", "풀의 기본 연결 수 (pool_size)", ("engine",), _pool_values("size"))
+db_pool_checked_out = Gauge("db_pool_checked_out", "사용 중인 연결 수", ("engine",), _pool_values("checkedout"))
+db_pool_overflow = Gauge("db_pool_overflow", "pool_size를 넘겨 추가로 연 연결 수 (음수면 아직 열지 않은 기본 연결 수)",
+                         ("engine",), _pool_values("overflow"))
+
+REGISTRY = [
+    http_requests_total, http_request_duration,
+    db_statements_per_request, db_statements_total, db_time_seconds_total,
+    db_pool_checkout_wait, db_pool_size, db_pool_checked_out, db_pool_overflow,
+]
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- 요청 단위 DB 집계 ---
+class RequestDBStats:
+    __slots__ = ("statements", "db_time")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+
+
+# 동기 라우터(스레드풀)와 AsyncSession(greenlet)에서도 요청의 context가 그대로 전달되므로
+# 객체를 바꾸지 않고 필드만 더하면 같은 요청에 집계됩니다.
+_current = ContextVar("request_db_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["metrics_started"].pop()
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time += elapsed
+    else:
+        db_statements_total.inc(BACKGROUND_ROUTE)
+        db_time_seconds_total.inc(BACKGROUND_ROUTE, amount=elapsed)
+
+
+def _handle_error(exception_context):
+    # 실패한 문은 after_cursor_execute가 불리지 않으므로 시작 시각만 정리
+    started = exception_context.connection.info.get("metrics_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+
+def _instrument_pool(pool, name: str):
+    """
+    연결을 꺼낼 때(_do_get) 기다린 시간을 측정하도록 풀 객체를 감쌉니다.
+    engine.dispose()로 풀이 다시 만들어져도(recreate) 새 풀에 그대로 적용됩니다.
+    """
+    do_get = pool._do_get
+    recreate = pool.recreate
+
+    def timed_do_get():
+        started = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - started, name)
+
+    def instrumented_recreate():
+        new_pool = recreate()
+        _instrument_pool(new_pool, name)
+        return new_pool
+
+    pool._do_get = timed_do_get
+    pool.recreate = instrumented_recreate
+
+
+def instrument_engine(engine, name: str):
+    """
+    SQL 실행 수/시간 hook을 걸고 풀 게이지 및 checkout 대기 시간 측정을 켭니다.
+    engine은 동기 Engine이어야 합니다. (AsyncEngine은 .sync_engine을 넘김)
+    """
+    if name in _engines:
+        return
+    _engines[name] = engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+    _instrument_pool(engine.pool, name)
+
+
+class MetricsMiddleware:
+    """
+    요청마다 처리 시간과 그 요청이 실행한 SQL 수/DB 시간을 라우트 템플릿 기준으로 기록하는 ASGI 미들웨어.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats()
+        token = _current.set(stats)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current.reset(token)
+            route = scope.get("route")
+            route = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+
+            http_requests_total.inc(method, route, str(status))
+            http_request_duration.observe(elapsed, method, route)
+            db_statements_per_request.observe(stats.statements, method, route)
+            if stats.statements:
+                db_statements_total.inc(route, amount=stats.statements)
+                db_time_seconds_total.inc(route, amount=stats.db_time)
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from ..database import SessionLocal
+from .. import models
+from .realtime import realtime, notification_payload
+from .timeutil import now_naive
+
+FLUSH_BATCH_SIZE = 200      # 버퍼가 이만큼 차면 바로 flush
+FLUSH_INTERVAL = 1.0        # 초
+
+
+def new_notification_row(user_id: int, title: str, message: str):
+    return {
+        "user_id": user_id,
+        "title": title,
+        "message": message,
+        "is_read": False,
+        "created_at": now_naive(),   # naive 서울 시각 (asyncpg는 naive 컬럼에 aware 값을 넣지 못함)
+    }
+
+
+class NotificationWriter:
+    """
+    알림 저장을 모아서 처리하는 writer.
+
+    - enqueue(): 트랜잭션이 없는 경로(매칭 실패 등)용. 버퍼에 쌓았다가 크기/시간 기준으로 한 번의 bulk INSERT로 저장합니다.
+      start() 전(스크립트 등)에는 버퍼에만 쌓이므로 직접 flush()를 호출해야 저장됩니다.
+    - enlist(): 호출자의 세션(트랜잭션)에 알림 행을 함께 넣습니다. 별도 commit 없이 호출자의 commit에 포함되고,
+      commit이 끝난 뒤에 실시간 전송됩니다 (rollback 되면 전송하지 않음).
+    """
+
+    def __init__(self, batch_size: int = FLUSH_BATCH_SIZE, interval: float = FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wakeup = None
+        self._loop = None
+        self._task = None
+
+    # --- 버퍼 경로 ---
+    def enqueue(self, user_id: int, title: str, message: str):
+        with self._lock:
+            self._buffer.append(new_notification_row(user_id, title, message))
+            full = len(self._buffer) >= self.batch_size
+
+        # 이벤트 루프에서 동기 DB I/O를 하지 않도록 저장은 항상 run()/stop()/flush()에서 (start 전에는 버퍼에만 쌓임)
+        if self._task is not None and full:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def flush(self):
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+        if not rows:
+            return 0
+
+        db = SessionLocal()
+        try:
+            notifications = db.scalars(insert(models.Notification).returning(models.Notification), rows).all()
+            payloads = [(n.user_id, notification_payload(n)) for n in notifications]
+            db.commit()
+        except Exception:
+            db.rollback()
+            with self._lock:
+                self._buffer[:0] = rows  # 다음 flush에서 재시도
+            raise
+        finally:
+            db.close()
+
+        for user_id, payload in payloads:
+            realtime.publish(user_id, payload)
+        return len(rows)
+
+    # --- 트랜잭션 참여 경로 ---
+    def enlist(self, db, user_id: int, title: str, message: str):
+        """db는 Session 또는 AsyncSession"""
+        notification = models.Notification(**new_notification_row(user_id, title, message))
+        db.add(notification)
+        return notification
+
+    # --- 주기적 flush ---
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                print(f"[Notification Writer Error] {e}")
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await asyncio.to_thread(self.flush)  # 남은 알림 저장
+
+
+# 세션에 함께 저장된 알림은 flush 시점에 id가 생기므로 그때 전송 내용을 만들어 두고, commit 후에 전송
+@event.listens_for(Session, "after_flush")
+def _collect_notifications(session, flush_context):
+    pending = [obj for obj in session.new if isinstance(obj, models.Notification)]
+    if pending:
+        session.info.setdefault("notifications", []).extend(
+            (n.user_id, notification_payload(n)) for n in pending
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_notifications(session):
+    for user_id, payload in session.info.pop("notifications", ()):
+        realtime.publish(user_id, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_notifications(session):
+    session.info.pop("notifications", None)
+
+
+# 프로세스 전역 writer
+notification_writer = NotificationWriter()
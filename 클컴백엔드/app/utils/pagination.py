@@ -0,0 +1,55 @@
+import base64
+import json
+import os
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+# 롤아웃 기간 호환 플래그: 1이면 limit/cursor 없는 요청에 기존처럼 전체 목록(list)을 반환
+LEGACY_UNPAGINATED = os.getenv("LEGACY_UNPAGINATED", "1") == "1"
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, row_id: int):
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def is_paginated(limit: int | None, cursor: str | None):
+    return limit is not None or cursor is not None or not LEGACY_UNPAGINATED
+
+
+def paginate(query, created_col, id_col, limit: int | None, cursor: str | None):
+    """
+    (created_at, id) 내림차순 keyset 페이지네이션.
+    OFFSET 없이 커서 이후 구간만 읽으므로 몇 번째 페이지든 인덱스 range scan 한 번으로 끝납니다.
+
+    Returns:
+        (rows, next_cursor) — 마지막 페이지면 next_cursor는 None
+    """
+    limit = min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+
+    rows = query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+
+
+def page(items, next_cursor: str | None):
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,225 @@
+import asyncio
+import json
+import os
+from collections import defaultdict
+from fastapi import WebSocket
+from dotenv import load_dotenv
+from zoneinfo import ZoneInfo
+
+load_dotenv()
+
+seoul_tz = ZoneInfo("Asia/Seoul")
+
+# memory: 단일 프로세스용 / postgres: 여러 인스턴스 간 LISTEN/NOTIFY로 전달
+NOTIFY_BROKER = os.getenv("NOTIFY_BROKER", "memory")
+NOTIFY_CHANNEL = "user_notifications"
+RECONNECT_DELAY = 1.0        # LISTEN 재연결 첫 대기(초), 실패할 때마다 두 배
+MAX_RECONNECT_DELAY = 30.0
+
+
+class ConnectionManager:
+    """
+    이 프로세스에 연결된 WebSocket을 user_id별로 관리합니다.
+    """
+
+    def __init__(self):
+        self._connections = defaultdict(set)  # user_id -> {WebSocket}
+
+    async def connect(self, user_id: int, websocket: WebSocket, subprotocol: str | None = None):
+        await websocket.accept(subprotocol=subprotocol)
+        self._connections[user_id].add(websocket)
+
+    def disconnect(self, user_id: int, websocket: WebSocket):
+        sockets = self._connections.get(user_id)
+        if sockets is None:
+            return
+        sockets.discard(websocket)
+        if not sockets:
+            del self._connections[user_id]
+
+    def is_connected(self, user_id: int):
+        return user_id in self._connections
+
+    async def send(self, user_id: int, payload: dict):
+        for websocket in list(self._connections.get(user_id, ())):
+            try:
+                await websocket.send_json(payload)
+            except Exception:
+                self.disconnect(user_id, websocket)
+
+    def __len__(self):
+        return sum(len(sockets) for sockets in self._connections.values())
+
+
+class InProcessBroker:
+    """
+    같은 프로세스 안에서만 전달하는 브로커 (단일 인스턴스 / 테스트용).
+    """
+
+    def __init__(self):
+        self._handler = None
+
+    async def start(self, handler):
+        self._handler = handler
+
+    async def publish(self, user_id: int, payload: dict):
+        if self._handler is not None:
+            await self._handler(user_id, payload)
+
+    async def stop(self):
+        self._handler = None
+
+
+class PostgresBroker:
+    """
+    PostgreSQL LISTEN/NOTIFY로 모든 인스턴스에 알림을 전달하는 브로커.
+    각 인스턴스는 채널을 LISTEN 하고, 자신에게 연결된 사용자에게만 전송합니다.
+
+    - LISTEN용과 발행(pg_notify)용 커넥션을 따로 둡니다.
+    - asyncpg 커넥션은 한 번에 쿼리 하나만 실행할 수 있으므로 발행은 lock으로 하나씩 보냅니다.
+    - LISTEN 커넥션이 끊기면 다시 연결해 LISTEN 하고, 발행 커넥션이 끊기면 다음 발행 때 다시 연결합니다.
+    """
+
+    def __init__(self, dsn: str, channel: str = NOTIFY_CHANNEL):
+        self.dsn = dsn
+        self.channel = channel
+        self._listen_conn = None
+        self._publish_conn = None
+        self._publish_lock = asyncio.Lock()
+        self._handler = None
+        self._reconnect_task = None
+        self._closing = False
+
+    async def start(self, handler):
+        self._handler = handler
+        self._closing = False
+        await self._listen()
+
+    async def _listen(self):
+        import asyncpg
+
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(self.channel, self._on_notify)
+        conn.add_termination_listener(self._on_listen_lost)
+        self._listen_conn = conn
+
+    def _on_listen_lost(self, connection):
+        if self._closing or connection is not self._listen_conn:
+            return
+        print("[Realtime Error] LISTEN 커넥션이 끊겨 다시 연결합니다")
+        self._listen_conn = None
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self):
+        delay = RECONNECT_DELAY
+        while not self._closing:
+            await asyncio.sleep(delay)
+            try:
+                await self._listen()
+                print("[Realtime] LISTEN 다시 연결됨")
+                return
+            except Exception as e:
+                print(f"[Realtime Error] LISTEN 재연결 실패: {e}")
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def _on_notify(self, connection, pid, channel, raw):
+        message = json.loads(raw)
+        asyncio.get_running_loop().create_task(self._handler(message["user_id"], message["payload"]))
+
+    async def publish(self, user_id: int, payload: dict):
+        import asyncpg
+
+        raw = json.dumps({"user_id": user_id, "payload": payload}, ensure_ascii=False, default=str)
+        async with self._publish_lock:
+            for attempt in range(2):
+                if self._publish_conn is None or self._publish_conn.is_closed():
+                    self._publish_conn = await asyncpg.connect(self.dsn)
+                try:
+                    await self._publish_conn.execute("SELECT pg_notify($1, $2)", self.channel, raw)
+                    return
+                except (asyncpg.PostgresConnectionError, asyncpg.InterfaceError, OSError):
+                    # 끊긴 커넥션 → 새 커넥션으로 한 번 더 시도
+                    conn, self._publish_conn = self._publish_conn, None
+                    conn.terminate()
+                    if attempt:
+                        raise
+
+    async def stop(self):
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        for conn in (self._listen_conn, self._publish_conn):
+            if conn is not None:
+                await conn.close()
+        self._listen_conn = self._publish_conn = None
+
+
+def create_broker(kind: str = NOTIFY_BROKER):
+    if kind == "postgres":
+        from ..async_database import ASYNC_DATABASE_URL
+        return PostgresBroker(ASYNC_DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://"))
+    return InProcessBroker()
+
+
+class RealtimeNotifier:
+    """
+    알림 실시간 전송 창구. publish()는 이벤트 루프 밖(스레드풀의 동기 핸들러, 스케줄러 등)에서도 호출할 수 있습니다.
+    서버가 시작되지 않은 경우(스크립트 등)에는 아무것도 하지 않습니다 — DB의 알림 행이 폴링용 fallback입니다.
+    """
+
+    def __init__(self, broker=None):
+        self.manager = ConnectionManager()
+        self.broker = broker or create_broker()
+        self._loop = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        try:
+            await self.broker.start(self.manager.send)
+        except Exception as e:
+            print(f"[Realtime Error] 브로커 시작 실패, 프로세스 내 전달로 대체: {e}")
+            self.broker = InProcessBroker()
+            await self.broker.start(self.manager.send)
+
+    async def stop(self):
+        await self.broker.stop()
+        self._loop = None
+
+    def publish(self, user_id: int, payload: dict):
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is loop:
+            loop.create_task(self._publish(user_id, payload))
+        else:
+            asyncio.run_coroutine_threadsafe(self._publish(user_id, payload), loop)
+
+    async def _publish(self, user_id: int, payload: dict):
+        try:
+            await self.broker.publish(user_id, payload)
+        except Exception as e:
+            print(f"[Realtime Error] {e}")
+
+
+def notification_payload(notification):
+    created_at = notification.created_at
+    if created_at is not None and created_at.tzinfo is not None:
+        # DB(timezone-naive)에서 읽은 알림과 같은 형식으로 맞춤
+        created_at = created_at.astimezone(seoul_tz).replace(tzinfo=None)
+    return {
+        "id": notification.id,
+        "title": notification.title,
+        "message": notification.message,
+        "created_at": created_at.isoformat() if created_at else None,
+    }
+
+
+# 프로세스 전역 notifier
+realtime = RealtimeNotifier()
@@ -0,0 +1,36 @@
+import re
+import unicodedata
+
+_CITY = re.compile(r"(\S+시)")                      # 기존 extract_city와 같은 규칙 (전주시, 서울특별시 ...)
+_DISTRICT = re.compile(r"^(\S+[구군])$")             # 덕진구, 완주군
+_DONG = re.compile(r"^([가-힣]+?[동읍면])(\d+가)?$")  # 서신동, 송천동1가 → 송천동, 봉동읍
+
+
+def parse_region(address: str | None):
+    """
+    주소 문자열에서 행정구역(시/구/동)을 추출합니다.
+
+    도로명 주소처럼 동이 없거나 시가 없는 주소는 해당 값이 None입니다.
+    괄호 안 참고항목(예: "(금암동)")의 동도 인식합니다.
+
+    Returns:
+        (city, district, dong)
+    """
+    address = unicodedata.normalize("NFC", address or "")
+    city_match = _CITY.search(address)
+    if not city_match:
+        return None, None, None
+    city = city_match.group(1)
+
+    district = dong = None
+    for token in re.split(r"[\s,()]+", address[city_match.end():]):
+        if district is None and dong is None:
+            match = _DISTRICT.match(token)
+            if match:
+                district = match.group(1)
+                continue
+        match = _DONG.match(token)
+        if match:
+            dong = match.group(1)
+            break
+    return city, district, dong
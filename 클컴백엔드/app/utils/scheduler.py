@@ -1,54 +1,139 @@
 import asyncio
+import heapq
 from datetime import datetime
+from sqlalchemy import update
 from ..database import SessionLocal
 from .. import models
-from ..routers.notifier import create_notification
-from zoneinfo import ZoneInfo
+from .geo_index import pending_orders_index
+from .notification_writer import notification_writer
+from .timeutil import now_naive, to_naive
 
-seoul_tz = ZoneInfo("Asia/Seoul")
+# 다음 만료 시각이 멀어도 이 간격(초)마다 한 번은 확인 (다른 인스턴스에서 생성된 주문 처리용)
+MAX_TICK_SECONDS = 30
 
-async def start_timeout_task(order_id: int, user_id: int, delay_minutes: int = 30):
-    await asyncio.sleep(delay_minutes * 60)
 
-    db = SessionLocal()
-    try:
-        order = db.query(models.Order).filter(
-            models.Order.id == order_id
-        ).first()
+class OrderExpiryScheduler:
+    """
+    주문 만료(30분 타임아웃)를 처리하는 단일 스케줄러.
 
-        if not order:
-            return  # 주문이 아예 없음 → 아무것도 할 필요 없음
+    - 주문마다 sleep 하는 코루틴 대신 (expires_at, order_id) 최소 힙 하나만 유지합니다.
+    - 시작 시 orders 테이블에서 pending 주문을 읽어 힙을 다시 구성하므로 재시작/스케일 인에도 안전합니다.
+    - 한 번의 tick에서 만료된 주문 전체를 하나의 UPDATE로 처리합니다.
+      (WHERE 조건이 status='pending' AND expires_at <= now 이므로 여러 인스턴스가 동시에 돌아도 중복 처리되지 않음)
+    """
 
-        # 현재 시간
-        now = datetime.now(seoul_tz)
+    def __init__(self, max_tick: float = MAX_TICK_SECONDS):
+        self.max_tick = max_tick
+        self._heap = []
+        self._wakeup = None  # start()에서 현재 이벤트 루프에 맞춰 생성
+        self._task = None
 
-        # 매칭 완료된 경우 (expires_at이 None) 또는 아직 만료 시간 전인 경우
-        if order.expires_at is None:
-            return  # 매칭 완료됨
+    def schedule(self, order_id: int, expires_at: datetime | None):
+        if expires_at is None:
+            return
+        expires_at = to_naive(expires_at)
+        is_earliest = not self._heap or expires_at < self._heap[0][0]
+        heapq.heappush(self._heap, (expires_at, order_id))
+        if is_earliest and self._wakeup is not None:
+            self._wakeup.set()  # 더 이른 만료 시각이 생겼으면 대기 시간 재계산
 
-        # expires_at이 timezone-naive이므로 now도 naive로 비교
-        now_naive = datetime.now()
-        if now_naive < order.expires_at:
-            return  # 아직 만료 시간 전
+    def rebuild(self):
+        db = SessionLocal()
+        try:
+            rows = db.query(models.Order.expires_at, models.Order.id).filter(
+                models.Order.status == "pending",
+                models.Order.expires_at.isnot(None)
+            ).all()
+        finally:
+            db.close()
 
-        # Order가 expire 시간까지 매칭되지 않은 경우 → 자동 취소 처리
-        message = f"요청 #{order_id}이 30분 동안 매칭되지 않아 자동 취소되었습니다."
+        self._heap = [(to_naive(expires_at), order_id) for expires_at, order_id in rows]
+        heapq.heapify(self._heap)
+        print(f"[Scheduler] pending 주문 {len(self._heap)}건 복구")
 
-        # 주문 삭제
-        db.delete(order)
-        db.commit()
+    def expire_due(self, now: datetime | None = None):
+        """
+        만료 시각이 지난 pending 주문을 한 번의 UPDATE로 만료 처리하고 알림을 일괄 저장합니다.
+        만료 처리된 (order_id, owner_id) 목록을 반환합니다.
+        """
+        now = now or now_naive()
 
-        print(f"[타임아웃] {now} → {message}")
+        db = SessionLocal()
+        try:
+            expired = db.execute(
+                update(models.Order)
+                .where(models.Order.status == "pending")
+                .where(models.Order.expires_at <= now)
+                .values(status="expired")
+                .returning(models.Order.id, models.Order.owner_id)
+            ).all()
 
-        # Polling용 알림 추가
-        create_notification(
-            db=db,
-            user_id=user_id,
-            title="매칭 실패",
-            message=message
-        )
+            # 알림도 같은 트랜잭션에 추가 (flush 시 한 번의 bulk INSERT, commit 후 실시간 전송)
+            for order_id, owner_id in expired:
+                notification_writer.enlist(
+                    db,
+                    user_id=owner_id,
+                    title="매칭 실패",
+                    message=f"요청 #{order_id}이 30분 동안 매칭되지 않아 자동 취소되었습니다."
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
 
-    except Exception as e:
-        print(f"[Scheduler Error] {e}")
-    finally:
-        db.close()
\ No newline at end of file
+        for order_id, _ in expired:
+            pending_orders_index.remove(order_id)
+        if expired:
+            print(f"[타임아웃] {now} → 주문 {len(expired)}건 자동 취소")
+
+        return expired
+
+    async def run(self):
+        while True:
+            now = now_naive()
+            timeout = self.max_tick
+            if self._heap:
+                timeout = min(timeout, max((self._heap[0][0] - now).total_seconds(), 0))
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                continue  # 더 이른 만료 시각이 추가됨 → 대기 시간 재계산
+            except asyncio.TimeoutError:
+                pass
+
+            now = now_naive()
+            try:
+                await asyncio.to_thread(self.expire_due, now)
+            except Exception as e:
+                print(f"[Scheduler Error] {e}")  # 다음 tick의 UPDATE에서 다시 처리됨
+
+            # 힙에서 이미 지난 항목 정리 (매칭/취소된 주문도 여기서 함께 빠짐)
+            while self._heap and self._heap[0][0] <= now:
+                heapq.heappop(self._heap)
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        try:
+            await asyncio.to_thread(self.rebuild)
+        except Exception as e:
+            print(f"[Scheduler Error] 복구 실패: {e}")
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# 프로세스 전역 스케줄러
+expiry_scheduler = OrderExpiryScheduler()
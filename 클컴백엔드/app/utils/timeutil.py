@@ -0,0 +1,13 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+seoul_tz = ZoneInfo("Asia/Seoul")
+
+
+def now_naive():
+    # DateTime 컬럼은 timezone-naive(서울 시각)로 저장되므로 쓰기/비교 모두 naive 서울 시각으로
+    return datetime.now(seoul_tz).replace(tzinfo=None)
+
+
+def to_naive(dt: datetime):
+    return dt.astimezone(seoul_tz).replace(tzinfo=None) if dt.tzinfo else dt
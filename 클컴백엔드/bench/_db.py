@@ -0,0 +1,26 @@
+"""
+벤치마크 공용 DB 설정.
+
+벤치마크는 테이블을 비우고 다시 만들기 때문에, app을 import하기 전에 여기서 DATABASE_URL을 정합니다.
+(database.py의 기본값은 운영 RDS)
+"""
+import os
+import secrets
+import sys
+
+
+def use_local_database(name: str):
+    """DATABASE_URL을 주지 않으면 현재 디렉터리의 SQLite 파일(<name>.db)을 씁니다."""
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///./{name}.db")
+
+
+def require_postgres(name: str):
+    """동시성 검사처럼 PostgreSQL에서만 의미 있는 벤치용. DATABASE_URL이 PostgreSQL이 아니면 종료합니다."""
+    if not os.getenv("DATABASE_URL", "").startswith("postgresql"):
+        sys.exit(f"{name}: 벤치용 PostgreSQL을 DATABASE_URL로 지정하세요 "
+                 f"(예: DATABASE_URL=postgresql+psycopg2://user:pw@localhost:5432/delivery_bench)")
+
+
+def use_bench_jwt_secret():
+    """서버를 띄우는 벤치용. JWT_SECRET이 없으면 이 실행에서만 쓰는 임의의 서명 키를 씁니다."""
+    os.environ.setdefault("JWT_SECRET", secrets.token_hex(32))
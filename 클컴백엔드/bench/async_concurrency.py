@@ -0,0 +1,109 @@
+"""
+async 라우터에서 동기 Session을 쓰는 경우와 AsyncSession을 쓰는 경우의 동시 처리량 비교 벤치마크.
+
+같은 모양의 "요청"(DB 왕복 여러 번)을 동시에 N개 실행하고 전체 소요 시간, 처리량,
+이벤트 루프 지연(heartbeat lag)을 출력합니다. RDS 왕복 지연은 DB 측 sleep으로 흉내냅니다.
+(PostgreSQL: pg_sleep / SQLite: 연결마다 등록하는 sleep 함수)
+
+실행 예:
+    DATABASE_URL=postgresql+psycopg2://user:pw@localhost:5432/delivery \\
+        python -m bench.async_concurrency --requests 200 --concurrency 50 --latency-ms 20
+    python -m bench.async_concurrency            (DATABASE_URL이 없으면 ./async_concurrency_bench.db)
+"""
+from bench._db import use_local_database
+
+use_local_database("async_concurrency_bench")
+
+import argparse
+import asyncio
+import time
+from sqlalchemy import event, text
+from app.database import SessionLocal, engine
+from app.async_database import AsyncSessionLocal, async_engine
+
+
+def install_sqlite_sleep():
+    def _sleep(ms):
+        time.sleep(ms / 1000)
+        return 0
+
+    for eng in (engine, async_engine.sync_engine):
+        if eng.dialect.name == "sqlite":
+            @event.listens_for(eng, "connect")
+            def _register(dbapi_connection, _):
+                dbapi_connection.create_function("sleep", 1, _sleep)
+
+
+def round_trip_sql(dialect: str, latency_ms: float):
+    if dialect == "postgresql":
+        return text(f"SELECT pg_sleep({latency_ms / 1000})")
+    return text(f"SELECT sleep({latency_ms})")
+
+
+async def sync_request(stmt, queries: int):
+    # 기존 방식: async def 핸들러 안에서 동기 Session 호출 → 이벤트 루프가 그대로 막힘
+    db = SessionLocal()
+    try:
+        for _ in range(queries):
+            db.execute(stmt)
+    finally:
+        db.close()
+
+
+async def async_request(stmt, queries: int):
+    async with AsyncSessionLocal() as db:
+        for _ in range(queries):
+            await db.execute(stmt)
+
+
+async def heartbeat(lags: list, stop: asyncio.Event, interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def run(mode: str, stmt, requests: int, concurrency: int, queries: int):
+    handler = sync_request if mode == "sync" else async_request
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            await handler(stmt, queries)
+
+    lags, stop = [], asyncio.Event()
+    hb = asyncio.create_task(heartbeat(lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await hb
+
+    max_lag = max(lags) * 1000 if lags else elapsed * 1000
+    print(f"{mode:>5}: {requests} req in {elapsed:.2f}s → {requests / elapsed:8.1f} req/s, "
+          f"max event-loop lag {max_lag:.1f} ms")
+    return elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=3, help="요청 하나당 DB 왕복 횟수")
+    parser.add_argument("--latency-ms", type=float, default=10, help="DB 왕복 1회 지연(ms)")
+    args = parser.parse_args()
+
+    install_sqlite_sleep()
+    stmt = round_trip_sql(engine.dialect.name, args.latency_ms)
+    print(f"DB: {engine.dialect.name}, latency {args.latency_ms} ms x {args.queries} queries/request, "
+          f"concurrency {args.concurrency}")
+
+    sync_elapsed = await run("sync", stmt, args.requests, args.concurrency, args.queries)
+    async_elapsed = await run("async", stmt, args.requests, args.concurrency, args.queries)
+    print(f"speedup: x{sync_elapsed / async_elapsed:.1f}")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+자동 매칭(auto_matcher) 한 tick 처리 시간 벤치마크.
+
+가게 S곳에 pending 주문 N건을 반경 약 1km 안에 무작위로 만들고,
+짝 계산(plan_pairs)과 한 번의 배치 트랜잭션 저장(match_once)에 걸린 시간을 출력한 뒤 결과를 검사합니다.
+
+실행 예:
+    DATABASE_URL=postgresql+psycopg2://user:pw@localhost:5432/delivery_bench \\
+        python -m bench.auto_match --orders 5000 --stores 50
+    DATABASE_URL=sqlite:///./bench.db python -m bench.auto_match
+"""
+from bench._db import use_local_database
+
+use_local_database("auto_match_bench")
+
+import argparse
+import random
+import time
+from datetime import timedelta
+from sqlalchemy import func
+from app import models
+from app.database import Base, SessionLocal, engine
+from app.utils.auto_matcher import AutoMatcher, plan_pairs
+from app.utils.timeutil import now_naive
+
+BASE_LAT, BASE_LNG = 35.8468, 127.1294
+SPREAD_DEG = 0.009   # 약 ±1km
+MENU_PRICE = 10000
+
+
+def seed(orders: int, stores: int):
+    db = SessionLocal()
+    try:
+        store_rows = [models.Store(name=f"store-{i}", category="치킨", minimum_price=MENU_PRICE * 2,
+                                   delivery_tip=2000, delivery_delay=30) for i in range(stores)]
+        db.add_all(store_rows)
+        menus = []
+        for store in store_rows:
+            db.flush()
+            menus.append(models.Menu(store_id=store.id, name="menu", price=MENU_PRICE))
+        db.add_all(menus)
+        users = [models.User(email=f"u{i}@bench", name=f"u{i}", credit=0) for i in range(orders)]
+        db.add_all(users)
+        db.flush()
+
+        created = now_naive() - timedelta(minutes=10)
+        order_rows = []
+        for i, user in enumerate(users):
+            k = random.randrange(stores)
+            order_rows.append(models.Order(
+                owner_id=user.id, creator_id=user.id, store_id=store_rows[k].id, delivery_location="bench",
+                delivery_lat=BASE_LAT + random.uniform(-SPREAD_DEG, SPREAD_DEG),
+                delivery_lng=BASE_LNG + random.uniform(-SPREAD_DEG, SPREAD_DEG),
+                split_type=False, owner_paid_amount=MENU_PRICE + 1000, owner_total=MENU_PRICE,
+                status="pending", created_at=created + timedelta(milliseconds=i),
+                expires_at=created + timedelta(minutes=30),
+            ))
+        db.add_all(order_rows)
+        db.flush()
+        db.add_all([models.OrderItem(order_id=o.id, user_id=o.owner_id, menu_id=menus[0].id, price=MENU_PRICE)
+                    for o in order_rows])
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=3000)
+    parser.add_argument("--stores", type=int, default=30)
+    parser.add_argument("--radius", type=float, default=300)
+    args = parser.parse_args()
+
+    random.seed(0)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    seed(args.orders, args.stores)
+
+    matcher = AutoMatcher(radius=args.radius, min_age=0)
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        orders, minimum_price = matcher.load_candidates(db, now_naive())
+        loaded = time.perf_counter()
+        pairs = plan_pairs(orders, minimum_price, args.radius)
+        planned = time.perf_counter()
+    finally:
+        db.close()
+    print(f"load {len(orders)} orders: {(loaded - started) * 1000:.1f} ms, "
+          f"plan {len(pairs)} pairs: {(planned - loaded) * 1000:.1f} ms")
+
+    started = time.perf_counter()
+    saved = matcher.match_once()
+    print(f"match_once (load + plan + batch commit): {(time.perf_counter() - started) * 1000:.1f} ms, {len(saved)} pairs")
+
+    db = SessionLocal()
+    try:
+        counts = dict(db.query(models.Order.status, func.count()).group_by(models.Order.status).all())
+        moved = db.query(func.count()).select_from(models.OrderItem).filter(
+            models.OrderItem.order_id.in_([keep for keep, _ in saved])).scalar()
+        notices = db.query(func.count()).select_from(models.Notification).scalar()
+    finally:
+        db.close()
+
+    checks = {
+        "every pair saved": len(saved) == len(pairs),
+        "matched == merged == pairs": counts.get("matched", 0) == counts.get("merged", 0) == len(saved),
+        "merged items moved to kept orders": moved == 2 * len(saved),
+        "two notifications per pair": notices == 2 * len(saved),
+    }
+    for name, passed in checks.items():
+        print(f"  [{'OK' if passed else 'FAIL'}] {name}")
+    if not all(checks.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
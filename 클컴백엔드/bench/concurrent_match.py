@@ -0,0 +1,145 @@
+"""
+동시 매칭 벤치마크 (경쟁 상황에서의 처리량 + 정합성 검사).
+
+1) 같은 주문 하나에 N명이 동시에 POST /match/ → 정확히 1명만 성공해야 하고, 차감된 크레딧도 1명분이어야 합니다.
+2) 크레딧이 주문 1건 분량뿐인 사용자 1명이 서로 다른 주문 M개에 동시에 매칭 → 1건만 성공, 잔액이 음수가 되면 안 됩니다.
+
+로컬 PostgreSQL 대상 실행 예 (테이블은 스크립트가 비우고 다시 만듭니다. DATABASE_URL 필수):
+    DATABASE_URL=postgresql+psycopg2://user:pw@localhost:5432/delivery_bench \\
+        python -m bench.concurrent_match --matchers 50
+"""
+from bench._db import require_postgres, use_bench_jwt_secret
+
+require_postgres("bench.concurrent_match")
+use_bench_jwt_secret()
+
+import argparse
+import asyncio
+import time
+import httpx
+from sqlalchemy import func
+from app.main import app
+from app import models
+from app.database import Base, SessionLocal, engine
+from app.async_database import async_engine
+
+MENU_PRICE = 10000
+
+
+def seed(matchers: int, orders: int):
+    db = SessionLocal()
+    try:
+        store = models.Store(name="bench-store", category="치킨", minimum_price=MENU_PRICE * 2,
+                             delivery_tip=2000, delivery_delay=30)
+        db.add(store)
+        db.flush()
+        menu = models.Menu(store_id=store.id, name="bench-menu", price=MENU_PRICE)
+        db.add(menu)
+        db.flush()
+
+        # 시나리오 1: 주문 1건 + 경쟁 매칭 사용자 N명
+        owner = models.User(email="owner@bench", name="owner", credit=0)
+        db.add(owner)
+        db.flush()
+        hot_order = models.Order(owner_id=owner.id, creator_id=owner.id, store_id=store.id,
+                                 delivery_location="bench", split_type=False, owner_paid_amount=MENU_PRICE + 1000,
+                                 owner_total=MENU_PRICE)
+        db.add(hot_order)
+        db.flush()
+        db.add(models.OrderItem(order_id=hot_order.id, user_id=owner.id, menu_id=menu.id, price=MENU_PRICE))
+
+        users = [models.User(email=f"m{i}@bench", name=f"m{i}", credit=100000) for i in range(matchers)]
+        db.add_all(users)
+        db.flush()
+        db.add_all([models.MenuList(user_id=u.id, menu_id=menu.id, price=MENU_PRICE) for u in users])
+
+        # 시나리오 2: 크레딧이 1건 분량뿐인 사용자 1명 + 서로 다른 주문 M건
+        poor = models.User(email="poor@bench", name="poor", credit=MENU_PRICE + 1000)
+        db.add(poor)
+        db.flush()
+        db.add(models.MenuList(user_id=poor.id, menu_id=menu.id, price=MENU_PRICE))
+        other_orders = []
+        for i in range(orders):
+            o_owner = models.User(email=f"o{i}@bench", name=f"o{i}", credit=0)
+            db.add(o_owner)
+            db.flush()
+            o = models.Order(owner_id=o_owner.id, creator_id=o_owner.id, store_id=store.id,
+                             delivery_location="bench", split_type=False, owner_paid_amount=MENU_PRICE + 1000,
+                             owner_total=MENU_PRICE)
+            db.add(o)
+            db.flush()
+            db.add(models.OrderItem(order_id=o.id, user_id=o_owner.id, menu_id=menu.id, price=MENU_PRICE))
+            other_orders.append(o.id)
+
+        db.commit()
+        return hot_order.id, [u.id for u in users], poor.id, other_orders
+    finally:
+        db.close()
+
+
+async def fire(client: httpx.AsyncClient, pairs):
+    async def one(order_id, user_id):
+        started = time.perf_counter()
+        res = await client.post("/match/", json={"order_id": order_id, "matched_user_id": user_id})
+        return res.status_code, time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(o, u) for o, u in pairs))
+    return results, time.perf_counter() - started
+
+
+def report(name, results, elapsed):
+    ok = sum(1 for status, _ in results if status == 200)
+    latencies = sorted(lat for _, lat in results)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    print(f"{name}: {len(results)} requests in {elapsed:.2f}s → {len(results) / elapsed:.1f} req/s, "
+          f"p95 {p95:.1f} ms, success {ok}")
+    return ok
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--matchers", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    hot_order, matchers, poor, other_orders = seed(args.matchers, args.orders)
+
+    # 서버와 같게 startup/shutdown을 실행 (알림 writer 등 백그라운드 작업 시작)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results, elapsed = await fire(client, [(hot_order, u) for u in matchers])
+        ok_hot = report("same order, N matchers", results, elapsed)
+
+        results, elapsed = await fire(client, [(o, poor) for o in other_orders])
+        ok_poor = report("same user, M orders   ", results, elapsed)
+
+    db = SessionLocal()
+    try:
+        deducted = db.query(func.sum(100000 - models.User.credit)).filter(models.User.id.in_(matchers)).scalar()
+        status = db.query(models.Order.status).filter(models.Order.id == hot_order).scalar()
+        poor_credit = db.query(models.User.credit).filter(models.User.id == poor).scalar()
+    finally:
+        db.close()
+
+    expected = int(MENU_PRICE + 2000 / 2)
+    checks = {
+        "exactly one matcher won the hot order": ok_hot == 1,
+        "hot order is matched": status == "matched",
+        "credit deducted exactly once": deducted == expected,
+        "poor user matched at most one order": ok_poor <= 1,
+        "poor user credit never negative": poor_credit >= 0,
+    }
+    for name, passed in checks.items():
+        print(f"  [{'OK' if passed else 'FAIL'}] {name}")
+
+    await async_engine.dispose()
+    if not all(checks.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+"""
+주문 생성(POST /orders/) 변경 전/후 SQL 문 수와 지연 비교 벤치마크.
+
+- before : 기존 방식 — 크레딧 차감 후 commit, Order INSERT 후 commit, OrderItem을 하나씩 추가하고
+           장바구니를 하나씩 삭제한 뒤 commit (commit 3번, 장바구니 크기에 비례하는 작업)
+- after  : routers/orders.create_order — 한 트랜잭션, INSERT ... SELECT로 아이템 복사, DELETE 한 번
+
+장바구니 크기별로 주문 1건당 실행된 SQL 문 수(commit 포함)와 지연(p50/p95)을 출력합니다.
+--latency-ms를 주면 SQL 문/commit마다 그만큼 기다려 RDS 왕복 지연을 흉내냅니다.
+
+실행 예:
+    python -m bench.create_order --items 1 5 20 --orders 50 --latency-ms 1
+    DATABASE_URL=postgresql+psycopg2://user:pw@localhost:5432/delivery python -m bench.create_order
+"""
+from bench._db import use_local_database
+
+use_local_database("create_order_bench")
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import timedelta
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from starlette.requests import Request
+from app import models
+from app.async_database import AsyncSessionLocal, async_engine
+from app.database import Base, SessionLocal, engine
+from app.routers.orders import create_order
+from app.schemas import OrderCreate
+from app.utils.geo_index import pending_orders_index
+from app.utils.scheduler import expiry_scheduler
+from app.utils.timeutil import now_naive
+
+MENU_PRICE = 1000
+
+
+async def before_create_order(order: OrderCreate, db):
+    """변경 전 create_order (비교용으로 그대로 옮김)"""
+    user = await db.get(models.User, order.creator_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    cart_items = (await db.scalars(
+        select(models.MenuList).where(models.MenuList.user_id == user.id)
+    )).all()
+    if not cart_items:
+        raise HTTPException(status_code=400, detail="User cart is empty")
+
+    first_menu = await db.get(models.Menu, cart_items[0].menu_id)
+    store = await db.get(models.Store, first_menu.store_id)
+
+    total_price = sum(item.price for item in cart_items)
+    if order.split_type:
+        owner_pay = total_price / 2 + store.delivery_tip / 2
+    else:
+        owner_pay = total_price + store.delivery_tip / 2
+
+    if user.credit < owner_pay:
+        raise HTTPException(status_code=400, detail="Insufficient credit")
+
+    user.credit -= int(owner_pay)
+    await db.commit()
+    await db.refresh(user)
+
+    new_order = models.Order(
+        creator_id=user.id, owner_id=user.id, store_id=store.id,
+        delivery_location=order.delivery_location, detailed_location=order.detailed_location,
+        delivery_lat=order.delivery_lat, delivery_lng=order.delivery_lng,
+        split_type=order.split_type, owner_paid_amount=int(owner_pay), owner_total=total_price,
+        created_at=now_naive(), expires_at=now_naive() + timedelta(minutes=30)
+    )
+    db.add(new_order)
+    await db.commit()
+    await db.refresh(new_order)
+
+    expiry_scheduler.schedule(new_order.id, new_order.expires_at)
+    pending_orders_index.add(new_order.id, store.category, order.delivery_lat, order.delivery_lng)
+
+    for item in cart_items:
+        db.add(models.OrderItem(order_id=new_order.id, user_id=user.id, menu_id=item.menu_id, price=item.price))
+    for item in cart_items:
+        await db.delete(item)
+    await db.commit()
+    return {"order_id": new_order.id}
+
+
+async def after_create_order(order: OrderCreate, db):
+    request = Request({"type": "http", "state": {}})
+    return await create_order(order, request, db)
+
+
+class StatementCounter:
+    """async 엔진에서 실행된 SQL 문/commit 수를 세고, 선택적으로 왕복 지연을 더합니다."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.statements = 0
+        self.commits = 0
+        sync_engine = async_engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._on_execute)
+        event.listen(sync_engine, "commit", self._on_commit)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _on_commit(self, conn):
+        self.commits += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def reset(self):
+        self.statements = 0
+        self.commits = 0
+
+
+def seed(max_items: int, orders: int):
+    db = SessionLocal()
+    try:
+        store = models.Store(name="bench-store", category="치킨", location="전북 전주시 덕진구",
+                             minimum_price=0, delivery_tip=2000, delivery_delay=30)
+        db.add(store)
+        db.flush()
+        menus = [models.Menu(store_id=store.id, name=f"menu-{i}", price=MENU_PRICE) for i in range(max_items)]
+        users = [models.User(email=f"u{i}@bench", name=f"u{i}", credit=10 ** 9) for i in range(orders)]
+        db.add_all(menus + users)
+        db.commit()
+        return [m.id for m in menus], [u.id for u in users]
+    finally:
+        db.close()
+
+
+def fill_carts(user_ids, menu_ids):
+    db = SessionLocal()
+    try:
+        db.query(models.MenuList).delete()
+        db.add_all([models.MenuList(user_id=user_id, menu_id=menu_id, price=MENU_PRICE)
+                    for user_id in user_ids for menu_id in menu_ids])
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run(fn, user_ids, counter: StatementCounter):
+    latencies = []
+    counter.reset()
+    for user_id in user_ids:
+        order = OrderCreate(creator_id=user_id, delivery_location="bench", split_type=False,
+                            delivery_lat=35.84, delivery_lng=127.12)
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            await fn(order, db)
+            latencies.append(time.perf_counter() - started)
+    n = len(user_ids)
+    latencies.sort()
+    return (counter.statements / n, counter.commits / n,
+            statistics.median(latencies), latencies[min(int(n * 0.95), n - 1)])
+
+
+async def main_async(args):
+    menu_ids, user_ids = seed(max(args.items), args.orders)
+    counter = StatementCounter(args.latency_ms / 1000)
+
+    print(f"{'items':>6} {'method':>7} {'stmt/order':>11} {'commit/order':>13} {'p50 ms':>9} {'p95 ms':>9}")
+    for n_items in args.items:
+        for name, fn in (("before", before_create_order), ("after", after_create_order)):
+            fill_carts(user_ids, menu_ids[:n_items])
+            statements, commits, p50, p95 = await run(fn, user_ids, counter)
+            print(f"{n_items:>6} {name:>7} {statements:>11.1f} {commits:>13.1f} {p50 * 1000:>9.2f} {p95 * 1000:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
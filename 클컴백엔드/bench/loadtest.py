@@ -0,0 +1,294 @@
+"""
+주문 생성 → 주변 주문 조회 → 매칭 흐름 전체 부하 테스트.
+
+uvicorn으로 실제 서버를 띄우고(또는 --url로 이미 떠 있는 서버를 지정), 가상 사용자(VU)들이
+아래 동작을 가중치에 따라 섞어서 반복합니다.
+
+- create : 장바구니 담기(/cart/add) → 공동 주문 생성(POST /orders/)
+- match  : 주변 주문 조회(GET /orders/ + 좌표) → 같은 가게 메뉴 담기 → 매칭(POST /match/)
+- browse : 주변 주문 조회만
+- poll   : 알림 폴링(GET /notifier/notifications/{user_id})
+
+끝나면 라우트별 요청 수, 상태 코드 분포, 처리량(req/s), p50/p95/p99 지연을 출력하고
+--json을 주면 같은 내용을 파일로 저장합니다 (변경 전/후 비교, ASG 인스턴스 수 산정용).
+
+테이블은 스크립트가 비우고 다시 만들고, 사용자/가게/메뉴를 시드합니다. 서버와 같은 DATABASE_URL을 써야 합니다.
+
+실행 예:
+    # 로컬 PostgreSQL
+    DATABASE_URL=postgresql+psycopg2://user:pw@localhost:5432/delivery_bench \\
+        python -m bench.loadtest --users 200 --duration 60 --workers 4
+    # SQLite 스모크 실행
+    DATABASE_URL=sqlite:///./loadtest.db python -m bench.loadtest --users 20 --duration 10
+"""
+from bench._db import use_local_database, use_bench_jwt_secret
+
+use_local_database("loadtest")
+use_bench_jwt_secret()
+
+import argparse
+import os
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+import httpx
+from app import models
+from app.database import Base, SessionLocal, engine, DATABASE_URL
+
+CATEGORIES = ["치킨", "피자", "한식", "중식"]
+BASE_LAT, BASE_LNG = 35.8468, 127.1294    # 전북대 부근
+SPREAD_DEG = 0.004                         # 시드 좌표 분포 범위 (약 ±400m)
+MENU_PRICE = 10000
+
+DEFAULT_MIX = "create=2,match=3,browse=3,poll=2"
+
+
+def seed(users: int, stores_per_category: int, menus_per_store: int):
+    """
+    Returns:
+        user_ids, {store_id: (category, [menu_id, ...])}
+    """
+    db = SessionLocal()
+    try:
+        stores = []
+        for category in CATEGORIES:
+            for i in range(stores_per_category):
+                stores.append(models.Store(
+                    name=f"{category}-{i}", category=category, location="전북 전주시 덕진구",
+                    latitude=BASE_LAT, longitude=BASE_LNG,
+                    minimum_price=MENU_PRICE * 2, delivery_tip=2000, delivery_delay=30,
+                ))
+        db.add_all(stores)
+        db.flush()
+
+        menus = [models.Menu(store_id=s.id, name=f"menu-{j}", price=MENU_PRICE)
+                 for s in stores for j in range(menus_per_store)]
+        db.add_all(menus)
+
+        user_rows = [models.User(email=f"vu{i}@loadtest", name=f"vu{i}", credit=10 ** 9) for i in range(users)]
+        db.add_all(user_rows)
+        db.commit()
+
+        catalog = {s.id: (s.category, []) for s in stores}
+        for menu in menus:
+            catalog[menu.store_id][1].append(menu.id)
+        return [u.id for u in user_rows], catalog
+    finally:
+        db.close()
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)                      # route -> [초]
+        self.statuses = defaultdict(lambda: defaultdict(int))   # route -> {status: count}
+
+    def record(self, route: str, status: int, elapsed: float):
+        self.latencies[route].append(elapsed)
+        self.statuses[route][status] += 1
+
+    @staticmethod
+    def percentile(values, p):
+        if not values:
+            return 0.0
+        k = min(len(values) - 1, max(0, int(round(p / 100 * len(values))) - 1))
+        return values[k]
+
+    def summary(self, duration: float):
+        rows = []
+        for route in sorted(self.latencies):
+            values = sorted(self.latencies[route])
+            rows.append({
+                "route": route,
+                "count": len(values),
+                "rps": len(values) / duration,
+                "p50_ms": self.percentile(values, 50) * 1000,
+                "p95_ms": self.percentile(values, 95) * 1000,
+                "p99_ms": self.percentile(values, 99) * 1000,
+                "statuses": dict(sorted(self.statuses[route].items())),
+            })
+        total = sum(row["count"] for row in rows)
+        errors = sum(n for row in rows for status, n in row["statuses"].items() if status >= 500 or status == 0)
+        return {"duration_s": duration, "requests": total, "rps": total / duration, "errors": errors, "routes": rows}
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, stats: Stats, user_id: int, catalog: dict):
+        self.client = client
+        self.stats = stats
+        self.user_id = user_id
+        self.catalog = catalog
+        self.cart = []   # 현재 장바구니에 담긴 menu_id (서버 상태와 맞춰 둠)
+        self.lat = BASE_LAT + random.uniform(-SPREAD_DEG, SPREAD_DEG)
+        self.lng = BASE_LNG + random.uniform(-SPREAD_DEG, SPREAD_DEG)
+
+    async def request(self, route: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            response, status = None, 0   # 연결 실패/타임아웃
+        self.stats.record(route, status, time.perf_counter() - started)
+        return response
+
+    async def clear_cart(self):
+        for menu_id in self.cart:
+            await self.request("DELETE /cart/remove", "DELETE", "/cart/remove",
+                               params={"user_id": self.user_id, "menu_id": menu_id})
+        self.cart = []
+
+    async def add_to_cart(self, store_id: int, menu_id: int):
+        response = await self.request("POST /cart/add", "POST", "/cart/add",
+                                      params={"user_id": self.user_id, "store_id": store_id, "menu_id": menu_id})
+        if response is not None and response.status_code == 200:
+            self.cart.append(menu_id)
+            return True
+        return False
+
+    async def create(self):
+        await self.clear_cart()
+        store_id = random.choice(list(self.catalog))
+        menu_ids = self.catalog[store_id][1]
+        for menu_id in random.sample(menu_ids, k=min(len(menu_ids), random.randint(1, 2))):
+            await self.add_to_cart(store_id, menu_id)
+
+        response = await self.request("POST /orders/", "POST", "/orders/", json={
+            "creator_id": self.user_id,
+            "delivery_location": "loadtest",
+            "delivery_lat": self.lat,
+            "delivery_lng": self.lng,
+            "split_type": False,
+        })
+        if response is not None and response.status_code == 200:
+            self.cart = []
+
+    async def browse(self):
+        response = await self.request("GET /orders/", "GET", "/orders/", params={
+            "category": random.choice(CATEGORIES), "lat": self.lat, "lon": self.lng, "radius": 1000, "limit": 20,
+        })
+        if response is None or response.status_code != 200:
+            return []
+        body = response.json()
+        return body["items"] if isinstance(body, dict) else body
+
+    async def match(self):
+        orders = [o for o in await self.browse() if o["owner_id"] != self.user_id]
+        if not orders:
+            return
+        order = random.choice(orders)
+
+        await self.clear_cart()
+        if not await self.add_to_cart(order["store_id"], random.choice(self.catalog[order["store_id"]][1])):
+            return
+        response = await self.request("POST /match/", "POST", "/match/",
+                                      json={"order_id": order["id"], "matched_user_id": self.user_id})
+        if response is not None and response.status_code == 200:
+            self.cart = []
+
+    async def poll(self):
+        await self.request("GET /notifier/notifications", "GET", f"/notifier/notifications/{self.user_id}",
+                           params={"limit": 20})
+
+    async def run(self, mix: dict, deadline: float, think_time: float):
+        actions = list(mix)
+        weights = [mix[a] for a in actions]
+        while time.monotonic() < deadline:
+            await getattr(self, random.choices(actions, weights)[0])()
+            if think_time:
+                await asyncio.sleep(random.expovariate(1 / think_time))
+
+
+def parse_mix(raw: str):
+    mix = {}
+    for part in raw.split(","):
+        name, weight = part.split("=")
+        if name not in ("create", "match", "browse", "poll"):
+            raise SystemExit(f"알 수 없는 동작: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def start_server(port: int, workers: int):
+    env = dict(os.environ, DATABASE_URL=DATABASE_URL)
+    env.pop("AUTO_CREATE_TABLES", None)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        if process.poll() is not None:
+            raise SystemExit("서버가 시작되지 못했습니다.")
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("서버 헬스체크 시간 초과")
+
+
+def print_report(summary: dict):
+    print(f"\n{summary['requests']} requests in {summary['duration_s']:.1f}s → "
+          f"{summary['rps']:.1f} req/s, server errors {summary['errors']}")
+    print(f"{'route':<30}{'count':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}  statuses")
+    for row in summary["routes"]:
+        statuses = " ".join(f"{s}:{n}" for s, n in row["statuses"].items())
+        print(f"{row['route']:<30}{row['count']:>8}{row['rps']:>9.1f}{row['p50_ms']:>9.1f}"
+              f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}  {statuses}")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=50, help="동시 가상 사용자 수")
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간(초)")
+    parser.add_argument("--think-time", type=float, default=0.1, help="동작 사이 평균 대기(초), 0이면 대기 없음")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="동작 가중치 (예: create=2,match=3,browse=3,poll=2)")
+    parser.add_argument("--stores-per-category", type=int, default=5)
+    parser.add_argument("--menus-per-store", type=int, default=3)
+    parser.add_argument("--url", help="이미 떠 있는 서버 주소 (지정하지 않으면 uvicorn을 직접 띄움)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="직접 띄우는 uvicorn 워커 수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드 (같은 시드면 같은 트래픽 패턴)")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    mix = parse_mix(args.mix)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    user_ids, catalog = seed(args.users, args.stores_per_category, args.menus_per_store)
+
+    process, url = (None, args.url) if args.url else start_server(args.port, args.workers)
+    stats = Stats()
+    try:
+        limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+            deadline = time.monotonic() + args.duration
+            started = time.perf_counter()
+            users = [VirtualUser(client, stats, user_id, catalog) for user_id in user_ids]
+            await asyncio.gather(*(u.run(mix, deadline, args.think_time) for u in users))
+            elapsed = time.perf_counter() - started
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    summary = stats.summary(elapsed)
+    summary["config"] = {k: v for k, v in vars(args).items() if k != "json"}
+    print_report(summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
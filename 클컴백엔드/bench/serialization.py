@@ -0,0 +1,108 @@
+"""
+주문 목록 응답 직렬화 시간 벤치마크.
+
+GET /orders/가 큰 목록을 돌려줄 때 응답 1건을 JSON 바이트로 만드는 데 걸리는 시간을 방식별로 비교합니다.
+DB 조회 시간은 빼고, 이미 로드된 ORM 객체 목록에서 시작합니다.
+
+- jsonable_encoder : 기존 방식 (response_model 없이 ORM 객체 반환 → jsonable_encoder → json.dumps)
+- +orjson          : jsonable_encoder 결과를 orjson으로 인코딩 (orjson이 설치된 경우만)
+- response_model   : list[OrderOut] 검증(from_attributes) 후 pydantic-core가 바로 JSON 바이트로 직렬화
+
+실행 예:
+    DATABASE_URL=sqlite:///./bench.db python -m bench.serialization --sizes 100 1000 5000
+"""
+from bench._db import use_local_database
+
+use_local_database("serialization_bench")
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from app import models
+from app.database import Base, SessionLocal, engine
+from app.schemas import OrderOut
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def seed(count: int):
+    db = SessionLocal()
+    try:
+        store = models.Store(name="bench-store", category="치킨", minimum_price=20000, delivery_tip=2000, delivery_delay=30)
+        user = models.User(email="bench@bench", name="bench", credit=0)
+        db.add_all([store, user])
+        db.flush()
+        now = datetime.now()
+        db.add_all([
+            models.Order(owner_id=user.id, creator_id=user.id, store_id=store.id,
+                         delivery_location="전북 전주시 덕진구 백제대로 567", detailed_location=f"{i}호",
+                         delivery_lat=35.84 + i * 1e-6, delivery_lng=127.12 + i * 1e-6,
+                         split_type=bool(i % 2), owner_paid_amount=11000 + i, status="pending",
+                         created_at=now, expires_at=now + timedelta(minutes=30))
+            for i in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def legacy(orders):
+    # starlette JSONResponse.render와 같은 옵션
+    return json.dumps(jsonable_encoder(orders), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def legacy_orjson(orders):
+    return orjson.dumps(jsonable_encoder(orders))
+
+
+order_list = TypeAdapter(list[OrderOut])
+
+
+def response_model(orders):
+    return order_list.dump_json(order_list.validate_python(orders, from_attributes=True))
+
+
+def measure(fn, orders, repeat: int):
+    fn(orders)  # 워밍업
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = fn(orders)
+    return (time.perf_counter() - started) / repeat, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    seed(max(args.sizes))
+
+    methods = [("jsonable_encoder", legacy), ("response_model", response_model)]
+    if orjson is not None:
+        methods.insert(1, ("+orjson", legacy_orjson))
+
+    db = SessionLocal()
+    try:
+        all_orders = db.query(models.Order).order_by(models.Order.id).all()
+        print(f"{'orders':>8}" + "".join(f"{name:>20}" for name, _ in methods) + f"{'speedup':>10}")
+        for size in args.sizes:
+            orders = all_orders[:size]
+            results = [measure(fn, orders, args.repeat) for _, fn in methods]
+            cells = "".join(f"{seconds * 1000:>12.2f} ms/resp" for seconds, _ in results)
+            print(f"{size:>8}{cells}{results[0][0] / results[-1][0]:>9.1f}x")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""baseline: 기존 create_all로 만들어지던 테이블
+
+이미 테이블이 있는 DB(운영 RDS)는 이 리비전을 실행하지 말고 표시만 합니다:
+    alembic stamp 0001_baseline
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("email", sa.String(), nullable=False, unique=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("credit", sa.Integer()),
+        sa.Column("address", sa.String()),
+        sa.Column("detailed_address", sa.String()),
+        sa.Column("latitude", sa.Float()),
+        sa.Column("longitude", sa.Float()),
+    )
+    op.create_table(
+        "stores",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False, unique=True),
+        sa.Column("category", sa.String()),
+        sa.Column("location", sa.String()),
+        sa.Column("latitude", sa.Float()),
+        sa.Column("longitude", sa.Float()),
+        sa.Column("minimum_price", sa.Integer(), nullable=False),
+        sa.Column("delivery_tip", sa.Integer(), nullable=False),
+        sa.Column("delivery_delay", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_stores_id", "stores", ["id"])
+    op.create_table(
+        "orders",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("creator_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("store_id", sa.Integer(), sa.ForeignKey("stores.id")),
+        sa.Column("delivery_location", sa.String(), nullable=False),
+        sa.Column("detailed_location", sa.String()),
+        sa.Column("delivery_lat", sa.Float()),
+        sa.Column("delivery_lng", sa.Float()),
+        sa.Column("split_type", sa.Boolean(), nullable=False),
+        sa.Column("owner_paid_amount", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("expires_at", sa.DateTime()),
+        sa.Column("status", sa.String()),
+    )
+    op.create_index("ix_orders_id", "orders", ["id"])
+    op.create_table(
+        "menu",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("store_id", sa.Integer(), sa.ForeignKey("stores.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("price", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_menu_id", "menu", ["id"])
+    op.create_table(
+        "menu_list",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("menu_id", sa.Integer(), sa.ForeignKey("menu.id"), primary_key=True),
+        sa.Column("price", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "order_items",
+        sa.Column("order_id", sa.Integer(), sa.ForeignKey("orders.id"), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("menu_id", sa.Integer(), sa.ForeignKey("menu.id"), primary_key=True),
+        sa.Column("price", sa.Integer(), nullable=False),
+    )
+    op.create_table(
+        "notifications",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+        sa.Column("title", sa.String()),
+        sa.Column("message", sa.String()),
+        sa.Column("is_read", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_notifications_id", "notifications", ["id"])
+
+
+def downgrade():
+    op.drop_table("notifications")
+    op.drop_table("order_items")
+    op.drop_table("menu_list")
+    op.drop_table("menu")
+    op.drop_table("orders")
+    op.drop_table("stores")
+    op.drop_table("users")
@@ -0,0 +1,51 @@
+"""주요 조회 조건(hot path) 인덱스 추가
+
+- orders(status, store_id): 카테고리/가게별 pending 주문 피드
+- orders(expires_at) WHERE status = 'pending': 만료 스케줄러의 UPDATE
+- orders.owner_id, orders.creator_id, order_items.user_id: 내 주문 / 참여 주문
+- notifications(user_id, is_read, created_at): 읽지 않은 알림 조회
+- stores.category: 카테고리별 가게 목록
+
+PostgreSQL에서는 쓰기를 막지 않도록 CREATE INDEX CONCURRENTLY로 만듭니다.
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_hot_path_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("status = 'pending'")
+
+INDEXES = [
+    ("ix_orders_status_store_id", "orders", ["status", "store_id"], {}),
+    ("ix_orders_pending_expires_at", "orders", ["expires_at"],
+     {"postgresql_where": PENDING, "sqlite_where": PENDING}),
+    ("ix_orders_owner_id", "orders", ["owner_id"], {}),
+    ("ix_orders_creator_id", "orders", ["creator_id"], {}),
+    ("ix_order_items_user_id", "order_items", ["user_id"], {}),
+    ("ix_notifications_user_id_is_read_created_at", "notifications", ["user_id", "is_read", "created_at"], {}),
+    ("ix_stores_category", "stores", ["category"], {}),
+]
+
+
+def upgrade():
+    concurrently = op.get_context().dialect.name == "postgresql"
+    if concurrently:
+        # CONCURRENTLY는 트랜잭션 밖에서만 실행 가능
+        with op.get_context().autocommit_block():
+            for name, table, columns, kwargs in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+    else:
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, **kwargs)
+
+
+def downgrade():
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,47 @@
+"""keyset 페이지네이션용 (created_at, id) 인덱스
+
+- orders(created_at, id): 주문 피드 / 내 주문 최신순 페이지
+- notifications(user_id, is_read, created_at, id): 기존 (user_id, is_read, created_at) 인덱스를 id까지 포함하도록 교체
+
+Revision ID: 0003_keyset_pagination_indexes
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003_keyset_pagination_indexes"
+down_revision = "0002_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _run(statements):
+    if op.get_context().dialect.name == "postgresql":
+        # CONCURRENTLY는 트랜잭션 밖에서만 실행 가능
+        with op.get_context().autocommit_block():
+            for statement in statements:
+                statement(postgresql_concurrently=True)
+    else:
+        for statement in statements:
+            statement()
+
+
+def upgrade():
+    _run([
+        lambda **kw: op.create_index("ix_orders_created_at_id", "orders", ["created_at", "id"],
+                                     if_not_exists=True, **kw),
+        lambda **kw: op.create_index("ix_notifications_user_id_is_read_created_at_id", "notifications",
+                                     ["user_id", "is_read", "created_at", "id"], if_not_exists=True, **kw),
+        lambda **kw: op.drop_index("ix_notifications_user_id_is_read_created_at", table_name="notifications",
+                                   if_exists=True, **kw),
+    ])
+
+
+def downgrade():
+    _run([
+        lambda **kw: op.create_index("ix_notifications_user_id_is_read_created_at", "notifications",
+                                     ["user_id", "is_read", "created_at"], if_not_exists=True, **kw),
+        lambda **kw: op.drop_index("ix_notifications_user_id_is_read_created_at_id", table_name="notifications",
+                                   if_exists=True, **kw),
+        lambda **kw: op.drop_index("ix_orders_created_at_id", table_name="orders", if_exists=True, **kw),
+    ])
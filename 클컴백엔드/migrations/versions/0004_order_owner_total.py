@@ -0,0 +1,33 @@
+"""orders.owner_total 추가 (주문 생성자 메뉴 금액 합계)
+
+매칭 검사와 /match/suggest가 주문마다 OrderItem을 다시 합산하지 않도록 합계를 주문 행에 저장합니다.
+기존 주문은 order_items에서 생성자(owner_id) 몫을 합산해 채웁니다.
+
+Revision ID: 0004_order_owner_total
+Revises: 0003_keyset_pagination_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_order_owner_total"
+down_revision = "0003_keyset_pagination_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("orders", sa.Column("owner_total", sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE orders SET owner_total = (
+            SELECT COALESCE(SUM(order_items.price), 0) FROM order_items
+            WHERE order_items.order_id = orders.id AND order_items.user_id = orders.owner_id
+        )
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("orders") as batch_op:
+        batch_op.drop_column("owner_total")
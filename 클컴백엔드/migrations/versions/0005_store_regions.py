@@ -0,0 +1,62 @@
+"""stores 행정구역(시/구/동) 컬럼 + 인덱스
+
+/stores/by-city가 location LIKE '%시%' 전체 스캔 대신 인덱스 조회를 하도록
+location에서 추출한 region_city / region_district / region_dong을 저장합니다.
+기존 가게는 app.utils.region.parse_region으로 채웁니다. (이후 쓰기는 Store 모델이 자동으로 채움)
+
+Revision ID: 0005_store_regions
+Revises: 0004_order_owner_total
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.region import parse_region
+
+revision = "0005_store_regions"
+down_revision = "0004_order_owner_total"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("stores", sa.Column("region_city", sa.String(), nullable=True))
+    op.add_column("stores", sa.Column("region_district", sa.String(), nullable=True))
+    op.add_column("stores", sa.Column("region_dong", sa.String(), nullable=True))
+
+    stores = sa.table(
+        "stores",
+        sa.column("id", sa.Integer), sa.column("location", sa.String),
+        sa.column("region_city", sa.String), sa.column("region_district", sa.String),
+        sa.column("region_dong", sa.String),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(stores.c.id, stores.c.location)).all()
+    updates = []
+    for store_id, location in rows:
+        city, district, dong = parse_region(location)
+        updates.append({"store_id": store_id, "city": city, "district": district, "dong": dong})
+    if updates:
+        connection.execute(
+            stores.update()
+            .where(stores.c.id == sa.bindparam("store_id"))
+            .values(region_city=sa.bindparam("city"), region_district=sa.bindparam("district"),
+                    region_dong=sa.bindparam("dong")),
+            updates,
+        )
+
+    if op.get_context().dialect.name == "postgresql":
+        # CONCURRENTLY는 트랜잭션 밖에서만 실행 가능
+        with op.get_context().autocommit_block():
+            op.create_index("ix_stores_region", "stores", ["region_city", "region_district", "region_dong"],
+                            if_not_exists=True, postgresql_concurrently=True)
+    else:
+        op.create_index("ix_stores_region", "stores", ["region_city", "region_district", "region_dong"],
+                        if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_stores_region", table_name="stores", if_exists=True)
+    with op.batch_alter_table("stores") as batch_op:
+        batch_op.drop_column("region_dong")
+        batch_op.drop_column("region_district")
+        batch_op.drop_column("region_city")
@@ -0,0 +1,51 @@
+"""credit_ledger 테이블 (크레딧 변동 원장)
+
+users.credit을 바꾸는 모든 곳이 같은 트랜잭션에서 원장 행을 추가합니다.
+기존 잔액은 reason='opening' 행으로 옮겨 두어 사용자별 amount 합계 = users.credit이 되게 합니다.
+(검증: python -m app.reconcile_credits)
+
+Revision ID: 0006_credit_ledger
+Revises: 0005_store_regions
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.utils.timeutil import now_naive
+
+revision = "0006_credit_ledger"
+down_revision = "0005_store_regions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "credit_ledger",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False),
+        sa.Column("balance_after", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(), nullable=False),
+        sa.Column("order_id", sa.Integer(), sa.ForeignKey("orders.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    # 새 테이블이라 잠글 행이 없으므로 CONCURRENTLY 불필요
+    op.create_index("ix_credit_ledger_user_id_id", "credit_ledger", ["user_id", "id"])
+
+    # created_at은 다른 DateTime 컬럼과 같이 naive 서울 시각 (CURRENT_TIMESTAMP는 세션 TimeZone=UTC 기준)
+    op.get_bind().execute(
+        sa.text(
+            """
+            INSERT INTO credit_ledger (user_id, amount, balance_after, reason, created_at)
+            SELECT id, credit, credit, 'opening', :now FROM users
+            WHERE credit IS NOT NULL AND credit <> 0
+            ORDER BY id
+            """
+        ),
+        {"now": now_naive()},
+    )
+
+
+def downgrade():
+    op.drop_index("ix_credit_ledger_user_id_id", table_name="credit_ledger")
+    op.drop_table("credit_ledger")
@@ -0,0 +1,35 @@
+"""idempotency_keys 테이블 (Idempotency-Key 헤더 응답 저장)
+
+POST /orders/, POST /match/ 재시도 시 처리 로직을 다시 실행하지 않고 첫 응답을 돌려주기 위한 테이블.
+expires_at이 지난 행은 재사용 시 덮어쓰고, 주기적으로 삭제합니다.
+
+Revision ID: 0007_idempotency_keys
+Revises: 0006_credit_ledger
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_idempotency_keys"
+down_revision = "0006_credit_ledger"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("key", sa.String(), primary_key=True),
+        sa.Column("request_hash", sa.String(), nullable=False),
+        sa.Column("status_code", sa.Integer(), nullable=True),
+        sa.Column("content_type", sa.String(), nullable=True),
+        sa.Column("body", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_idempotency_keys_expires_at", "idempotency_keys", ["expires_at"])
+
+
+def downgrade():
+    op.drop_index("ix_idempotency_keys_expires_at", table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
@@ -0,0 +1,53 @@
+import os
+import tempfile
+
+# 앱을 import하기 전에 테스트용 SQLite를 지정 (기본 DATABASE_URL은 운영 RDS)
+_db_dir = tempfile.mkdtemp(prefix="joint-order-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("READ_REPLICA_URL", None)
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("GEOCODE_CACHE_PATH", os.path.join(_db_dir, "geocode_cache.sqlite3"))
+
+import pytest
+from fastapi.testclient import TestClient
+from app import models
+from app.database import Base, SessionLocal, engine
+from app.main import app
+
+
+@pytest.fixture()
+def db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture()
+def client(db):
+    # startup 이벤트(스케줄러 등)는 실행하지 않음
+    return TestClient(app)
+
+
+@pytest.fixture()
+def store_with_menus(db):
+    """가게 1개 + 메뉴 2개 (5000원, 6000원)"""
+    store = models.Store(name="BHC", category="치킨", location="전북 전주시 덕진구 송천동1가 97-6",
+                         minimum_price=10000, delivery_tip=2000, delivery_delay=30, latitude=35.85, longitude=127.12)
+    db.add(store)
+    db.flush()
+    menus = [models.Menu(store_id=store.id, name="a", price=5000), models.Menu(store_id=store.id, name="b", price=6000)]
+    db.add_all(menus)
+    db.commit()
+    return store, menus
+
+
+def add_user(db, email: str, credit: int = 100000):
+    user = models.User(email=email, name=email.split("@")[0], credit=credit)
+    db.add(user)
+    db.commit()
+    return user
@@ -0,0 +1,20 @@
+import asyncio
+import pytest
+from app.main import app
+from app.utils import jwt_utils
+from conftest import add_user
+
+
+def test_no_default_jwt_secret(db, monkeypatch):
+    # 저장소에 공개된 기본 키로 토큰을 만들 수 있으면 누구든 다른 사용자로 인증됨
+    monkeypatch.setattr(jwt_utils, "JWT_SECRET", None)
+    user = add_user(db, "a@test")
+    with pytest.raises(RuntimeError):
+        jwt_utils.create_jwt(user)
+
+    async def start_server():
+        async with app.router.lifespan_context(app):
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(start_server())
@@ -0,0 +1,31 @@
+from datetime import timedelta
+from app import models
+from app.utils.scheduler import expiry_scheduler
+from app.utils.timeutil import now_naive
+from conftest import add_user
+
+
+def test_default_timestamps_are_naive_seoul_time(db, store_with_menus):
+    store, _ = store_with_menus
+    user = add_user(db, "owner@test")
+    order = models.Order(owner_id=user.id, creator_id=user.id, store_id=store.id,
+                         delivery_location="x", split_type=False, owner_paid_amount=0)
+    db.add(order)
+    db.commit()
+
+    assert order.created_at.tzinfo is None
+    assert order.expires_at.tzinfo is None
+    # 스케줄러가 비교하는 시계(now_naive)와 같은 기준이어야 다음 tick에 바로 만료되지 않음
+    assert abs(order.expires_at - (now_naive() + timedelta(minutes=30))) < timedelta(minutes=1)
+
+
+def test_new_order_is_not_expired_on_next_tick(client, db, store_with_menus):
+    store, menus = store_with_menus
+    user = add_user(db, "owner@test")
+    client.post("/cart/add", params=dict(user_id=user.id, store_id=store.id, menu_id=menus[0].id))
+    res = client.post("/orders/", json=dict(creator_id=user.id, delivery_location="x", split_type=False))
+    assert res.status_code == 200, res.text
+
+    assert expiry_scheduler.expire_due() == []
+    db.expire_all()
+    assert db.get(models.Order, res.json()["order_id"]).status == "pending"
@@ -0,0 +1,33 @@
+from app import models
+from app.utils.geo_index import PendingOrderGeoIndex
+from conftest import add_user
+
+
+def _order(db, store, user, order_id, status="pending"):
+    order = models.Order(id=order_id, creator_id=user.id, owner_id=user.id, store_id=store.id, status=status,
+                         delivery_location="x", delivery_lat=35.85, delivery_lng=127.12,
+                         split_type=False, owner_paid_amount=0, owner_total=0)
+    db.add(order)
+    db.commit()
+    return order
+
+
+def test_sync_picks_up_late_committed_lower_id(db, store_with_menus):
+    store, _ = store_with_menus
+    user = add_user(db, "owner@test")
+    _order(db, store, user, 1)
+    _order(db, store, user, 3)
+
+    index = PendingOrderGeoIndex()
+    index.rebuild(db)
+    assert index._last_order_id == 3
+
+    # id 2는 먼저 할당됐지만 rebuild 이후에 commit된 주문, id 1은 다른 인스턴스에서 매칭됨
+    _order(db, store, user, 2)
+    db.query(models.Order).filter(models.Order.id == 1).update({"status": "matched"})
+    db.commit()
+    index._last_sync = 0
+    index.sync(db)
+
+    found = {order_id for order_id, _ in index.nearby(store.category, 35.85, 127.12)}
+    assert found == {2, 3}
@@ -0,0 +1,16 @@
+import os
+import tempfile
+from app.utils import geocode
+
+
+def test_default_cache_path_is_persistent_and_outside_the_tree(monkeypatch, tmp_path):
+    monkeypatch.delenv("LOCALAPPDATA", raising=False)
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    assert geocode._default_cache_path() == str(tmp_path / "data" / "joint-order" / "geocode_cache.sqlite3")
+
+    monkeypatch.delenv("XDG_DATA_HOME")
+    path = geocode._default_cache_path()
+    # /tmp는 재부팅/인스턴스 교체 때 비워지고, 작업 디렉터리는 git 작업 트리
+    assert not path.startswith(tempfile.gettempdir())
+    assert not path.startswith(os.getcwd())
+    assert path.startswith(os.path.expanduser("~"))
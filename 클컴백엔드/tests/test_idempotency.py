@@ -0,0 +1,112 @@
+import json
+import uuid
+from fastapi.testclient import TestClient
+from app import models
+from app.utils import idempotency
+from app.utils.idempotency import IdempotencyMiddleware
+from conftest import add_user
+
+
+def _order(client, db, store, menus, email):
+    user = add_user(db, email)
+    client.post("/cart/add", params=dict(user_id=user.id, store_id=store.id, menu_id=menus[0].id))
+    return user
+
+
+def test_replay_has_cors_headers(client, db, store_with_menus):
+    store, menus = store_with_menus
+    user = _order(client, db, store, menus, "owner@test")
+    headers = {"Idempotency-Key": uuid.uuid4().hex, "Origin": "http://localhost:3000"}
+    body = dict(creator_id=user.id, delivery_location="x", split_type=False)
+
+    first = client.post("/orders/", json=body, headers=headers)
+    replay = client.post("/orders/", json=body, headers=headers)
+    assert first.status_code == replay.status_code == 200
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.json() == first.json()
+    assert "access-control-allow-origin" in replay.headers
+
+    # 본문이 다른 재사용(422)도 브라우저가 읽을 수 있어야 함
+    conflict = client.post("/orders/", json=dict(body, delivery_location="y"), headers=headers)
+    assert conflict.status_code == 422
+    assert "access-control-allow-origin" in conflict.headers
+
+
+def test_anonymous_users_with_same_key_do_not_collide(client, db, store_with_menus):
+    store, menus = store_with_menus
+    first_user = _order(client, db, store, menus, "a@test")
+    second_user = _order(client, db, store, menus, "b@test")
+    headers = {"Idempotency-Key": "retry-1-" + uuid.uuid4().hex}
+
+    first = client.post("/orders/", json=dict(creator_id=first_user.id, delivery_location="x", split_type=False),
+                        headers=headers)
+    second = client.post("/orders/", json=dict(creator_id=second_user.id, delivery_location="x", split_type=False),
+                         headers=headers)
+    assert first.status_code == second.status_code == 200, second.text
+    assert "idempotent-replayed" not in second.headers
+    assert first.json()["order_id"] != second.json()["order_id"]
+    assert db.query(models.Order).count() == 2
+
+
+def _middleware_client(status_code):
+    calls = []
+
+    async def route(scope, receive, send):
+        calls.append(1)
+        body = json.dumps({"n": len(calls)}).encode()
+        await send({"type": "http.response.start", "status": status_code,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+    middleware = IdempotencyMiddleware(route)
+    return TestClient(middleware), middleware, calls
+
+
+def test_conflict_response_is_not_stored(db):
+    # 409(장바구니 동시 변경)는 재시도하면 성공할 수 있으므로 같은 키 재시도가 다시 처리되어야 함
+    client, _, calls = _middleware_client(409)
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    assert client.post("/orders/", json={}, headers=headers).status_code == 409
+    retry = client.post("/orders/", json={}, headers=headers)
+    assert "idempotent-replayed" not in retry.headers
+    assert len(calls) == 2
+    assert db.query(models.IdempotencyKey).count() == 0
+
+
+def test_failed_save_is_not_replayed(db, monkeypatch):
+    client, _, calls = _middleware_client(200)
+    sessions = []
+    real_session = idempotency.AsyncSessionLocal
+
+    class BrokenSession:
+        async def __aenter__(self):
+            raise RuntimeError("db down")
+
+        async def __aexit__(self, *exc):
+            return False
+
+    def session_factory():
+        sessions.append(1)
+        return BrokenSession() if len(sessions) == 2 else real_session()   # 2번째: 응답 저장
+
+    monkeypatch.setattr(idempotency, "AsyncSessionLocal", session_factory)
+    headers = {"Idempotency-Key": uuid.uuid4().hex}
+    assert client.post("/orders/", json={}, headers=headers).status_code == 200
+    monkeypatch.setattr(idempotency, "AsyncSessionLocal", real_session)
+
+    # 키가 풀렸으므로 다른 인스턴스와 같게 이 인스턴스도 다시 처리 (메모리 캐시에서 재전송하지 않음)
+    retry = client.post("/orders/", json={}, headers=headers)
+    assert "idempotent-replayed" not in retry.headers
+    assert len(calls) == 2
+
+
+def test_purge_failure_after_response_is_swallowed(db, monkeypatch):
+    client, middleware, calls = _middleware_client(200)
+
+    async def broken_purge():
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(middleware, "_purge_expired", broken_purge)
+    res = client.post("/orders/", json={}, headers={"Idempotency-Key": uuid.uuid4().hex})
+    assert res.status_code == 200
+    assert len(calls) == 1
@@ -0,0 +1,43 @@
+import pytest
+from starlette.websockets import WebSocketDisconnect
+from app.utils.jwt_utils import create_jwt
+from app.utils.notification_writer import NotificationWriter, new_notification_row
+from conftest import add_user
+
+
+def test_notification_row_created_at_is_naive():
+    # match_order는 이 행을 AsyncSession 트랜잭션에 넣음 (asyncpg는 aware 값을 거부)
+    row = new_notification_row(1, "매칭 성공", "msg")
+    assert row["created_at"].tzinfo is None
+
+
+@pytest.mark.parametrize("token", [None, "not-a-jwt", "other"])
+def test_user_socket_rejects_missing_or_foreign_token(client, db, token):
+    user = add_user(db, "a@test")
+    other = add_user(db, "b@test")
+    if token == "other":
+        token = create_jwt(other)
+    url = f"/ws/user/{user.id}" + (f"?token={token}" if token else "")
+
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect(url):
+            pass
+    assert exc.value.code == 1008
+
+
+def test_user_socket_accepts_own_token(client, db):
+    user = add_user(db, "a@test")
+    token = create_jwt(user)
+
+    with client.websocket_connect(f"/ws/user/{user.id}?token={token}") as ws:
+        ws.send_text("ping")
+    with client.websocket_connect(f"/ws/user/{user.id}", subprotocols=["bearer", token]) as ws:
+        assert ws.accepted_subprotocol == "bearer"
+
+
+def test_enqueue_does_not_write_on_the_caller(monkeypatch):
+    # enqueue는 async 라우트(match)에서 호출되므로 그 자리에서 동기 DB 저장을 하면 안 됨
+    writer = NotificationWriter()
+    monkeypatch.setattr(writer, "flush", lambda: pytest.fail("enqueue flushed inline"))
+    writer.enqueue(1, "매칭 실패", "msg")
+    assert len(writer._buffer) == 1
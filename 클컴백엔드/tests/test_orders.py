@@ -0,0 +1,100 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import event, update
+from app import models
+from app.async_database import async_engine
+from conftest import add_user
+
+
+def test_create_order_binds_naive_datetimes(client, db, store_with_menus):
+    # asyncpg는 naive DateTime 컬럼에 timezone-aware 값을 넣으면 TypeError를 냄
+    store, menus = store_with_menus
+    user = add_user(db, "owner@test")
+    client.post("/cart/add", params=dict(user_id=user.id, store_id=store.id, menu_id=menus[0].id))
+
+    bound = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO ORDERS"):
+            # 드라이버 변환(bind processor) 전 값 — asyncpg에 그대로 전달되는 값
+            bound.extend(context.compiled_parameters)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        res = client.post("/orders/", json=dict(creator_id=user.id, delivery_location="x", split_type=False))
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+    assert res.status_code == 200, res.text
+    assert bound
+    values = [v for params in bound for v in params.values()]
+    datetimes = [v for v in values if isinstance(v, datetime)]
+    assert len(datetimes) == 2   # created_at, expires_at
+    assert all(v.tzinfo is None for v in datetimes)
+
+
+def _create_order(client, db, store, menus, email):
+    user = add_user(db, email)
+    client.post("/cart/add", params=dict(user_id=user.id, store_id=store.id, menu_id=menus[0].id))
+    res = client.post("/orders/", json=dict(creator_id=user.id, delivery_location="x", split_type=False))
+    assert res.status_code == 200, res.text
+    return user, res.json()["order_id"]
+
+
+def test_delete_pending_order_refunds(client, db, store_with_menus):
+    store, menus = store_with_menus
+    user, order_id = _create_order(client, db, store, menus, "owner@test")
+
+    res = client.delete(f"/orders/{order_id}", params=dict(user_id=user.id))
+    assert res.status_code == 200, res.text
+    db.expire_all()
+    assert db.get(models.User, user.id).credit == 100000
+    assert db.get(models.Order, order_id).status == "cancelled"
+
+    # 두 번째 취소는 환불 없이 거절
+    res = client.delete(f"/orders/{order_id}", params=dict(user_id=user.id))
+    assert res.status_code == 400
+    db.expire_all()
+    assert db.get(models.User, user.id).credit == 100000
+
+
+@pytest.mark.parametrize("status", ["merged", "matched", "expired"])
+def test_delete_non_pending_order_is_rejected(client, db, store_with_menus, status):
+    # 자동 매칭으로 합쳐진(merged) 주문 등을 취소하면 환불 + 합쳐진 쪽 주문으로 공짜 식사가 됨
+    store, menus = store_with_menus
+    user, order_id = _create_order(client, db, store, menus, "owner@test")
+    db.execute(update(models.Order).where(models.Order.id == order_id).values(status=status))
+    db.commit()
+    credit = db.get(models.User, user.id).credit
+
+    res = client.delete(f"/orders/{order_id}", params=dict(user_id=user.id))
+    assert res.status_code == 400
+    db.expire_all()
+    assert db.get(models.User, user.id).credit == credit
+    assert db.get(models.Order, order_id).status == status
+
+
+def test_create_order_keeps_cart_item_added_after_copy(client, db, store_with_menus):
+    # INSERT ... SELECT 직후 동시 /cart/add로 들어온 아이템은 주문에 없으므로 장바구니에 남아야 함
+    store, menus = store_with_menus
+    user = add_user(db, "owner@test")
+    client.post("/cart/add", params=dict(user_id=user.id, store_id=store.id, menu_id=menus[0].id))
+
+    def add_to_cart(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO ORDER_ITEMS"):
+            other = conn.connection.cursor()
+            other.execute("INSERT INTO menu_list (user_id, menu_id, price) VALUES (?, ?, ?)",
+                          (user.id, menus[1].id, menus[1].price))
+            other.close()
+
+    event.listen(async_engine.sync_engine, "after_cursor_execute", add_to_cart)
+    try:
+        res = client.post("/orders/", json=dict(creator_id=user.id, delivery_location="x", split_type=False))
+    finally:
+        event.remove(async_engine.sync_engine, "after_cursor_execute", add_to_cart)
+
+    assert res.status_code == 200, res.text
+    assert [item["menu_id"] for item in res.json()["items"]] == [menus[0].id]
+    db.expire_all()
+    cart = db.query(models.MenuList).filter(models.MenuList.user_id == user.id).all()
+    assert [(item.menu_id, item.price) for item in cart] == [(menus[1].id, menus[1].price)]
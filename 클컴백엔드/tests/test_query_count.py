@@ -0,0 +1,114 @@
+"""
+주문 상세 / 내 주문 / 장바구니 조회와 주문 생성의 SQL 실행 횟수 검사 (N+1 회귀 방지).
+
+데이터 1건일 때와 여러 건일 때 각각 호출해 SQL 문 개수가 데이터 양과 무관하게 일정하고 기준 이하인지 확인합니다.
+"""
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import models
+from app.async_database import async_engine
+from app.database import engine
+from conftest import add_user
+
+# 엔드포인트별 허용 SQL 문 개수
+MAX_STATEMENTS = {
+    "order_detail": 2,   # order+store JOIN, items+menu selectin
+    "my_orders": 1,      # orders+store JOIN (참여 주문은 EXISTS)
+    "cart": 1,           # menu_list+menu JOIN
+}
+MAX_CREATE_ORDER_STATEMENTS = 7   # user, 장바구니 집계, order INSERT, 크레딧 UPDATE, 원장 INSERT(PostgreSQL은 UPDATE와 한 문장), INSERT ... SELECT, DELETE
+
+
+@contextmanager
+def count_statements(eng):
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(eng, "before_cursor_execute", _count)
+    try:
+        yield statements
+    finally:
+        event.remove(eng, "before_cursor_execute", _count)
+
+
+def seed(db, n_items: int):
+    """n_items개 메뉴를 가진 가게, 주문자/참여자, 주문 2건(소유 1, 참여 1), 장바구니를 만듭니다."""
+    store = models.Store(name=f"store-{n_items}", category="치킨", minimum_price=0,
+                         delivery_tip=2000, delivery_delay=30)
+    owner = models.User(email=f"owner-{n_items}@test", name="owner", credit=0)
+    member = models.User(email=f"member-{n_items}@test", name="member", credit=0)
+    db.add_all([store, owner, member])
+    db.flush()
+
+    menus = [models.Menu(store_id=store.id, name=f"menu-{i}", price=1000) for i in range(n_items)]
+    db.add_all(menus)
+    db.flush()
+
+    orders = [
+        models.Order(owner_id=uid, creator_id=uid, store_id=store.id, delivery_location="test",
+                     split_type=False, owner_paid_amount=0, status="pending")
+        for uid in (owner.id, member.id)
+    ]
+    db.add_all(orders)
+    db.flush()
+
+    for order in orders:
+        db.add_all([models.OrderItem(order_id=order.id, user_id=order.owner_id, menu_id=m.id, price=m.price)
+                    for m in menus])
+    # owner는 member의 주문에도 참여
+    db.add_all([models.OrderItem(order_id=orders[1].id, user_id=owner.id, menu_id=m.id, price=m.price)
+                for m in menus])
+    db.add_all([models.MenuList(user_id=owner.id, menu_id=m.id, price=m.price) for m in menus])
+    db.commit()
+    return owner.id, orders[0].id
+
+
+def measure_reads(client, user_id: int, order_id: int):
+    counts = {}
+    for name, url in (
+        ("order_detail", f"/orders/{order_id}"),
+        ("my_orders", f"/orders/my/{user_id}"),
+        ("cart", f"/cart/{user_id}"),
+    ):
+        with count_statements(engine) as statements:
+            res = client.get(url)
+        assert res.status_code == 200, (url, res.status_code, res.text)
+        counts[name] = len(statements)
+    return counts
+
+
+def measure_create_order(client, db, n_items: int):
+    store = models.Store(name=f"create-{n_items}", category="치킨", minimum_price=0,
+                         delivery_tip=2000, delivery_delay=30)
+    db.add(store)
+    db.flush()
+    menus = [models.Menu(store_id=store.id, name=f"menu-{i}", price=1000) for i in range(n_items)]
+    db.add_all(menus)
+    user = add_user(db, f"creator-{n_items}@test")
+    db.add_all([models.MenuList(user_id=user.id, menu_id=m.id, price=m.price) for m in menus])
+    db.commit()
+
+    with count_statements(async_engine.sync_engine) as statements:
+        res = client.post("/orders/", json=dict(creator_id=user.id, delivery_location="x", split_type=False))
+    assert res.status_code == 200, res.text
+    assert len(res.json()["items"]) == n_items
+    return len(statements)
+
+
+def test_read_endpoints_have_no_n_plus_one(client, db):
+    small = measure_reads(client, *seed(db, 1))
+    large = measure_reads(client, *seed(db, 20))
+
+    for name, limit in MAX_STATEMENTS.items():
+        assert large[name] == small[name], f"{name}: N+1 detected ({small[name]} → {large[name]})"
+        assert large[name] <= limit, f"{name}: {large[name]} statements > {limit}"
+
+
+def test_create_order_statement_count_is_constant(client, db):
+    small = measure_create_order(client, db, 1)
+    large = measure_create_order(client, db, 20)
+
+    assert large == small, f"create_order: {small} → {large} statements"
+    assert large <= MAX_CREATE_ORDER_STATEMENTS, f"create_order: {large} statements > {MAX_CREATE_ORDER_STATEMENTS}"
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import asyncpg
+from app.utils import realtime as realtime_module
+from app.utils.realtime import PostgresBroker
+
+
+class FakeConnection:
+    """asyncpg 커넥션처럼 동시에 두 쿼리를 실행하면 InterfaceError"""
+
+    def __init__(self, sent):
+        self.sent = sent
+        self.busy = False
+        self.closed = False
+        self.listeners = []
+        self.termination_listeners = []
+
+    async def add_listener(self, channel, callback):
+        self.listeners.append(channel)
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    async def execute(self, query, channel, raw):
+        if self.closed:
+            raise asyncpg.InterfaceError("connection is closed")
+        if self.busy:
+            raise asyncpg.InterfaceError("another operation is in progress")
+        self.busy = True
+        await asyncio.sleep(0.001)
+        self.busy = False
+        self.sent.append(json.loads(raw)["user_id"])
+
+    def is_closed(self):
+        return self.closed
+
+    def lose(self):
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+    def terminate(self):
+        self.closed = True
+
+    async def close(self):
+        self.lose()
+
+
+def test_postgres_broker_publishes_one_at_a_time_and_reconnects(monkeypatch):
+    sent, connections = [], []
+
+    async def connect(dsn):
+        connections.append(FakeConnection(sent))
+        return connections[-1]
+
+    monkeypatch.setattr(asyncpg, "connect", connect)
+    monkeypatch.setattr(realtime_module, "RECONNECT_DELAY", 0)
+
+    async def scenario():
+        broker = PostgresBroker("postgresql://test")
+        await broker.start(lambda user_id, payload: None)
+        listen_conn = connections[0]
+
+        # 매칭 1건(2개)·만료 tick(N개)처럼 겹쳐서 발행해도 모두 전송
+        await asyncio.gather(*[broker.publish(user_id, {}) for user_id in range(10)])
+        assert sorted(sent) == list(range(10))
+
+        # 발행 커넥션이 끊기면 새 커넥션으로 다시 보냄
+        broker._publish_conn.closed = True
+        await broker.publish(99, {})
+        assert sent[-1] == 99
+
+        # LISTEN 커넥션이 끊기면 다시 연결해 LISTEN
+        listen_conn.lose()
+        await asyncio.sleep(0.01)
+        assert broker._listen_conn is not None and broker._listen_conn is not listen_conn
+        assert broker._listen_conn.listeners == [broker.channel]
+        await broker.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,37 @@
+from app import models
+from app.credit_service import apply_credit
+from app.database import engine
+from app.reconcile_credits import reconcile
+from conftest import add_user
+
+
+def test_reconcile_matches_ledger_and_balances(db):
+    user_id = add_user(db, "a@test", credit=0).id
+    apply_credit(db, user_id, 5000, "signup")
+    apply_credit(db, user_id, -3000, "order")
+    db.commit()
+    db.close()
+
+    ledger_rows, users_checked, problems = reconcile(db)
+    assert (ledger_rows, users_checked, problems) == (2, 1, [])
+
+    db.query(models.User).filter(models.User.id == user_id).update({"credit": 9999})
+    db.commit()
+    db.close()
+    _, _, problems = reconcile(db)
+    assert [user_id for user_id, _ in problems] == [user_id]
+
+
+def test_reconcile_reads_one_repeatable_read_snapshot_on_postgres(db, monkeypatch):
+    # 원장 합계와 users.credit을 같은 스냅샷에서 읽어야 운영 중인 DB에서도 불일치가 생기지 않음
+    options = []
+    connection = db.connection
+
+    def spy(execution_options=None, **kw):
+        options.append(execution_options)
+        return connection(**kw)
+
+    monkeypatch.setattr(engine.dialect, "name", "postgresql")
+    monkeypatch.setattr(db, "connection", spy)
+    reconcile(db)
+    assert options == [{"isolation_level": "REPEATABLE READ"}]